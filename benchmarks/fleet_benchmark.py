@@ -0,0 +1,315 @@
+"""Fleet-scale benchmark for the OpenKarotz coordinator and API client.
+
+Starts simulated rabbits (see ``tests/simulator.py``) in a separate process,
+points one ``OpenKarotzAPI`` and ``OpenKarotzCoordinator`` at each of them and
+drives ``_async_update_data`` for a number of poll cycles. Reports refresh
+wall time, requests per second, event-loop lag, memory per device and
+latency percentiles, and writes the results as JSON for regression checks.
+Memory is measured in a separate, untimed pass, so tracing allocations does
+not slow down the timed cycles.
+
+Usage, from the repository root:
+
+    python -m benchmarks.fleet_benchmark --devices 10 100 1000
+    python -m benchmarks.fleet_benchmark --devices 100 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.openkarotz.api import OpenKarotzAPI
+from custom_components.openkarotz.codec import JSON_BACKEND
+from custom_components.openkarotz.const import ATTR_ERROR_MESSAGE
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.metrics import LatencyHistogram
+from custom_components.openkarotz.session import create_session
+
+SIMULATOR = os.path.join(os.path.dirname(__file__), "..", "tests", "simulator.py")
+POLL_INTERVAL = 30
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic timer."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize the monitor."""
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        """Sample wake-up lateness until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected) * 1000)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.samples.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def start_fleet(args: argparse.Namespace, count: int) -> Tuple[asyncio.subprocess.Process, List[int]]:
+    """Start a simulator process and return it with the device ports."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        SIMULATOR,
+        "--count",
+        str(count),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--failure-rate",
+        str(args.failure_rate),
+        "--seed",
+        "1",
+        stdout=subprocess.PIPE,
+    )
+    ports = []
+    while len(ports) < count:
+        line = await process.stdout.readline()
+        if not line:
+            raise RuntimeError("Simulator exited before all devices were up")
+        ports.append(int(line.decode().rsplit(":", 1)[1]))
+    return process, ports
+
+
+def expire_hot_cache(api: OpenKarotzAPI) -> None:
+    """Drop cached responses that would have expired within one poll interval."""
+    for endpoint, ttl in api.cache.ttls.items():
+        if ttl < POLL_INTERVAL:
+            api.cache.invalidate_endpoint(endpoint)
+
+
+def merged_latency(apis: List[OpenKarotzAPI]) -> LatencyHistogram:
+    """Merge the request latency histograms of every device."""
+    merged = LatencyHistogram()
+    for api in apis:
+        for metrics in api.metrics.endpoints.values():
+            histogram = metrics.latency
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+            merged.total_ms += histogram.total_ms
+            merged.max_ms = max(merged.max_ms, histogram.max_ms)
+    return merged
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Return a percentile of raw samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+
+async def connect_fleet(
+    args: argparse.Namespace, hass: HomeAssistant, ports: List[int]
+) -> Tuple[ClientSession, List[OpenKarotzAPI], List[OpenKarotzCoordinator]]:
+    """Create and connect a client and coordinator for every device."""
+    session = create_session()
+    apis = [
+        OpenKarotzAPI("127.0.0.1", port, timeout=args.timeout, session=session)
+        for port in ports
+    ]
+    coordinators = [OpenKarotzCoordinator(hass, api) for api in apis]
+    await asyncio.gather(*(api.async_connect() for api in apis))
+    return session, apis, coordinators
+
+
+async def disconnect_fleet(session: ClientSession, apis: List[OpenKarotzAPI]) -> None:
+    """Disconnect every client and close their session."""
+    await asyncio.gather(*(api.async_disconnect() for api in apis))
+    await session.close()
+
+
+async def refresh(coordinator: OpenKarotzCoordinator) -> Tuple[float, bool]:
+    """Refresh a coordinator, returning the time taken and whether it had errors."""
+    start = time.perf_counter()
+    try:
+        coordinator.data = await coordinator._async_update_data()
+    except UpdateFailed:
+        failed = True
+    else:
+        failed = bool(coordinator.data[ATTR_ERROR_MESSAGE])
+    return (time.perf_counter() - start) * 1000, failed
+
+
+async def refresh_cycle(coordinators: List[OpenKarotzCoordinator]) -> List[Tuple[float, bool]]:
+    """Refresh every coordinator once."""
+    return await asyncio.gather(*(refresh(coordinator) for coordinator in coordinators))
+
+
+async def measure_memory(args: argparse.Namespace, hass: HomeAssistant, ports: List[int]) -> Tuple[int, int]:
+    """Return the memory held by a refreshed fleet and the peak, in bytes."""
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        session, apis, coordinators = await connect_fleet(args, hass, ports)
+        await refresh_cycle(coordinators)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    await disconnect_fleet(session, apis)
+    return current - baseline, peak
+
+
+async def run_scenario(args: argparse.Namespace, hass: HomeAssistant, count: int) -> Dict[str, Any]:
+    """Benchmark one fleet size."""
+    process, ports = await start_fleet(args, count)
+    try:
+        held, peak = await measure_memory(args, hass, ports)
+
+        session, apis, coordinators = await connect_fleet(args, hass, ports)
+        monitor = LoopLagMonitor()
+        cycle_ms: List[float] = []
+        device_ms: List[float] = []
+        requests = 0
+        errors = 0
+        monitor.start()
+        for _ in range(args.cycles):
+            for api in apis:
+                expire_hot_cache(api)
+            sent_before = sum(api.metrics.total_requests for api in apis)
+            start = time.perf_counter()
+            refreshes = await refresh_cycle(coordinators)
+            cycle_ms.append((time.perf_counter() - start) * 1000)
+            requests += sum(api.metrics.total_requests for api in apis) - sent_before
+            device_ms.extend(elapsed for elapsed, _ in refreshes)
+            errors += sum(1 for _, failed in refreshes if failed)
+        await monitor.stop()
+
+        latency = merged_latency(apis)
+        await disconnect_fleet(session, apis)
+    finally:
+        process.terminate()
+        await process.wait()
+
+    total_seconds = sum(cycle_ms) / 1000
+    return {
+        "devices": count,
+        "cycles": args.cycles,
+        "refresh_wall_ms": {
+            "mean": round(statistics.mean(cycle_ms), 2),
+            "min": round(min(cycle_ms), 2),
+            "max": round(max(cycle_ms), 2),
+        },
+        "device_refresh_ms": {
+            "p50": percentile(device_ms, 0.50),
+            "p95": percentile(device_ms, 0.95),
+            "p99": percentile(device_ms, 0.99),
+        },
+        "requests": requests,
+        "requests_per_second": round(requests / total_seconds, 1) if total_seconds else None,
+        "refreshes_with_errors": errors,
+        "request_latency_ms": {
+            "p50": latency.percentile(0.50),
+            "p95": latency.percentile(0.95),
+            "p99": latency.percentile(0.99),
+        },
+        "loop_lag_ms": {
+            "p50": percentile(monitor.samples, 0.50),
+            "p99": percentile(monitor.samples, 0.99),
+            "max": round(max(monitor.samples), 2) if monitor.samples else None,
+        },
+        "memory_per_device_kib": round(held / count / 1024, 2),
+        "peak_memory_mib": round(peak / 1024 / 1024, 2),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> List[str]:
+    """Describe how results moved relative to a previous run."""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {entry["devices"]: entry for entry in json.load(file)["results"]}
+
+    lines = []
+    for entry in results:
+        previous = baseline.get(entry["devices"])
+        if previous is None:
+            continue
+        for label, path in (
+            ("refresh wall mean", ("refresh_wall_ms", "mean")),
+            ("device refresh p99", ("device_refresh_ms", "p99")),
+            ("loop lag p99", ("loop_lag_ms", "p99")),
+            ("memory/device", ("memory_per_device_kib",)),
+        ):
+            new, old = entry, previous
+            for key in path:
+                new, old = new[key], old[key]
+            if old:
+                lines.append(
+                    f"{entry['devices']:>5} devices {label:<20} {old:>10} -> {new:<10} ({(new - old) / old:+.1%})"
+                )
+    return lines
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Run every requested scenario and write the report."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        results = []
+        for count in args.devices:
+            result = await run_scenario(args, hass, count)
+            results.append(result)
+            print(json.dumps(result, indent=2))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": JSON_BACKEND,
+        "settings": {
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "failure_rate": args.failure_rate,
+            "cycles": args.cycles,
+            "timeout": args.timeout,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        for line in compare(results, args.compare):
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=int, default=10)
+    parser.add_argument("--output", default="fleet_benchmark.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    asyncio.run(main(parser.parse_args()))
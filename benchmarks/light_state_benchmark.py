@@ -0,0 +1,134 @@
+"""Microbenchmark for the cost of an OpenKarotz light state write.
+
+Builds one ``OpenKarotzLight`` on a coordinator and times reading the light
+properties the way Home Assistant does for a state write, both for repeated
+writes of unchanged LED state and for a write after each new LED state is
+published. Publishing alone is timed too, so it can be told apart from the
+write. Results are written as JSON; run the benchmark on two commits and
+pass the first file to ``--compare`` to see how the per-write cost moved.
+
+Usage, from the repository root:
+
+    python -m benchmarks.light_state_benchmark
+    python -m benchmarks.light_state_benchmark --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.openkarotz.api import OpenKarotzAPI
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.light import OpenKarotzLight
+
+# Properties read for one state write: the state, the capability attributes
+# and the state attributes, which look at the color modes more than once
+WRITE_READS = (
+    "is_on",
+    "supported_color_modes",
+    "supported_color_modes",
+    "color_mode",
+    "color_mode",
+    "brightness",
+    "color",
+    "color_temperature",
+)
+
+
+def led_states(count: int) -> List[Dict[str, Any]]:
+    """Return distinct LED states, as successive refreshes would publish."""
+    return [
+        {"enabled": True, "brightness": index % 100 + 1, "rgb_value": f"{index % 256:02X}80FF", "preset": None}
+        for index in range(count)
+    ]
+
+
+def time_per_call(function: Callable[[int], None], iterations: int, repeats: int) -> float:
+    """Return the best mean time of a call over several runs, in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for index in range(iterations):
+            function(index)
+        best = min(best, (time.perf_counter_ns() - start) / iterations)
+    return round(best, 1)
+
+
+async def run(args: argparse.Namespace, hass: HomeAssistant) -> Dict[str, Any]:
+    """Time writes with unchanged and with freshly published LED state."""
+    coordinator = OpenKarotzCoordinator(hass, OpenKarotzAPI("127.0.0.1"))
+    light = OpenKarotzLight(coordinator, {"id": 1, "name": "Main LED"})
+    states = led_states(args.iterations)
+    coordinator._async_publish_leds(states[0])
+
+    def write(index: int) -> None:
+        for name in WRITE_READS:
+            getattr(light, name)
+
+    def publish(index: int) -> None:
+        coordinator._async_publish_leds(states[index])
+
+    def publish_and_write(index: int) -> None:
+        coordinator._async_publish_leds(states[index])
+        for name in WRITE_READS:
+            getattr(light, name)
+
+    publish_ns = time_per_call(publish, args.iterations, args.repeats)
+    update_ns = time_per_call(publish_and_write, args.iterations, args.repeats)
+    return {
+        "reads_per_write": len(WRITE_READS),
+        "write_ns": time_per_call(write, args.iterations, args.repeats),
+        "publish_ns": publish_ns,
+        "write_after_update_ns": round(update_ns - publish_ns, 1),
+    }
+
+
+def compare(result: Dict[str, Any], baseline_path: str) -> List[str]:
+    """Describe how results moved relative to a previous run."""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)["result"]
+
+    lines = []
+    for key in ("write_ns", "write_after_update_ns"):
+        new, old = result[key], baseline[key]
+        if old:
+            lines.append(f"{key:<24} {old:>10} -> {new:<10} ({(new - old) / old:+.1%})")
+    return lines
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Run the benchmark and write the report."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        result = await run(args, HomeAssistant(config_dir))
+    print(json.dumps(result, indent=2))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"iterations": args.iterations, "repeats": args.repeats},
+        "result": result,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        for line in compare(result, args.compare):
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default="light_state_benchmark.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    asyncio.run(main(parser.parse_args()))
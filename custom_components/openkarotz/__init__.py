@@ -9,11 +9,16 @@ from homeassistant.const import Platform
 from .api import OpenKarotzAPI
 from .const import DOMAIN
 from .coordinator import OpenKarotzCoordinator
+from .events import OpenKarotzEventListener
+from .fleet import async_get_fleet, async_release_fleet
+from .identity import async_resolve_device_id
 from .services import async_setup_services
+from .session import async_get_event_session, async_get_session, async_release_session
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[str] = [
+    Platform.CAMERA,
     Platform.SENSOR,
     Platform.LIGHT,
     Platform.MEDIA_PLAYER,
@@ -29,26 +34,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.data.get("host", "192.168.1.201")
     port = entry.data.get("port", 80)
 
-    api = OpenKarotzAPI(host, port)
+    fleet = async_get_fleet(hass)
+    api = OpenKarotzAPI(
+        host,
+        port,
+        session=async_get_session(hass),
+        limiter=fleet.limiter,
+        event_session=async_get_event_session(hass),
+    )
 
     try:
         await api.async_connect()
+        device_id = await async_resolve_device_id(hass, entry, api)
     except Exception as e:
         _LOGGER.error("Failed to connect to OpenKarotz: %s", e)
+        await async_release_session(hass)
+        async_release_fleet(hass)
         return False
 
-    coordinator = OpenKarotzCoordinator(hass, api)
+    coordinator = OpenKarotzCoordinator(hass, api, fleet=fleet, device_id=device_id)
+    events = OpenKarotzEventListener(hass, api, coordinator)
+    coordinator.event_listener = events
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "events": events,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     await async_setup_services(hass)
 
+    events.async_start()
+
     return True
 
 
@@ -58,12 +78,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if entry.entry_id in hass.data.get(DOMAIN, {}):
         api = hass.data[DOMAIN][entry.entry_id].get("api")
+        coordinator = hass.data[DOMAIN][entry.entry_id].get("coordinator")
+        events = hass.data[DOMAIN][entry.entry_id].get("events")
+        if events:
+            await events.async_stop()
+        if coordinator:
+            await coordinator.async_shutdown()
         if api:
             await api.async_disconnect()
         del hass.data[DOMAIN][entry.entry_id]
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
+    await async_release_session(hass)
+    async_release_fleet(hass)
+
     return unload_ok
 
 
@@ -1,10 +1,10 @@
 """OpenKarotz API Client."""
 
 import asyncio
-import json
+import contextlib
 import logging
 import time
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import aiohttp
@@ -12,12 +12,24 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
+      DEFAULT_EVENT_WAIT,
+      DEFAULT_MAX_SNAPSHOT_SIZE,
       DEFAULT_PORT,
       DEFAULT_TIMEOUT,
       DEFAULT_RECONNECT_ATTEMPTS,
       DEFAULT_RECONNECT_DELAY,
       API_ENDPOINTS,
+      PRIORITY_BACKGROUND,
+      PRIORITY_INTERACTIVE,
 )
+from .cache import ResponseCache
+from .coalescer import LedCommandCoalescer
+from .codec import ResponseDecoder, ResponseTooLargeError
+from .command_queue import CommandQueue
+from .metrics import RequestMetrics
+from .resilience import CircuitBreaker, RetryPolicy
+from .session import create_session
+from .tts_queue import TtsQueue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,6 +52,18 @@ class OpenKarotzAuthenticationError(OpenKarotzAPIError):
     pass
 
 
+class OpenKarotzNotSupportedError(OpenKarotzAPIError):
+    """Endpoint is not provided by the device firmware."""
+
+    pass
+
+
+class OpenKarotzUnavailableError(OpenKarotzConnectionError):
+    """Device is known to be unreachable and requests fail fast."""
+
+    pass
+
+
 class OpenKarotzAPI:
     """OpenKarotz API client for device communication."""
 
@@ -48,21 +72,66 @@ class OpenKarotzAPI:
         host: str,
         port: int = DEFAULT_PORT,
         timeout: int = DEFAULT_TIMEOUT,
+        session: Optional[aiohttp.ClientSession] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[ResponseCache] = None,
+        command_queue: Optional[CommandQueue] = None,
+        decoder: Optional[ResponseDecoder] = None,
+        metrics: Optional[RequestMetrics] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
+        event_session: Optional[aiohttp.ClientSession] = None,
     ):
-        """Initialize OpenKarotz API client."""
+        """Initialize OpenKarotz API client.
+
+        Args:
+            host: Device host name or IP address
+            port: Device HTTP port
+            timeout: Total timeout per request in seconds
+            session: Shared client session; when omitted the client creates
+                and owns a pooled session of its own
+            retry_policy: Retry policy for transport failures
+            breaker: Circuit breaker tracking device reachability
+            cache: Response cache for GET requests
+            command_queue: Scheduler bounding concurrent and per-second
+                requests to the device
+            decoder: Response body reader and JSON decoder
+            metrics: Per-endpoint request counters and latency histograms
+            limiter: Semaphore shared by several clients to bound their
+                combined requests in flight
+            event_session: Session for event long polls, kept apart so they
+                do not hold sockets of the regular pool; when omitted they
+                use the regular session
+        """
         self.host = host
         self.port = port
         self.timeout = timeout
         self.base_url = f"http://{host}:{port}"
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.event_session = event_session
+        self._request_timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.cache = cache if cache is not None else ResponseCache()
+        self.command_queue = command_queue or CommandQueue()
+        self.decoder = decoder or ResponseDecoder()
+        self.image_reader = ResponseDecoder(DEFAULT_MAX_SNAPSHOT_SIZE)
+        self.metrics = metrics or RequestMetrics()
+        self.limiter = limiter
+        self.led_coalescer = LedCommandCoalescer(self._async_send_leds)
+        self.tts_queue = TtsQueue(self._async_send_tts, self._async_fetch_tts_status)
+        self._probe_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[Tuple[Tuple[str, Tuple[Tuple[str, Any], ...]], int], asyncio.Task] = {}
+        self.coalesced_requests = 0
+        self._command_listeners: List[Callable[[str], None]] = []
         self._is_connected = False
 
     async def async_connect(self) -> bool:
         """Establish connection to OpenKarotz device."""
         try:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            )
+            if self._owns_session and (not self.session or self.session.closed):
+                self.session = create_session()
 
             try:
                 await self._async_request("GET", API_ENDPOINTS["GET_INFO"], skip_connection_check=True)
@@ -81,13 +150,44 @@ class OpenKarotzAPI:
 
     async def async_disconnect(self) -> None:
         """Disconnect from OpenKarotz device."""
-        if self.session:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        self.tts_queue.cancel(OpenKarotzConnectionError("Disconnected from OpenKarotz"))
+        self.cache.clear()
+
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
 
         self._is_connected = False
         _LOGGER.info("Disconnected from OpenKarotz")
 
+    def add_command_listener(self, listener: Callable[[str], None]) -> Callable[[], None]:
+        """Register a callback run after each successful command.
+
+        Args:
+            listener: Called with the endpoint of the command
+
+        Returns:
+            Function that removes the listener
+        """
+        self._command_listeners.append(listener)
+
+        def remove_listener() -> None:
+            if listener in self._command_listeners:
+                self._command_listeners.remove(listener)
+
+        return remove_listener
+
+    def _notify_command(self, endpoint: str) -> None:
+        """Tell listeners that a command changed the device."""
+        for listener in list(self._command_listeners):
+            try:
+                listener(endpoint)
+            except Exception:
+                _LOGGER.exception("Error in OpenKarotz command listener")
+
     async def _async_request(
         self,
         method: str,
@@ -95,14 +195,34 @@ class OpenKarotzAPI:
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
         skip_connection_check: bool = False,
+        priority: Optional[int] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Make HTTP request to OpenKarotz API.
 
+        GET responses are served from the per-endpoint response cache while
+        fresh, and identical GET requests that are already in flight are not
+        sent again; concurrent callers share one round trip and receive the
+        same parsed response, which must therefore be treated as read-only.
+        Successful writes invalidate the cached endpoints they affect and
+        are reported to command listeners.
+
+        Every exchange waits for a slot in the device's command queue, which
+        bounds concurrency and rate and lets interactive commands overtake
+        background polling. Transport failures on idempotent requests are
+        retried with jittered backoff. Consecutive failures open the circuit
+        breaker, after which requests fail fast until a background probe
+        reaches the device again.
+
         Args:
             method: HTTP method (GET, POST)
             endpoint: API endpoint
             data: Request body data
             params: URL parameters
+            priority: Queue priority; defaults to interactive for writes and
+                background for reads
+            use_cache: Whether a GET may be answered from the response
+                cache; the response is cached either way
 
         Returns:
             API response as dictionary
@@ -110,51 +230,283 @@ class OpenKarotzAPI:
         Raises:
             OpenKarotzAPIError: On API errors
             OpenKarotzConnectionError: On connection errors
+            OpenKarotzUnavailableError: While the device is known to be down
         """
         if not skip_connection_check and (not self._is_connected or not self.session):
             raise OpenKarotzConnectionError("Not connected to OpenKarotz")
 
+        if priority is None:
+            priority = PRIORITY_BACKGROUND if method.upper() == "GET" else PRIORITY_INTERACTIVE
+
+        if method.upper() != "GET":
+            result = await self._async_request_with_retries(
+                method, endpoint, data, params, priority
+            )
+            self.cache.invalidate_for(endpoint)
+            self._notify_command(endpoint)
+            return result
+
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        cached = self.cache.get(key) if use_cache else None
+        if cached is not None:
+            return cached
+
+        # Requests are only shared within one cache generation, so readers
+        # arriving after a write do not join a request sent before it
+        generation = self.cache.generation(endpoint)
+        inflight_key = (key, generation)
+        task = self._inflight.get(inflight_key)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(
+                self._async_get_and_cache(key, generation, method, endpoint, data, params, priority)
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda done: self._async_forget_inflight(inflight_key, done))
+        else:
+            self.coalesced_requests += 1
+
+        # Shield the shared request so one caller's cancellation does not
+        # cancel it for everyone else waiting on the same response
+        return await asyncio.shield(task)
+
+    def _async_forget_inflight(self, key: Tuple[Any, ...], task: asyncio.Task) -> None:
+        """Drop a finished request from the in-flight table."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _async_get_and_cache(
+        self,
+        key: Tuple[Any, ...],
+        generation: int,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> Dict[str, Any]:
+        """Fetch a GET response and cache it, or invalidate what it changed."""
+        result = await self._async_request_with_retries(
+            method, endpoint, data, params, priority
+        )
+        if self.cache.ttl_for(endpoint) > 0:
+            self.cache.set(key, result, generation)
+        else:
+            # Uncached GETs such as wakeup and sleep are commands
+            self.cache.invalidate_for(endpoint)
+            self._notify_command(endpoint)
+        return result
+
+    async def _async_request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_BACKGROUND,
+        fetch: Optional[Callable[..., Awaitable[Any]]] = None,
+    ) -> Any:
+        """Send a request, retrying and tripping the breaker as needed."""
+        fetch = fetch or self._async_fetch
+        limiter = self.limiter or contextlib.nullcontext()
+        attempt = 0
+        while True:
+            if self.breaker.is_open:
+                self._async_start_probe()
+                raise OpenKarotzUnavailableError(
+                    f"OpenKarotz at {self.base_url} is unreachable "
+                    f"(circuit open for {self.breaker.open_for:.0f}s)"
+                )
+
+            try:
+                async with self.command_queue.slot(priority), limiter:
+                    start = time.monotonic()
+                    try:
+                        result = await fetch(method, endpoint, data, params)
+                    except OpenKarotzAPIError as e:
+                        self.metrics.record(endpoint, time.monotonic() - start, str(e))
+                        raise
+                    self.metrics.record(endpoint, time.monotonic() - start)
+            except OpenKarotzConnectionError as e:
+                if not self.retry_policy.should_retry(method, attempt):
+                    # The breaker counts requests that failed, not attempts,
+                    # so one request exhausting its retries cannot open it
+                    if self.breaker.record_failure():
+                        _LOGGER.warning(
+                            "OpenKarotz at %s failed %d requests in a row, pausing requests",
+                            self.base_url,
+                            self.breaker.consecutive_failures,
+                        )
+                        self._async_start_probe()
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                attempt += 1
+                _LOGGER.debug(
+                    "Retrying %s %s in %.2fs (attempt %d): %s",
+                    method,
+                    endpoint,
+                    delay,
+                    attempt + 1,
+                    e,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    async def _async_fetch(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Dict[str, Any]:
+        """Perform a single HTTP exchange with the device."""
+        raw = await self._async_exchange(
+            method, endpoint, self.decoder.async_read, data, params, timeout, session
+        )
+
+        # Decode after the connection has been handed back to the pool
+        try:
+            return self.decoder.decode(raw)
+        except ValueError as e:
+            _LOGGER.error(f"Invalid JSON response: {e}")
+            raise OpenKarotzAPIError(f"Invalid response format: {e}")
+
+    async def _async_fetch_image(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Union[bytes, bytearray], str]:
+        """Fetch an image body once, without decoding it."""
+
+        async def read(response: aiohttp.ClientResponse) -> Tuple[Union[bytes, bytearray], str]:
+            return await self.image_reader.async_read(response), response.content_type
+
+        return await self._async_exchange(method, endpoint, read, data, params)
+
+    async def _async_exchange(
+        self,
+        method: str,
+        endpoint: str,
+        read: Callable[[aiohttp.ClientResponse], Awaitable[Any]],
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Any:
+        """Send a request and read its body, mapping failures to API errors."""
+        session = session or self.session
+        if not session:
+            raise OpenKarotzConnectionError("Not connected to OpenKarotz")
+
         url = urljoin(self.base_url, endpoint)
 
         try:
-            async with self.session.request(
+            async with session.request(
                 method=method,
                 url=url,
                 json=data,
                 params=params,
+                timeout=timeout or self._request_timeout,
             ) as response:
                 response.raise_for_status()
-                content_type = response.headers.get("Content-Type", "")
-                if "application/json" in content_type:
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    try:
-                        return json.loads(text)
-                    except json.JSONDecodeError as e:
-                        _LOGGER.error(f"Invalid JSON response: {e}")
-                        raise OpenKarotzAPIError(f"Invalid response format: {e}")
-
-        except aiohttp.ClientError as e:
-            _LOGGER.error(f"API request error: {e}")
-            raise OpenKarotzConnectionError(f"API request failed: {e}")
-
-        except json.JSONDecodeError as e:
-            _LOGGER.error(f"Invalid JSON response: {e}")
-            raise OpenKarotzAPIError(f"Invalid response format: {e}")
+                return await read(response)
 
         except aiohttp.ClientResponseError as e:
             if e.status == 401:
                 raise OpenKarotzAuthenticationError("Authentication failed")
+            if e.status == 404:
+                raise OpenKarotzNotSupportedError(f"Endpoint not supported: {endpoint}")
             raise OpenKarotzAPIError(f"API error: {e.status}")
 
-    async def get_info(self) -> Dict[str, Any]:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug(f"API request error: {e!r}")
+            raise OpenKarotzConnectionError(f"API request failed: {e!r}")
+
+        except ResponseTooLargeError as e:
+            _LOGGER.error(f"Rejected response from {endpoint}: {e}")
+            raise OpenKarotzAPIError(f"Invalid response: {e}")
+
+    def _async_start_probe(self) -> None:
+        """Start probing a device whose circuit breaker has opened."""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.get_running_loop().create_task(
+                self._async_probe_loop()
+            )
+
+    async def _async_probe_loop(self) -> None:
+        """Probe the device in the background until it answers again."""
+        while self.breaker.is_open:
+            await asyncio.sleep(self.breaker.recovery_timeout)
+            self.breaker.begin_probe()
+            try:
+                await self._async_fetch("GET", API_ENDPOINTS["GET_INFO"])
+            except OpenKarotzConnectionError as e:
+                self.breaker.record_failure()
+                _LOGGER.debug("OpenKarotz at %s still unreachable: %s", self.base_url, e)
+            except OpenKarotzAPIError:
+                # The device answered, even if with an error
+                self.breaker.record_success()
+            else:
+                self.breaker.record_success()
+
+    async def get_info(self, use_cache: bool = True) -> Dict[str, Any]:
         """Get device information.
 
+        Args:
+            use_cache: Whether a cached response may be returned
+
         Returns:
             Dictionary with device information
         """
-        return await self._async_request("GET", API_ENDPOINTS["GET_INFO"], skip_connection_check=True)
+        return await self._async_request(
+            "GET", API_ENDPOINTS["GET_INFO"], skip_connection_check=True, use_cache=use_cache
+        )
+
+    async def get_events(
+        self,
+        cursor: Optional[int] = None,
+        wait: float = DEFAULT_EVENT_WAIT,
+    ) -> Dict[str, Any]:
+        """Wait for button, ear and RFID events (long poll).
+
+        The device holds the request open until an event newer than
+        ``cursor`` occurs or ``wait`` seconds pass. The request bypasses the
+        response cache, command queue and retries so that it never holds a
+        slot needed by regular requests, and goes through the event session
+        when one is set so that it never holds a pooled socket either.
+
+        Args:
+            cursor: Id of the last event already seen; omit to only fetch
+                the current cursor
+            wait: Seconds the device may hold the request open
+
+        Returns:
+            Dictionary with the new cursor and a list of events
+
+        Raises:
+            OpenKarotzNotSupportedError: If the firmware has no event endpoint
+        """
+        if not self._is_connected or not self.session:
+            raise OpenKarotzConnectionError("Not connected to OpenKarotz")
+        if self.breaker.is_open:
+            raise OpenKarotzUnavailableError(f"OpenKarotz at {self.base_url} is unreachable")
+
+        params: Dict[str, Any] = {"wait": wait}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return await self._async_fetch(
+            "GET",
+            API_ENDPOINTS["EVENTS"],
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=wait + self.timeout),
+            session=self.event_session,
+        )
 
     async def get_version(self) -> Dict[str, Any]:
         """Get device firmware versions.
@@ -174,7 +526,13 @@ class OpenKarotzAPI:
             API response
         """
         params = {"silent": 1 if silent else 0}
-        return await self._async_request("GET", API_ENDPOINTS["WAKEUP"], params=params, skip_connection_check=True)
+        return await self._async_request(
+            "GET",
+            API_ENDPOINTS["WAKEUP"],
+            params=params,
+            skip_connection_check=True,
+            priority=PRIORITY_INTERACTIVE,
+        )
 
     async def sleep(self) -> Dict[str, Any]:
         """Put device to sleep.
@@ -182,23 +540,34 @@ class OpenKarotzAPI:
         Returns:
             API response
         """
-        return await self._async_request("GET", API_ENDPOINTS["SLEEP"], skip_connection_check=True)
-
-    async def get_state(self) -> Dict[str, Any]:
+        return await self._async_request(
+            "GET",
+            API_ENDPOINTS["SLEEP"],
+            skip_connection_check=True,
+            priority=PRIORITY_INTERACTIVE,
+        )
+
+    async def get_state(self, use_cache: bool = True) -> Dict[str, Any]:
         """Get device state.
 
+        Args:
+            use_cache: Whether a cached response may be returned
+
         Returns:
             Dictionary with device state
         """
-        return await self._async_request("GET", API_ENDPOINTS["GET_STATE"])
+        return await self._async_request("GET", API_ENDPOINTS["GET_STATE"], use_cache=use_cache)
 
-    async def get_leds(self) -> Dict[str, Any]:
+    async def get_leds(self, use_cache: bool = True) -> Dict[str, Any]:
         """Get LED information and state.
 
+        Args:
+            use_cache: Whether a cached response may be returned
+
         Returns:
             Dictionary with LED information
         """
-        return await self._async_request("GET", API_ENDPOINTS["GET_LEDS"])
+        return await self._async_request("GET", API_ENDPOINTS["GET_LEDS"], use_cache=use_cache)
 
     async def set_led(
         self,
@@ -210,6 +579,9 @@ class OpenKarotzAPI:
     ) -> Dict[str, Any]:
         """Set LED configuration.
 
+        Commands issued while an earlier one is still being sent are merged
+        into a single request, the latest value winning per attribute.
+
         Args:
             color: Color name (e.g., "red", "blue")
             brightness: Brightness level (0-100)
@@ -232,28 +604,69 @@ class OpenKarotzAPI:
         if rgb_value is not None:
             data["rgb_value"] = rgb_value
 
+        return await self.led_coalescer.submit(data)
+
+    async def _async_send_leds(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one, possibly merged, LED update."""
         return await self._async_request("POST", API_ENDPOINTS["POST_LEDS"], data)
 
-    async def get_tts(self) -> Dict[str, Any]:
+    async def send_led_frame(self, rgb_value: str, brightness: int) -> Dict[str, Any]:
+        """Send one intermediate frame of a client-side LED effect.
+
+        Frames are queued at background priority, so an effect that runs
+        for hours does not hold up polling, and are not reported to command
+        listeners, as they are not commands to confirm by polling fast.
+
+        Args:
+            rgb_value: RGB color value (e.g., "FF0000")
+            brightness: Brightness level (0-100)
+
+        Returns:
+            API response
+        """
+        if not self._is_connected or not self.session:
+            raise OpenKarotzConnectionError("Not connected to OpenKarotz")
+        result = await self._async_request_with_retries(
+            "POST",
+            API_ENDPOINTS["POST_LEDS"],
+            {"rgb_value": rgb_value, "brightness": brightness},
+            priority=PRIORITY_BACKGROUND,
+        )
+        self.cache.invalidate_for(API_ENDPOINTS["POST_LEDS"])
+        return result
+
+    async def get_tts(self, use_cache: bool = True) -> Dict[str, Any]:
         """Get TTS information and state.
 
+        Args:
+            use_cache: Whether a cached response may be returned
+
         Returns:
             Dictionary with TTS information
         """
-        return await self._async_request("GET", API_ENDPOINTS["GET_TTS"])
+        return await self._async_request("GET", API_ENDPOINTS["GET_TTS"], use_cache=use_cache)
 
     async def play_tts(
         self,
         text: str,
         voice: Optional[str] = None,
         category: Optional[str] = None,
+        stream: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Play text-to-speech.
 
+        Utterances are spoken in order, one at a time. Identical utterances
+        waiting or spoken within the dedup window are not spoken again, and
+        urgent categories overtake and interrupt other speech. Streamed
+        texts are sent sentence by sentence and the call returns once the
+        first one is being spoken.
+
         Args:
             text: Text to speak
             voice: Voice identifier
             category: TTS category (e.g., "notification")
+            stream: Whether to send the text in sentence chunks; by default
+                only long texts are streamed
 
         Returns:
             API response
@@ -264,7 +677,79 @@ class OpenKarotzAPI:
         if category is not None:
             data["category"] = category
 
-        return await self._async_request("POST", API_ENDPOINTS["GET_TTS"], data)
+        return await self.tts_queue.submit(data, stream=stream)
+
+    async def _async_send_tts(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one queued utterance."""
+        return await self._async_request("POST", API_ENDPOINTS["POST_TTS"], data)
+
+    async def _async_fetch_tts_status(self) -> Dict[str, Any]:
+        """Return the device's TTS state, bypassing the response cache."""
+        self.cache.invalidate_endpoint(API_ENDPOINTS["GET_TTS"])
+        return await self.get_tts()
+
+    async def play_stream(self, url: str) -> Dict[str, Any]:
+        """Play an audio stream or clip.
+
+        Args:
+            url: URL the device fetches the audio from
+
+        Returns:
+            API response
+        """
+        return await self._async_request(
+            "GET",
+            API_ENDPOINTS["PLAY_STREAM"],
+            params={"url": url},
+            priority=PRIORITY_INTERACTIVE,
+        )
+
+    async def pause(self) -> Dict[str, Any]:
+        """Pause stream playback.
+
+        Returns:
+            API response
+        """
+        return await self._async_request(
+            "GET",
+            API_ENDPOINTS["PAUSE"],
+            priority=PRIORITY_INTERACTIVE,
+        )
+
+    async def take_snapshot(self) -> Tuple[Union[bytes, bytearray], str]:
+        """Capture a snapshot with the device camera.
+
+        The image is read into a single buffer and never cached by the
+        response cache.
+
+        Returns:
+            Image bytes and their content type
+        """
+        if not self._is_connected or not self.session:
+            raise OpenKarotzConnectionError("Not connected to OpenKarotz")
+        return await self._async_request_with_retries(
+            "GET",
+            API_ENDPOINTS["TAKE_SNAPSHOT"],
+            priority=PRIORITY_INTERACTIVE,
+            fetch=self._async_fetch_image,
+        )
+
+    async def clear_snapshots(self) -> Dict[str, Any]:
+        """Delete the snapshots stored on the device.
+
+        Sent past the response cache and command listeners, as clearing
+        storage changes nothing the entities show.
+
+        Returns:
+            API response
+        """
+        if not self._is_connected or not self.session:
+            raise OpenKarotzConnectionError("Not connected to OpenKarotz")
+        return await self._async_request_with_retries(
+            "GET",
+            API_ENDPOINTS["CLEAR_SNAPSHOTS"],
+            priority=PRIORITY_BACKGROUND,
+        )
 
     async def get_apps(self) -> Dict[str, Any]:
         """Get applications information.
@@ -0,0 +1,128 @@
+"""Response cache for the OpenKarotz API client."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from .const import CACHE_INVALIDATIONS, CACHE_TTLS, DEFAULT_CACHE_MAX_ENTRIES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Bounded LRU cache of parsed responses with per-endpoint TTLs.
+
+    Keys are ``(endpoint, params)`` tuples as built by the API client. Only
+    endpoints with a positive TTL are cached; successful writes drop the
+    entries of every endpoint they are known to affect.
+
+    Each invalidation also advances the endpoint's generation. A response
+    fetched under an older generation was read before the write and is not
+    stored, so a GET in flight during a write cannot cache pre-write data.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        invalidations: Optional[Dict[str, Iterable[str]]] = None,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Initialize response cache.
+
+        Args:
+            ttls: Seconds to keep responses for, keyed by endpoint
+            invalidations: Endpoints to drop after a write, keyed by the
+                endpoint written to
+            max_entries: Maximum number of responses kept
+        """
+        self.ttls = CACHE_TTLS if ttls is None else ttls
+        self.invalidations = CACHE_INVALIDATIONS if invalidations is None else invalidations
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = 0
+        self.stale_discarded = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL configured for an endpoint, 0 if uncached."""
+        return self.ttls.get(endpoint, 0)
+
+    def generation(self, endpoint: str) -> int:
+        """Return how many times an endpoint has been invalidated."""
+        return self._generations.get(endpoint, 0)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Return a fresh cached response, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any, generation: Optional[int] = None) -> None:
+        """Store a response if its endpoint is cacheable.
+
+        Args:
+            key: Cache key of the response
+            value: Parsed response
+            generation: Generation of the endpoint when the request was
+                sent; the response is dropped if it has changed since
+        """
+        ttl = self.ttl_for(key[0])
+        if ttl <= 0:
+            return
+        if generation is not None and generation != self.generation(key[0]):
+            self.stale_discarded += 1
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_endpoint(self, endpoint: str) -> None:
+        """Drop all cached responses of an endpoint."""
+        self._generations[endpoint] = self.generation(endpoint) + 1
+        stale = [key for key in self._entries if key[0] == endpoint]
+        for key in stale:
+            del self._entries[key]
+        self.invalidated += len(stale)
+
+    def invalidate_for(self, endpoint: str) -> None:
+        """Drop cached responses made stale by a write to an endpoint."""
+        for affected in self.invalidations.get(endpoint, ()):
+            self.invalidate_endpoint(affected)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidated": self.invalidated,
+            "stale_discarded": self.stale_discarded,
+        }
@@ -0,0 +1,94 @@
+"""OpenKarotz camera."""
+
+import logging
+from typing import Optional
+
+from homeassistant.components.camera import Camera
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .api import OpenKarotzAPIError
+from .coordinator import OpenKarotzCoordinator
+from .const import DOMAIN, SNAPSHOT_ARCHIVE_DIR
+from .entity import OpenKarotzEntity
+from .snapshot import Frame, SnapshotFetcher
+from .snapshot_store import SnapshotArchive, SnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up OpenKarotz cameras."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    store = SnapshotStore(hass.config.path(SNAPSHOT_ARCHIVE_DIR, entry.entry_id))
+    archive = SnapshotArchive(hass, store, coordinator.api.clear_snapshots)
+    await archive.async_open()
+    # Browsed through the media source
+    hass.data[DOMAIN][entry.entry_id]["snapshot_archive"] = archive
+    async_add_entities([OpenKarotzCamera(coordinator, archive=archive)])
+
+
+class OpenKarotzCamera(OpenKarotzEntity, Camera):
+    """Camera showing snapshots taken by the rabbit."""
+
+    _coordinator_sections = ("info",)
+    _attr_has_entity_name = True
+    _attr_name = "Snapshot"
+
+    def __init__(
+        self,
+        coordinator: OpenKarotzCoordinator,
+        fetcher: Optional[SnapshotFetcher] = None,
+        archive: Optional[SnapshotArchive] = None,
+    ) -> None:
+        """Initialize camera."""
+        super().__init__(coordinator)
+        Camera.__init__(self)
+        self.fetcher = fetcher or SnapshotFetcher(coordinator.api.take_snapshot)
+        self.archive = archive
+        self._attr_unique_id = f"{coordinator.device_id}_camera"
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Archive every captured frame while the camera is added."""
+        await super().async_added_to_hass()
+        if self.archive is not None:
+            self.async_on_remove(self.fetcher.add_listener(self._archive_frame))
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Close the archive."""
+        await super().async_will_remove_from_hass()
+        if self.archive is not None:
+            await self.archive.async_close()
+
+    @callback
+    def _archive_frame(self, frame: Frame) -> None:
+        """Archive a frame without holding up the viewers waiting for it."""
+        self.hass.async_create_background_task(
+            self.archive.async_archive(frame), f"OpenKarotz snapshot archive {self.coordinator.api.base_url}"
+        )
+
+    async def async_camera_image(
+        self, width: Optional[int] = None, height: Optional[int] = None
+    ) -> Optional[bytes]:
+        """Return the latest snapshot, capturing a new one if it is too old."""
+        try:
+            frame = await self.fetcher.async_get()
+        except OpenKarotzAPIError as e:
+            _LOGGER.warning("Could not take snapshot on %s: %s", self.coordinator.api.base_url, e)
+            return None
+        self.content_type = frame.content_type
+        return frame.image
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return snapshot and archive counters."""
+        return {
+            **self.fetcher.stats,
+            "archive": self.archive.stats if self.archive is not None else None,
+        }
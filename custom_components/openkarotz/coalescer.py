@@ -0,0 +1,108 @@
+"""Coalescing of rapid LED commands for OpenKarotz devices."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Attributes that each select how the LED color is set; a new one replaces
+# any other that is still pending
+COLOR_ATTRIBUTES = frozenset({"color", "rgb_value", "color_temperature", "preset"})
+
+
+class LedCommandCoalescer:
+    """Merge LED commands that arrive while one is already being sent.
+
+    The first command is sent at once. Commands arriving while it is in
+    flight are merged into a single pending update, the last value winning
+    per attribute, and sent as one request when the device is free again.
+    Values superseded this way never reach the wire; a request that is
+    already on the wire is never cancelled, as the device may have applied
+    it. Every caller waits for the request that carried its values.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        """Initialize LED command coalescer.
+
+        Args:
+            send: Coroutine function sending one merged LED update
+        """
+        self._send = send
+        self._pending: Dict[str, Any] = {}
+        self._waiters: List[asyncio.Future] = []
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.sent = 0
+        self.superseded = 0
+
+    async def submit(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue LED changes and wait until the device has accepted them.
+
+        Args:
+            changes: LED attributes to set
+
+        Returns:
+            API response of the request that carried the changes
+        """
+        self.submitted += 1
+        if COLOR_ATTRIBUTES.intersection(changes):
+            for key in COLOR_ATTRIBUTES.intersection(self._pending):
+                if key not in changes:
+                    del self._pending[key]
+                    self.superseded += 1
+        self.superseded += len(self._pending.keys() & changes.keys())
+        self._pending.update(changes)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters.append(future)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._async_flush())
+
+        # Shield the shared request so one caller's cancellation does not
+        # cancel it for the others merged into it
+        return await asyncio.shield(future)
+
+    async def _async_flush(self) -> None:
+        """Send merged updates until nothing is pending."""
+        while self._waiters:
+            batch, waiters = self._pending, self._waiters
+            self._pending, self._waiters = {}, []
+            self.sent += 1
+            if len(waiters) > 1:
+                _LOGGER.debug("Sending %d LED commands as one: %s", len(waiters), batch)
+
+            try:
+                result = await self._send(batch)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            except BaseException:
+                # The flush itself was cancelled; release the callers of this
+                # request and of the commands queued behind it, then stop
+                for waiter in waiters + self._waiters:
+                    if not waiter.done():
+                        waiter.cancel()
+                self._pending, self._waiters = {}, []
+                raise
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+
+    @property
+    def collapsed(self) -> int:
+        """Return how many commands were merged into another request."""
+        return self.submitted - self.sent - len(self._waiters)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return command counters."""
+        return {
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "collapsed": self.collapsed,
+            "superseded_values": self.superseded,
+        }
@@ -0,0 +1,102 @@
+"""Response body decoding for the OpenKarotz API client."""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Union
+
+import aiohttp
+
+from .const import DEFAULT_MAX_BODY_SIZE
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+class ResponseTooLargeError(ValueError):
+    """Response body exceeds the configured maximum size."""
+
+
+def json_loads(raw: Union[bytes, bytearray]) -> Any:
+    """Decode a JSON document from raw bytes with the fastest backend."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class ResponseDecoder:
+    """Read and decode device responses, tracking size and decode time.
+
+    The Karotz CGI scripts often label JSON as ``text/html``, so bodies are
+    always read once as bytes and handed to the JSON backend directly rather
+    than being decoded to ``str`` first.
+    """
+
+    def __init__(self, max_body_size: int = DEFAULT_MAX_BODY_SIZE) -> None:
+        """Initialize response decoder.
+
+        Args:
+            max_body_size: Largest accepted response body in bytes
+        """
+        self.max_body_size = max_body_size
+        self.decoded = 0
+        self.decoded_bytes = 0
+        self.decode_time = 0.0
+        self.max_decode_time = 0.0
+
+    async def async_read(self, response: aiohttp.ClientResponse) -> Union[bytes, bytearray]:
+        """Read a response body, refusing bodies above the size limit.
+
+        Raises:
+            ResponseTooLargeError: If the body is larger than allowed
+        """
+        length = response.content_length
+        if length is not None:
+            if length > self.max_body_size:
+                raise ResponseTooLargeError(
+                    f"Response of {length} bytes exceeds limit of {self.max_body_size}"
+                )
+            return await response.read()
+
+        body = bytearray()
+        async for chunk in response.content.iter_any():
+            body += chunk
+            if len(body) > self.max_body_size:
+                raise ResponseTooLargeError(
+                    f"Response exceeds limit of {self.max_body_size} bytes"
+                )
+        return body
+
+    def decode(self, raw: Union[bytes, bytearray]) -> Any:
+        """Decode a JSON body, recording how long decoding took.
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        start = time.perf_counter()
+        try:
+            return json_loads(raw)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.decoded += 1
+            self.decoded_bytes += len(raw)
+            self.decode_time += elapsed
+            self.max_decode_time = max(self.max_decode_time, elapsed)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return decoding counters."""
+        return {
+            "backend": JSON_BACKEND,
+            "decoded": self.decoded,
+            "decoded_bytes": self.decoded_bytes,
+            "total_decode_ms": round(1000 * self.decode_time, 3),
+            "avg_decode_us": round(1e6 * self.decode_time / self.decoded, 1) if self.decoded else 0.0,
+            "max_decode_us": round(1e6 * self.max_decode_time, 1),
+        }
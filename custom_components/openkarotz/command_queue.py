@@ -0,0 +1,177 @@
+"""Per-device request scheduling for OpenKarotz."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from .const import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_NAMES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket limiting the sustained request rate."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second; 0 disables the limit
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> float:
+        """Take a token if available.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class CommandQueue:
+    """Priority scheduler bounding concurrent and per-second device requests.
+
+    Every HTTP exchange with a device takes a slot from its queue. Waiters are
+    served lowest priority value first, FIFO within a priority, so interactive
+    commands such as LED changes and TTS overtake background polling.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: float = DEFAULT_RATE_BURST,
+    ) -> None:
+        """Initialize command queue.
+
+        Args:
+            max_in_flight: Maximum concurrent requests to the device
+            rate: Sustained requests per second; 0 disables rate limiting
+            burst: Requests that may be sent back to back after idling
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.bucket = TokenBucket(rate, burst)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.dispatched = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._wait_by_priority: Dict[int, Tuple[int, float]] = {}
+
+    @property
+    def depth(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently being sent."""
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_BACKGROUND) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Wait for a request slot."""
+        queued_at = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self.max_depth = max(self.max_depth, self.depth)
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as we were cancelled
+                self.release()
+            raise
+
+        waited = time.monotonic() - queued_at
+        self.dispatched += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        count, total = self._wait_by_priority.get(priority, (0, 0.0))
+        self._wait_by_priority[priority] = (count + 1, total + waited)
+
+    def release(self) -> None:
+        """Return a request slot."""
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiters while capacity and tokens allow."""
+        while self._waiters and self._in_flight < self.max_in_flight:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            delay = self.bucket.try_take()
+            if delay > 0:
+                if self._wakeup is None:
+                    self._wakeup = asyncio.get_running_loop().call_later(
+                        delay, self._wake
+                    )
+                return
+
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _wake(self) -> None:
+        """Resume dispatching once a token is available."""
+        self._wakeup = None
+        self._dispatch()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth and wait-time metrics."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "in_flight": self._in_flight,
+            "dispatched": self.dispatched,
+            "avg_wait_ms": round(1000 * self.total_wait / self.dispatched, 2) if self.dispatched else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 2),
+            **{
+                f"avg_wait_ms_{PRIORITY_NAMES.get(priority, priority)}": round(1000 * total / count, 2)
+                for priority, (count, total) in sorted(self._wait_by_priority.items())
+            },
+        }
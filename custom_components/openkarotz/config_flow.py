@@ -7,8 +7,10 @@ import logging
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.const import CONF_DEVICE_ID, CONF_HOST, CONF_PORT
 from .api import OpenKarotzAPI
+from .identity import device_id_from_info
+from .session import async_get_session
 
 from .const import DOMAIN
 
@@ -40,7 +42,7 @@ class OpenKarotzConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             # Test connection
             try:
-                api = OpenKarotzAPI(host, port)
+                api = OpenKarotzAPI(host, port, session=async_get_session(self.hass))
                 await api.async_connect()
 
                 # Check if device is reachable
@@ -55,7 +57,11 @@ class OpenKarotzConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         errors["base"] = "already_configured"
 
                     if not errors:
-                        return self.async_create_entry(title=f"OpenKarotz ({host})", data=user_input)
+                        data = {**user_input}
+                        device_id = device_id_from_info(info)
+                        if device_id:
+                            data[CONF_DEVICE_ID] = device_id
+                        return self.async_create_entry(title=f"OpenKarotz ({host})", data=data)
             except Exception as e:
                 _LOGGER.error(f"Connection test failed: {e}")
                 errors["base"] = "connection_failed"
@@ -5,6 +5,9 @@ import voluptuous as vol
 # Integration name and domain
 DOMAIN = "openkarotz"
 
+# Device ID of entities created before a rabbit's own ID was stored
+UNKNOWN_DEVICE_ID = "unknown"
+
 # API endpoints
 API_ENDPOINTS = {
       "GET_INFO": "/cgi-bin/status",
@@ -27,12 +30,15 @@ API_ENDPOINTS = {
       "PAUSE": "/cgi-bin/pause",
       "SQUEEZEBOX_START": "/cgi-bin/squeezebox_start",
       "SQUEEZEBOX_STOP": "/cgi-bin/squeezebox_stop",
+      "EVENTS": "/cgi-bin/events",
 }
 
 # Service names
 SERVICE_NAMES = {
     "SET_LED": "set_led",
     "PLAY_TTS": "play_tts",
+    "SET_LED_BULK": "set_led_bulk",
+    "PLAY_TTS_BULK": "play_tts_bulk",
 }
 
 # Sensor types
@@ -75,14 +81,178 @@ SERVICE_DATA_SCHEMAS = {
         vol.Required("text"): str,
         vol.Optional("voice"): str,
         vol.Optional("category"): str,
+        vol.Optional("stream"): bool,
+    },
+    "set_led_bulk": {
+        vol.Optional("config_entry_ids", default=[]): [str],
+        vol.Optional("device_ids", default=[]): [str],
+        vol.Optional("area_ids", default=[]): [str],
+        vol.Optional("timeout"): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+        vol.Optional("color"): str,
+        vol.Optional("brightness"): int,
+        vol.Optional("color_temperature"): int,
+        vol.Optional("preset"): str,
+        vol.Optional("rgb_value"): str,
+    },
+    "play_tts_bulk": {
+        vol.Optional("config_entry_ids", default=[]): [str],
+        vol.Optional("device_ids", default=[]): [str],
+        vol.Optional("area_ids", default=[]): [str],
+        vol.Optional("timeout"): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+        vol.Required("text"): str,
+        vol.Optional("voice"): str,
+        vol.Optional("category"): str,
+        vol.Optional("stream"): bool,
     },
 }
 
+# Bulk services: devices commanded at once, and seconds allowed per device
+DEFAULT_BULK_CONCURRENCY = 16
+DEFAULT_BULK_TIMEOUT = 10
+
 # Default values
 DEFAULT_PORT = 80
 DEFAULT_TIMEOUT = 10
 DEFAULT_RECONNECT_ATTEMPTS = 3
 DEFAULT_RECONNECT_DELAY = 5
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_MAX_DELAY = 4
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Adaptive polling, in seconds
+DEFAULT_SCAN_INTERVAL = 30
+MIN_SCAN_INTERVAL = 2
+MAX_SCAN_INTERVAL = 300
+SCAN_BACKOFF_FACTOR = 2
+# Polls at the minimum interval after a command, so its effect shows quickly
+FAST_POLL_COUNT = 3
+
+# Per-source polling: seconds between refreshes (None follows the adaptive
+# coordinator interval) and how long, in seconds, the last good value is
+# kept while refreshes of that source fail
+SOURCE_SCHEDULES = {
+    "info": (None, 300),
+    "leds": (None, 300),
+    "tts": (None, 120),
+    "moods": (3600, 86400),
+    "version": (86400, 7 * 86400),
+}
+
+# Integration-wide polling scheduler
+DATA_FLEET = f"{DOMAIN}_fleet"
+DEFAULT_FLEET_MAX_CONCURRENCY = 16
+
+# Push events: seconds the device may hold a long poll open, the shortest
+# time between long polls it answers early, and reconnect backoff bounds
+# when the event channel drops
+EVENT_OPENKAROTZ = f"{DOMAIN}_event"
+DEFAULT_EVENT_WAIT = 25
+DEFAULT_EVENT_MIN_INTERVAL = 1
+DEFAULT_EVENT_RECONNECT_DELAY = 1
+DEFAULT_EVENT_MAX_RECONNECT_DELAY = 60
+
+# LED effects: frame table resolution, the shortest time between frames
+# sent to the device, the share of the device's request rate that frames may
+# use, and the effects offered by the light
+EFFECT_FRAME_RATE = 20
+MIN_FRAME_INTERVAL = 0.05
+EFFECT_RATE_SHARE = 0.5
+EFFECT_PULSE = "pulse"
+EFFECT_BLINK = "blink"
+EFFECT_COLOR_CYCLE = "color_cycle"
+LIGHT_EFFECTS = [EFFECT_PULSE, EFFECT_BLINK, EFFECT_COLOR_CYCLE]
+
+# TTS queue: seconds an utterance suppresses identical ones, categories that
+# interrupt and overtake other speech, and how speech completion is awaited
+DEFAULT_TTS_DEDUP_WINDOW = 10
+TTS_URGENT_CATEGORIES = frozenset({"alarm", "alert", "emergency", "urgent"})
+TTS_STATUS_POLL_INTERVAL = 1
+TTS_MAX_UTTERANCE_DURATION = 120
+
+# Streamed TTS: longest chunk sent in one request, in characters; longer
+# texts are streamed unless told otherwise
+TTS_CHUNK_MAX_CHARS = 200
+
+# Media relay: URL the rabbits fetch media from, bytes written per chunk,
+# on-disk cache budget and largest cached clip in bytes, and how many
+# sources keep a relay URL
+DATA_RELAY = f"{DOMAIN}_relay"
+RELAY_URL = f"/api/{DOMAIN}/relay/{{token}}"
+DEFAULT_RELAY_CHUNK_SIZE = 64 * 1024
+MEDIA_CACHE_DIR = f".{DOMAIN}_media_cache"
+DEFAULT_MEDIA_CACHE_SIZE = 200 * 1024 * 1024
+DEFAULT_MEDIA_CACHE_MAX_CLIP = 20 * 1024 * 1024
+RELAY_MAX_SOURCES = 256
+
+# Shared connection pool for regular requests
+DATA_SESSION = f"{DOMAIN}_session"
+DEFAULT_POOL_LIMIT = 128
+DEFAULT_POOL_LIMIT_PER_HOST = 3
+DEFAULT_KEEPALIVE_TIMEOUT = 45
+DEFAULT_DNS_CACHE_TTL = 300
+
+# Connection pool for event long polls; one socket per device, no total limit
+DATA_EVENT_SESSION = f"{DOMAIN}_event_session"
+
+# Largest response body accepted from a device, in bytes
+DEFAULT_MAX_BODY_SIZE = 256 * 1024
+
+# Snapshots: largest image accepted from a device in bytes, and seconds the
+# latest frame is shown to viewers before a new one is captured
+DEFAULT_MAX_SNAPSHOT_SIZE = 4 * 1024 * 1024
+DEFAULT_SNAPSHOT_MAX_AGE = 2
+
+# Snapshot archive: directory of the per-entry rings, URL archived frames
+# are served from, slots per ring, seconds of capture time per slot (one day
+# at one frame a minute), and frames archived between two clears of the
+# device's own snapshot storage
+SNAPSHOT_ARCHIVE_DIR = f".{DOMAIN}_snapshots"
+SNAPSHOT_ARCHIVE_URL = f"/api/{DOMAIN}/snapshot/{{entry_id}}/{{timestamp}}"
+DEFAULT_SNAPSHOT_ARCHIVE_SLOTS = 1440
+DEFAULT_SNAPSHOT_ARCHIVE_INTERVAL = 60
+DEFAULT_SNAPSHOT_CLEAR_BATCH = 10
+
+# Latency histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 75, 100, 150, 250, 500, 750, 1000, 2500, 5000, 10000)
+
+# Endpoints with latency diagnostics sensors
+DIAGNOSTIC_ENDPOINTS = {
+    "status": API_ENDPOINTS["GET_STATE"],
+    "leds": API_ENDPOINTS["GET_LEDS"],
+    "tts": API_ENDPOINTS["GET_TTS"],
+}
+
+# Per-device request scheduling
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_RATE_LIMIT = 5
+DEFAULT_RATE_BURST = 5
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# Response cache: seconds to keep each endpoint's response
+DEFAULT_CACHE_MAX_ENTRIES = 32
+CACHE_TTLS = {
+    API_ENDPOINTS["GET_STATE"]: 5,
+    API_ENDPOINTS["GET_LEDS"]: 5,
+    API_ENDPOINTS["GET_TTS"]: 2,
+    API_ENDPOINTS["GET_APPS"]: 3600,
+    API_ENDPOINTS["GET_VERSION"]: 86400,
+}
+
+# Response cache: endpoints made stale by a successful write to an endpoint
+CACHE_INVALIDATIONS = {
+    API_ENDPOINTS["POST_LEDS"]: (API_ENDPOINTS["GET_LEDS"], API_ENDPOINTS["GET_STATE"]),
+    API_ENDPOINTS["POST_TTS"]: (API_ENDPOINTS["GET_TTS"], API_ENDPOINTS["GET_STATE"]),
+    API_ENDPOINTS["WAKEUP"]: (API_ENDPOINTS["GET_STATE"],),
+    API_ENDPOINTS["SLEEP"]: (API_ENDPOINTS["GET_STATE"],),
+    API_ENDPOINTS["CLEAR_CACHE"]: (API_ENDPOINTS["GET_STATE"],),
+    API_ENDPOINTS["PLAY_STREAM"]: (API_ENDPOINTS["GET_STATE"],),
+    API_ENDPOINTS["PAUSE"]: (API_ENDPOINTS["GET_STATE"],),
+}
 
 # Entity attributes
 ATTR_LAST_UPDATE = "last_update"
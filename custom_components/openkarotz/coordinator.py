@@ -2,31 +2,138 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import OpenKarotzAPI
+from .fleet import FleetScheduler
 from .const import (
+    API_ENDPOINTS,
     ATTR_ERROR_MESSAGE,
     ATTR_LAST_UPDATE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_OPENKAROTZ,
+    FAST_POLL_COUNT,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    SCAN_BACKOFF_FACTOR,
+    SOURCE_SCHEDULES,
+    UNKNOWN_DEVICE_ID,
 )
 
+if TYPE_CHECKING:
+    from .events import OpenKarotzEventListener
+
 _LOGGER = logging.getLogger(__name__)
 
 
+class PollSource:
+    """Refresh schedule and last good value of one data source."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: Optional[float],
+        max_age: float,
+    ) -> None:
+        """Initialize poll source.
+
+        Args:
+            name: Section of the coordinator data the source fills
+            fetch: Coroutine function returning the source's data
+            interval: Seconds between refreshes, or None to refresh on
+                every coordinator update
+            max_age: Seconds the last good value is kept while refreshes fail
+        """
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.max_age = max_age
+        self.data: Dict[str, Any] = {}
+        self.fetched_at: Optional[float] = None
+        self.fetches = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def is_due(self, now: float, coordinator_interval: float) -> bool:
+        """Return whether the source should be fetched in this update."""
+        if self.fetched_at is None or self.interval is None:
+            return True
+        # Fetch a little early rather than a whole coordinator interval late
+        return now - self.fetched_at + coordinator_interval / 2 >= self.interval
+
+    def record_success(self, data: Dict[str, Any], now: float) -> None:
+        """Store freshly fetched data."""
+        self.data = data
+        self.fetched_at = now
+        self.fetches += 1
+        self.last_error = None
+
+    def record_failure(self, error: str) -> None:
+        """Note a failed fetch, keeping the last good value."""
+        self.failures += 1
+        self.last_error = error
+
+    def expire(self, now: float) -> None:
+        """Drop the last good value once it exceeds the freshness budget."""
+        if self.fetched_at is not None and now - self.fetched_at > self.max_age:
+            self.data = {}
+            self.fetched_at = None
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        """Return a summary of the schedule and freshness."""
+        return {
+            "interval": self.interval,
+            "max_age": self.max_age,
+            "age": round(now - self.fetched_at, 1) if self.fetched_at is not None else None,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
 class OpenKarotzCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    """Coordinator for OpenKarotz data updates."""
+    """Coordinator for OpenKarotz data updates.
+
+    The polling interval adapts to the device: it drops to the minimum for a
+    few polls after a command and while the rabbit is speaking or streaming,
+    returns to the base interval when state changes, and backs off
+    exponentially up to the maximum while state is unchanged or the device
+    is asleep or unreachable.
+
+    Each data source has its own schedule: status, LEDs and TTS state follow
+    the polling interval, while the moods catalog and firmware version are
+    refreshed only every hour and day respectively.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api: OpenKarotzAPI,
-        update_interval: int = 30,
+        update_interval: int = DEFAULT_SCAN_INTERVAL,
+        min_interval: int = MIN_SCAN_INTERVAL,
+        max_interval: int = MAX_SCAN_INTERVAL,
+        fleet: Optional[FleetScheduler] = None,
+        device_id: str = UNKNOWN_DEVICE_ID,
     ) -> None:
-        """Initialize coordinator."""
+        """Initialize coordinator.
+
+        Args:
+            hass: Home Assistant instance
+            api: Client of the device to poll
+            update_interval: Base polling interval in seconds
+            min_interval: Polling interval after commands and while active
+            max_interval: Longest polling interval when backing off
+            fleet: Integration-wide scheduler assigning this device a slot
+            device_id: Stable ID of the device, the prefix of entity unique IDs
+        """
         super().__init__(
             hass,
             _LOGGER,
@@ -34,41 +141,72 @@ class OpenKarotzCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             update_interval=timedelta(seconds=update_interval),
         )
         self.api = api
+        self.device_id = device_id
+        self.base_interval = update_interval
+        self.min_interval = min(min_interval, update_interval)
+        self.max_interval = max(max_interval, update_interval)
+        self._interval: float = update_interval
+        self.fleet = fleet
+        if fleet is not None:
+            fleet.register(api.base_url)
+            self._set_interval(update_interval)
+        self._fast_polls_left = 0
+        self.changed_sections: FrozenSet[str] = frozenset()
+        self.suppressed_writes = 0
+        self._last_snapshot: Optional[Tuple[Any, ...]] = None
+        self._remove_command_listener = api.add_command_listener(self._async_on_command)
+        self.event_listener: Optional["OpenKarotzEventListener"] = None
         self._device_info: Optional[Dict[str, Any]] = None
         self._device_state: Optional[Dict[str, Any]] = None
         self._led_state: Optional[Dict[str, Any]] = None
         self._tts_state: Optional[Dict[str, Any]] = None
         self._apps: Optional[Dict[str, Any]] = None
+        self._optimistic_leds: Optional[Dict[str, Any]] = None
+        self._optimistic_confirmed_at: Optional[float] = None
+        # Fast polls must reach the device, so polled sources skip the cache
+        fetchers = {
+            "info": lambda: api.get_info(use_cache=False),
+            "leds": lambda: api.get_leds(use_cache=False),
+            "tts": lambda: api.get_tts(use_cache=False),
+            "moods": api.get_apps,
+            "version": api.get_version,
+        }
+        self.sources: Dict[str, PollSource] = {
+            name: PollSource(name, fetchers[name], interval, max_age)
+            for name, (interval, max_age) in SOURCE_SCHEDULES.items()
+        }
 
     async def _async_update_data(self) -> Dict[str, Any]:
-        """Fetch data from OpenKarotz API."""
+        """Fetch data from OpenKarotz API.
+
+        Only sources that are due are fetched; the others keep their last
+        good value until it exceeds the source's freshness budget.
+        """
         try:
-            info_task = self.api.get_info()
-            leds_task = self.api.get_leds()
-            tts_task = self.api.get_tts()
-            apps_task = self.api.get_apps()
-
-            info, leds, tts, apps = await asyncio.gather(
-                info_task,
-                leds_task,
-                tts_task,
-                apps_task,
+            now = time.monotonic()
+            interval = self.effective_interval
+            due = [source for source in self.sources.values() if source.is_due(now, interval)]
+
+            results = await asyncio.gather(
+                *(source.fetch() for source in due),
                 return_exceptions=True,
             )
 
             errors = {}
-            if isinstance(info, Exception):
-                errors["info"] = str(info)
-                info = {}
-            if isinstance(leds, Exception):
-                errors["leds"] = str(leds)
-                leds = {}
-            if isinstance(tts, Exception):
-                errors["tts"] = str(tts)
-                tts = {}
-            if isinstance(apps, Exception):
-                errors["apps"] = str(apps)
-                apps = {}
+            for source, result in zip(due, results):
+                if isinstance(result, Exception):
+                    errors[source.name] = str(result)
+                    source.record_failure(str(result))
+                else:
+                    source.record_success(result, now)
+            for source in self.sources.values():
+                source.expire(now)
+
+            info = self.sources["info"].data
+            leds = self._reconcile_leds(self.sources["leds"], now)
+            tts = self.sources["tts"].data
+            apps = self.sources["moods"].data
+            version = self.sources["version"].data
 
             self._device_info = info
             self._device_state = info
@@ -78,7 +216,7 @@ class OpenKarotzCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
 
             data = {
                 "id": info.get("id", info.get("wlan_mac", "unknown")),
-                "version": info.get("version", "unknown"),
+                "version": version.get("version", info.get("version", "unknown")),
                 ATTR_LAST_UPDATE: datetime.now().isoformat(),
                 ATTR_ERROR_MESSAGE: str(errors) if errors else None,
                 "info": info,
@@ -86,29 +224,219 @@ class OpenKarotzCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
                 "leds": leds,
                 "tts": tts,
                 "moods": apps,
+                "events": (self.data or {}).get("events", {}),
             }
 
             if errors:
                 _LOGGER.warning(f"OpenKarotz data update had errors: {errors}")
 
+            self.changed_sections = self._diff_sections(self.data, data)
+            self._adapt_interval(info, leds, tts, errors)
+            if self.fleet is not None:
+                self.fleet.record_refresh(time.monotonic() - now, failed=bool(errors))
+
             return data
 
         except Exception as e:
             _LOGGER.error(f"Error updating OpenKarotz data: {e}")
             raise UpdateFailed(f"Error updating OpenKarotz data: {e}") from e
 
+    @staticmethod
+    def _diff_sections(
+        previous: Optional[Dict[str, Any]], data: Dict[str, Any]
+    ) -> FrozenSet[str]:
+        """Return the sections of the data that differ from the previous refresh.
+
+        The refresh timestamp is ignored, as it changes on every update.
+        """
+        if previous is None:
+            return frozenset(data)
+        return frozenset(
+            key
+            for key, value in data.items()
+            if key != ATTR_LAST_UPDATE and (key not in previous or previous[key] != value)
+        )
+
     @property
-    def device_info(self) -> Dict[str, Any]:
-        """Return device information."""
-        if not self._device_info:
-            return {}
-        return {
-            "name": self._device_info.get("name", "OpenKarotz"),
-            "model": self._device_info.get("model", "Unknown"),
-            "manufacturer": "OpenKarotz",
-            "serial_number": self._device_info.get("serial", "Unknown"),
-            "config_entry_id": self.config_entry.entry_id,
-        }
+    def source_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the schedule and freshness of every data source."""
+        now = time.monotonic()
+        return {name: source.as_dict(now) for name, source in self.sources.items()}
+
+    @callback
+    def async_handle_events(self, events: List[Dict[str, Any]]) -> None:
+        """Merge events pushed by the device and notify entities at once.
+
+        The latest event of each type is kept in the ``events`` section and
+        every event is fired on the event bus. Status fields carried by an
+        event are applied immediately, and fast polling confirms the
+        device's full state shortly after.
+        """
+        data = dict(self.data or {})
+        latest = dict(data.get("events") or {})
+        changed = {"events"}
+        for event in events:
+            latest[event.get("type", "unknown")] = event
+            self.hass.bus.async_fire(EVENT_OPENKAROTZ, {"device_id": self.device_id, **event})
+
+            status = event.get("status")
+            if isinstance(status, dict):
+                info = {**data.get("info", {}), **status}
+                data["info"] = data["state"] = info
+                self._device_info = self._device_state = info
+                changed.update(("info", "state"))
+        data["events"] = latest
+
+        self.changed_sections = frozenset(changed)
+        self.api.cache.invalidate_endpoint(API_ENDPOINTS["GET_STATE"])
+        self._async_on_command(API_ENDPOINTS["EVENTS"])
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_apply_optimistic_leds(self, changes: Dict[str, Any]) -> Callable[[], None]:
+        """Show commanded LED state before the device confirms it.
+
+        The commanded values are merged into the LED state and entities are
+        notified at once. The optimistic state is kept until a refresh that
+        started after the command succeeded replaces it with the device's
+        actual state.
+
+        Args:
+            changes: LED attributes sent to the device
+
+        Returns:
+            Function restoring the previous state if the command fails
+        """
+        previous = self._led_state
+        optimistic = {**(previous or {}), **changes}
+        if "brightness" in changes:
+            optimistic["enabled"] = changes["brightness"] > 0
+        self._optimistic_leds = optimistic
+        self._optimistic_confirmed_at = None
+        self._async_publish_leds(optimistic)
+
+        @callback
+        def rollback() -> None:
+            if self._optimistic_leds is optimistic:
+                self._optimistic_leds = None
+                self._async_publish_leds(previous or {})
+
+        return rollback
+
+    @callback
+    def _async_publish_leds(self, leds: Dict[str, Any]) -> None:
+        """Replace the LED section and notify entities without polling."""
+        self._led_state = leds
+        self.data = {**(self.data or {}), "leds": leds}
+        self.changed_sections = frozenset({"leds"})
+        self.async_update_listeners()
+
+    def _reconcile_leds(self, source: PollSource, started: float) -> Dict[str, Any]:
+        """Return the LED state to show after a refresh.
+
+        A refresh that started before the command was confirmed may carry
+        the state from before the command, so optimistic state wins until a
+        later refresh reports what the device actually did. A refresh that
+        did not fetch the LEDs, because they were not due or the fetch
+        failed, only has the older value and keeps the optimistic state too.
+        """
+        if self._optimistic_leds is None:
+            return source.data
+        confirmed_at = self._optimistic_confirmed_at
+        if confirmed_at is None or started < confirmed_at:
+            return self._optimistic_leds
+        if source.fetched_at is None or source.fetched_at < started or source.last_error is not None:
+            return self._optimistic_leds
+        self._optimistic_leds = None
+        return source.data
+
+    @callback
+    def _async_on_command(self, endpoint: str) -> None:
+        """Poll quickly after a command so its effect shows without delay."""
+        if endpoint == API_ENDPOINTS["POST_LEDS"] and self._optimistic_leds is not None:
+            # Already shown optimistically; the next regular poll reconciles
+            self._optimistic_confirmed_at = time.monotonic()
+            return
+
+        self._fast_polls_left = FAST_POLL_COUNT
+        self._set_interval(self.min_interval)
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _adapt_interval(
+        self,
+        info: Dict[str, Any],
+        leds: Dict[str, Any],
+        tts: Dict[str, Any],
+        errors: Dict[str, str],
+    ) -> None:
+        """Choose the next polling interval from the latest refresh."""
+        snapshot = (info, leds, tts)
+        changed = snapshot != self._last_snapshot
+        self._last_snapshot = snapshot
+
+        offline = "info" in errors
+        asleep = str(info.get("sleep", "0")) == "1"
+        active = tts.get("status") == "playing" or info.get("state") == "playing"
+
+        if self._fast_polls_left:
+            self._fast_polls_left -= 1
+            interval = self.min_interval
+        elif active and not offline:
+            interval = self.min_interval
+        elif offline or asleep or not changed:
+            current = max(self.effective_interval, self.base_interval)
+            interval = min(current * SCAN_BACKOFF_FACTOR, self.max_interval)
+        else:
+            interval = self.base_interval
+
+        self._set_interval(interval)
+
+    def _set_interval(self, seconds: float) -> None:
+        """Set the polling interval, aligning regular polls to the fleet slot."""
+        if seconds != self._interval:
+            _LOGGER.debug(
+                "OpenKarotz at %s now polled every %ss", self.api.base_url, seconds
+            )
+            self._interval = seconds
+
+        delay = seconds
+        if self.fleet is not None:
+            delay = self.fleet.align(self.api.base_url, seconds)
+        self.update_interval = timedelta(seconds=delay)
+
+    @property
+    def effective_interval(self) -> float:
+        """Return the current polling interval in seconds.
+
+        The delay until the next poll may differ slightly while polls are
+        being aligned to the device's fleet slot.
+        """
+        return self._interval
+
+    async def async_shutdown(self) -> None:
+        """Stop reacting to commands and give up the fleet slot."""
+        await super().async_shutdown()
+        self._remove_command_listener()
+        if self.fleet is not None:
+            self.fleet.unregister(self.api.base_url)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device registry information of the rabbit.
+
+        The device is identified by its stable ID, so entities created
+        before the first refresh are attached to it too; name, model and
+        serial number are filled in once the rabbit has reported them.
+        """
+        info = self._device_info or {}
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.device_id)},
+            name=info.get("name", "OpenKarotz"),
+            model=info.get("model"),
+            manufacturer="OpenKarotz",
+            serial_number=info.get("serial"),
+        )
 
     @property
     def device_state(self) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,53 @@
+"""Diagnostics support for OpenKarotz."""
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_HOST, CONF_DEVICE_ID}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the API client and coordinator internals of a config entry.
+
+    Error messages recorded by the client may name the device's address, so
+    the host is redacted from every string, not only from the entry data.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    api = coordinator.api
+    internals = {
+        "requests": api.metrics.as_dict(),
+        "coalesced_requests": api.coalesced_requests,
+        "suppressed_writes": coordinator.suppressed_writes,
+        "circuit_state": api.breaker.state,
+        "circuit_trips": api.breaker.trips,
+        "poll_interval": coordinator.effective_interval,
+        "sources": coordinator.source_stats,
+        "fleet": coordinator.fleet.stats if coordinator.fleet else None,
+        "events": coordinator.event_listener.stats if coordinator.event_listener else None,
+        "cache": api.cache.stats,
+        "queue": api.command_queue.stats,
+        "led_commands": api.led_coalescer.stats,
+        "tts": api.tts_queue.stats,
+        "decoder": api.decoder.stats,
+    }
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        **_redact_host(internals, api.host),
+    }
+
+
+def _redact_host(data: Any, host: str) -> Any:
+    """Replace a host name or address in every string of nested data."""
+    if isinstance(data, dict):
+        return {key: _redact_host(value, host) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_redact_host(value, host) for value in data]
+    if isinstance(data, str) and host:
+        return data.replace(host, REDACTED)
+    return data
@@ -0,0 +1,246 @@
+"""Client-side LED transitions and effects for OpenKarotz devices."""
+
+import asyncio
+import colorsys
+import functools
+import logging
+import math
+import string
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.exceptions import ServiceValidationError
+
+from .api import OpenKarotzAPI, OpenKarotzAPIError
+from .const import (
+    API_ENDPOINTS,
+    EFFECT_BLINK,
+    EFFECT_COLOR_CYCLE,
+    EFFECT_FRAME_RATE,
+    EFFECT_PULSE,
+    EFFECT_RATE_SHARE,
+    MIN_FRAME_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# One LED frame: RGB hex value and brightness (0-100)
+Frame = Tuple[str, int]
+
+
+class FrameTable:
+    """Precomputed LED frames sampled at a fixed step."""
+
+    def __init__(self, frames: List[Frame], step: float, loop: bool = False) -> None:
+        """Initialize frame table.
+
+        Args:
+            frames: Frames in playback order
+            step: Seconds of effect time between consecutive frames
+            loop: Whether playback restarts after the last frame
+        """
+        self.frames = frames
+        self.step = step
+        self.loop = loop
+
+    @property
+    def duration(self) -> float:
+        """Return the length of one pass in seconds."""
+        return len(self.frames) * self.step
+
+
+def _to_hex(rgb: Tuple[float, float, float]) -> str:
+    """Return an RGB triple of 0-255 floats as a hex value."""
+    return "".join(f"{max(0, min(255, round(channel))):02X}" for channel in rgb)
+
+
+def is_rgb_value(value: Any) -> bool:
+    """Return whether a value is an RGB hex value such as "FF0000"."""
+    return isinstance(value, str) and len(value) == 6 and all(char in string.hexdigits for char in value)
+
+
+def _from_hex(value: str) -> Tuple[int, int, int]:
+    """Return the channels of an RGB hex value.
+
+    Raises:
+        ServiceValidationError: If the value is not six hex digits
+    """
+    if not is_rgb_value(value):
+        raise ServiceValidationError(f"Invalid RGB value: {value!r}")
+    return tuple(int(value[index:index + 2], 16) for index in (0, 2, 4))
+
+
+def fade_frames(
+    start_rgb: str,
+    start_brightness: int,
+    end_rgb: str,
+    end_brightness: int,
+    duration: float,
+) -> FrameTable:
+    """Build a linear fade ending exactly on the target state.
+
+    Raises:
+        ServiceValidationError: If a color is not an RGB hex value
+    """
+    count = max(1, round(duration * EFFECT_FRAME_RATE))
+    start, end = _from_hex(start_rgb), _from_hex(end_rgb)
+    frames = []
+    for index in range(1, count + 1):
+        position = index / count
+        rgb = tuple(a + (b - a) * position for a, b in zip(start, end))
+        brightness = round(start_brightness + (end_brightness - start_brightness) * position)
+        frames.append((_to_hex(rgb), brightness))
+    return FrameTable(frames, duration / count)
+
+
+@functools.lru_cache(maxsize=32)
+def effect_frames(effect: str, rgb: str, brightness: int) -> FrameTable:
+    """Build the looping frame table of a named effect.
+
+    Args:
+        effect: Effect name
+        rgb: Base color as RGB hex value
+        brightness: Peak brightness (0-100)
+
+    Raises:
+        ValueError: If the effect is unknown
+        ServiceValidationError: If the color is not an RGB hex value
+    """
+    _from_hex(rgb)
+    step = 1 / EFFECT_FRAME_RATE
+    if effect == EFFECT_PULSE:
+        count = 2 * EFFECT_FRAME_RATE
+        frames = [
+            (rgb, round(brightness * (0.55 - 0.45 * math.cos(2 * math.pi * index / count))))
+            for index in range(count)
+        ]
+    elif effect == EFFECT_BLINK:
+        half = EFFECT_FRAME_RATE // 2
+        frames = [(rgb, brightness)] * half + [(rgb, 0)] * half
+    elif effect == EFFECT_COLOR_CYCLE:
+        count = 6 * EFFECT_FRAME_RATE
+        frames = [
+            (_to_hex(tuple(255 * channel for channel in colorsys.hsv_to_rgb(index / count, 1, 1))), brightness)
+            for index in range(count)
+        ]
+    else:
+        raise ValueError(f"Unknown effect: {effect}")
+    return FrameTable(frames, step, loop=True)
+
+
+class EffectPlayer:
+    """Play frame tables against one device.
+
+    Playback follows the wall clock: each frame sent is the one due at that
+    moment, so when the device is slower than the table, frames are dropped
+    instead of queuing up behind each other. The time between frames adapts
+    to the measured 95th percentile latency of the LED endpoint and leaves
+    most of the device's request rate to polls and commands. Intermediate
+    frames are sent at background priority, and not at all when they repeat
+    the frame before; the final frame of a transition is always sent, as a
+    regular LED command.
+    """
+
+    def __init__(self, api: OpenKarotzAPI, min_frame_interval: float = MIN_FRAME_INTERVAL) -> None:
+        """Initialize effect player.
+
+        Args:
+            api: Client of the device to animate
+            min_frame_interval: Shortest time between frames in seconds
+        """
+        self.api = api
+        self.min_frame_interval = min_frame_interval
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_repeated = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_playing(self) -> bool:
+        """Return whether a table is being played."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def frame_interval(self) -> float:
+        """Return the current time budget per frame in seconds."""
+        metrics = self.api.metrics.get(API_ENDPOINTS["POST_LEDS"])
+        p95 = metrics.latency.percentile(0.95) if metrics else None
+        rate = self.api.command_queue.bucket.rate
+        rate_interval = 1 / (rate * EFFECT_RATE_SHARE) if rate > 0 else 0
+        return max(self.min_frame_interval, (p95 or 0) / 1000, rate_interval)
+
+    async def async_play(
+        self,
+        table: FrameTable,
+        on_error: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Stop any running playback and start playing a table.
+
+        Args:
+            table: Frames to play
+            on_error: Called if the device rejects a frame
+        """
+        await self.async_stop()
+        self._task = asyncio.get_running_loop().create_task(self._async_run(table, on_error))
+
+    async def async_stop(self) -> None:
+        """Stop playback, leaving the LED on the last frame sent."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_run(self, table: FrameTable, on_error: Optional[Callable[[], None]]) -> None:
+        """Send frames until the table ends or playback is stopped."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        count = len(table.frames)
+        last = -1
+        sent: Optional[Frame] = None
+        while True:
+            position = int((loop.time() - start) / table.step)
+            if not table.loop and position >= count - 1:
+                position = count - 1
+            if last >= 0:
+                self.frames_dropped += max(0, position - last - 1)
+            last = position
+
+            frame = table.frames[position % count]
+            final = not table.loop and position == count - 1
+            if frame == sent and not final:
+                # The LED already shows this frame; wait for the next one
+                self.frames_repeated += 1
+                await asyncio.sleep(max(0.0, start + (position + 1) * table.step - loop.time()))
+                continue
+
+            rgb, brightness = frame
+            sent_at = loop.time()
+            try:
+                if final:
+                    await self.api.set_led(rgb_value=rgb, brightness=brightness)
+                else:
+                    await self.api.send_led_frame(rgb, brightness)
+            except OpenKarotzAPIError as e:
+                _LOGGER.warning("Stopping LED effect on %s: %s", self.api.base_url, e)
+                if on_error is not None:
+                    on_error()
+                return
+            self.frames_sent += 1
+            sent = frame
+
+            if final:
+                return
+            await asyncio.sleep(max(0.0, self.frame_interval - (loop.time() - sent_at)))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return playback counters."""
+        return {
+            "playing": self.is_playing,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "frames_repeated": self.frames_repeated,
+            "frame_interval_ms": round(self.frame_interval * 1000, 1),
+        }
@@ -0,0 +1,40 @@
+"""Base entity for OpenKarotz devices."""
+
+import logging
+from typing import Optional, Tuple
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import OpenKarotzCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OpenKarotzEntity(CoordinatorEntity[OpenKarotzCoordinator]):
+    """Coordinator entity that only writes state when its data changed.
+
+    Subclasses list the sections of the coordinator data they render in
+    ``_coordinator_sections``. Updates that leave all of those sections and
+    the entity's availability unchanged skip ``async_write_ha_state``, so
+    polling an idle rabbit does not write to the recorder. Entities without
+    sections are written on every update.
+    """
+
+    _coordinator_sections: Tuple[str, ...] = ()
+    _last_written_available: Optional[bool] = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state if a section this entity renders has changed."""
+        available = self.available
+        if (
+            self._coordinator_sections
+            and available == self._last_written_available
+            and self.coordinator.changed_sections.isdisjoint(self._coordinator_sections)
+        ):
+            self.coordinator.suppressed_writes += 1
+            return
+
+        self._last_written_available = available
+        super()._handle_coordinator_update()
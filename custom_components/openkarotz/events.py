@@ -0,0 +1,170 @@
+"""Push event channel for OpenKarotz devices."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import OpenKarotzAPI, OpenKarotzAPIError, OpenKarotzNotSupportedError
+from .const import (
+    DEFAULT_EVENT_MAX_RECONNECT_DELAY,
+    DEFAULT_EVENT_MIN_INTERVAL,
+    DEFAULT_EVENT_RECONNECT_DELAY,
+    DEFAULT_EVENT_WAIT,
+)
+from .coordinator import OpenKarotzCoordinator
+from .resilience import RetryPolicy
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OpenKarotzEventListener:
+    """Long-poll a device for events and hand them to its coordinator.
+
+    Button presses, ear movements and RFID reads reach Home Assistant as soon
+    as the device reports them instead of on the next poll. When the channel
+    drops, the listener reconnects with jittered exponential backoff and
+    resumes from the last event it saw. Long polls bypass the command queue,
+    so a device answering before the requested wait is polled no more often
+    than the minimum interval. Firmware without the event endpoint, or that
+    reports no event cursor, is detected once, after which the integration
+    relies on polling alone.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: OpenKarotzAPI,
+        coordinator: OpenKarotzCoordinator,
+        wait: float = DEFAULT_EVENT_WAIT,
+        reconnect_policy: Optional[RetryPolicy] = None,
+        min_interval: float = DEFAULT_EVENT_MIN_INTERVAL,
+    ) -> None:
+        """Initialize event listener.
+
+        Args:
+            hass: Home Assistant instance
+            api: Client of the device to listen to
+            coordinator: Coordinator receiving the events
+            wait: Seconds the device may hold each long poll open
+            reconnect_policy: Backoff between reconnect attempts
+            min_interval: Shortest time between the starts of two long polls
+        """
+        self.hass = hass
+        self.api = api
+        self.coordinator = coordinator
+        self.wait = wait
+        self.min_interval = min_interval
+        self.reconnect_policy = reconnect_policy or RetryPolicy(
+            base_delay=DEFAULT_EVENT_RECONNECT_DELAY,
+            max_delay=DEFAULT_EVENT_MAX_RECONNECT_DELAY,
+        )
+        self.connected = False
+        self.supported: Optional[bool] = None
+        self.events_received = 0
+        self.reconnects = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening in the background."""
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._async_listen(), f"OpenKarotz events {self.api.base_url}"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop listening."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def _async_listen(self) -> None:
+        """Long-poll for events until stopped or found unsupported."""
+        cursor: Optional[int] = None
+        failures = 0
+        while True:
+            started = time.monotonic()
+            try:
+                result = await self.api.get_events(cursor, self.wait)
+                events = result.get("events") or []
+                next_cursor = result.get("cursor", cursor)
+            except OpenKarotzNotSupportedError:
+                _LOGGER.info(
+                    "OpenKarotz at %s does not push events, relying on polling",
+                    self.api.base_url,
+                )
+                self.supported = False
+                self.connected = False
+                return
+            except OpenKarotzAPIError as e:
+                if self.connected:
+                    _LOGGER.warning(
+                        "Lost event channel to OpenKarotz at %s: %s", self.api.base_url, e
+                    )
+                await self._async_wait_to_reconnect(failures)
+                failures += 1
+                continue
+            except Exception:
+                # A malformed response must not end the channel for good
+                _LOGGER.exception("Unexpected event response from OpenKarotz at %s", self.api.base_url)
+                await self._async_wait_to_reconnect(failures)
+                failures += 1
+                continue
+
+            if cursor is None and next_cursor is None:
+                # Events could never be told apart from ones already seen
+                _LOGGER.info(
+                    "OpenKarotz at %s reports no event cursor, relying on polling",
+                    self.api.base_url,
+                )
+                self.supported = False
+                self.connected = False
+                return
+
+            if not self.connected:
+                _LOGGER.debug("Event channel to OpenKarotz at %s connected", self.api.base_url)
+            self.connected = True
+            self.supported = True
+            failures = 0
+
+            # The first poll only establishes the cursor; earlier events
+            # happened before Home Assistant was listening
+            if cursor is not None and events:
+                self.events_received += len(events)
+                try:
+                    self.coordinator.async_handle_events(events)
+                except Exception:
+                    # The cursor still moves on, so a bad event is not redelivered
+                    _LOGGER.exception("Error handling events from OpenKarotz at %s", self.api.base_url)
+            cursor = next_cursor
+
+            # Empty or early answers must not turn the long poll into a busy loop
+            delay = self.min_interval - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _async_wait_to_reconnect(self, failures: int) -> None:
+        """Mark the channel down and back off before reconnecting."""
+        self.connected = False
+        delay = self.reconnect_policy.backoff(failures)
+        self.reconnects += 1
+        _LOGGER.debug("Reconnecting event channel in %.1fs", delay)
+        await asyncio.sleep(delay)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the state of the event channel."""
+        return {
+            "connected": self.connected,
+            "supported": self.supported,
+            "events_received": self.events_received,
+            "reconnects": self.reconnects,
+        }
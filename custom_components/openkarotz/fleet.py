@@ -0,0 +1,156 @@
+"""Integration-wide polling scheduler for fleets of OpenKarotz devices."""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_FLEET,
+    DEFAULT_FLEET_MAX_CONCURRENCY,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FleetScheduler:
+    """Stagger device polls across the interval and bound global concurrency.
+
+    Every device gets a phase slot, spread evenly over the base polling
+    interval, so that after a restart the fleet does not poll in lockstep.
+    Coordinators align their regular polls to their slot, and every request
+    to any device holds the shared limiter while it is on the wire.
+    Refresh durations are grouped per interval-long cycle for reporting.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_SCAN_INTERVAL,
+        max_concurrency: int = DEFAULT_FLEET_MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize fleet scheduler.
+
+        Args:
+            interval: Base polling interval in seconds the slots divide
+            max_concurrency: Most requests in flight across all devices
+        """
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.limiter = asyncio.Semaphore(max_concurrency)
+        self._members: List[str] = []
+        self._cycle: Optional[int] = None
+        self._cycle_durations: List[float] = []
+        self._cycle_failures = 0
+        self.cycles = 0
+        self.last_cycle: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        """Return the number of registered devices."""
+        return len(self._members)
+
+    def register(self, key: str) -> None:
+        """Add a device and rebalance the slots."""
+        if key not in self._members:
+            self._members.append(key)
+
+    def unregister(self, key: str) -> None:
+        """Remove a device and rebalance the slots."""
+        if key in self._members:
+            self._members.remove(key)
+
+    def phase(self, key: str) -> float:
+        """Return the offset of a device's slot within the interval, in seconds."""
+        if key not in self._members:
+            return 0.0
+        return self._members.index(key) * self.interval / len(self._members)
+
+    def align(self, key: str, delay: float, now: Optional[float] = None) -> float:
+        """Move a polling delay onto the device's slot.
+
+        Delays shorter than the interval, such as fast polls after commands,
+        are returned unchanged. Longer ones move to the slot nearest to the
+        requested time, so backed-off devices stay spread out.
+
+        Args:
+            key: Device key passed to ``register``
+            delay: Requested seconds until the next poll
+            now: Current monotonic time
+
+        Returns:
+            Seconds until the next poll
+        """
+        if key not in self._members or delay < self.interval:
+            return delay
+
+        now = time.monotonic() if now is None else now
+        phase = self.phase(key)
+        slots = round((now + delay - phase) / self.interval)
+        aligned = slots * self.interval + phase - now
+        if aligned < self.interval / 2:
+            aligned += self.interval
+        return aligned
+
+    def record_refresh(self, duration: float, failed: bool = False, now: Optional[float] = None) -> None:
+        """Record one device refresh in the current cycle.
+
+        Args:
+            duration: Seconds the refresh took
+            failed: Whether any source failed to refresh
+            now: Current monotonic time
+        """
+        now = time.monotonic() if now is None else now
+        cycle = math.floor(now / self.interval)
+        if cycle != self._cycle:
+            self._close_cycle()
+            self._cycle = cycle
+
+        self._cycle_durations.append(duration * 1000)
+        if failed:
+            self._cycle_failures += 1
+
+    def _close_cycle(self) -> None:
+        """Summarize the refreshes of the cycle that just ended."""
+        durations = sorted(self._cycle_durations)
+        if durations:
+            self.cycles += 1
+            self.last_cycle = {
+                "refreshes": len(durations),
+                "failures": self._cycle_failures,
+                "p50_ms": round(durations[int(0.50 * (len(durations) - 1))], 1),
+                "p95_ms": round(durations[int(0.95 * (len(durations) - 1))], 1),
+                "max_ms": round(durations[-1], 1),
+            }
+        self._cycle_durations = []
+        self._cycle_failures = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return fleet size, concurrency and the last cycle's latency."""
+        return {
+            "devices": len(self._members),
+            "max_concurrency": self.max_concurrency,
+            "cycles": self.cycles,
+            "last_cycle": self.last_cycle,
+        }
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> FleetScheduler:
+    """Return the integration-wide fleet scheduler, creating it if needed."""
+    fleet: Optional[FleetScheduler] = hass.data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DATA_FLEET] = FleetScheduler()
+        _LOGGER.debug("Created OpenKarotz fleet scheduler")
+    return fleet
+
+
+@callback
+def async_release_fleet(hass: HomeAssistant) -> None:
+    """Drop the fleet scheduler once no config entry is using it."""
+    if not hass.data.get(DOMAIN):
+        hass.data.pop(DATA_FLEET, None)
@@ -0,0 +1,83 @@
+"""Stable device identity for OpenKarotz config entries."""
+
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .api import OpenKarotzAPI
+from .const import DOMAIN, UNKNOWN_DEVICE_ID
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device info keys identifying a rabbit, in order of preference
+DEVICE_ID_KEYS = ("id", "wlan_mac", "serial")
+
+
+def device_id_from_info(info: Dict[str, Any]) -> Optional[str]:
+    """Return the ID a rabbit reports: its ID, Wi-Fi MAC or serial number.
+
+    Args:
+        info: Device information response
+
+    Returns:
+        Device ID, or None if the rabbit reports none
+    """
+    for key in DEVICE_ID_KEYS:
+        value = info.get(key)
+        if value:
+            return str(value)
+    return None
+
+
+async def async_resolve_device_id(hass: HomeAssistant, entry: ConfigEntry, api: OpenKarotzAPI) -> str:
+    """Return the device ID of an entry, resolving and storing it once.
+
+    The ID is read from the rabbit when the entry is first set up and
+    stored in the entry's data, so entity unique IDs never depend on
+    whether a refresh has completed. A rabbit reporting no ID is
+    identified by its entry. Entities registered with the unknown ID before
+    the ID was stored are moved over to it.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry of the rabbit
+        api: Connected client of the rabbit
+
+    Returns:
+        Device ID
+
+    Raises:
+        OpenKarotzAPIError: If the ID is not stored yet and the rabbit
+            cannot be asked for it
+    """
+    device_id = entry.data.get(CONF_DEVICE_ID)
+    if device_id:
+        return device_id
+
+    device_id = device_id_from_info(await api.get_info()) or entry.entry_id
+    hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_DEVICE_ID: device_id})
+    await _async_migrate_unknown_unique_ids(hass, entry, device_id)
+    _LOGGER.debug("Resolved device ID %s for %s", device_id, api.base_url)
+    return device_id
+
+
+async def _async_migrate_unknown_unique_ids(hass: HomeAssistant, entry: ConfigEntry, device_id: str) -> None:
+    """Move entities registered before the device ID was known over to it."""
+    registry = er.async_get(hass)
+    prefix = f"{UNKNOWN_DEVICE_ID}_"
+
+    @callback
+    def migrate(entity_entry: er.RegistryEntry) -> Optional[Dict[str, Any]]:
+        if not entity_entry.unique_id.startswith(prefix):
+            return None
+        unique_id = f"{device_id}_{entity_entry.unique_id[len(prefix):]}"
+        if registry.async_get_entity_id(entity_entry.domain, DOMAIN, unique_id):
+            # The entity was also registered under the real ID; keep that one
+            return None
+        return {"new_unique_id": unique_id}
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate)
@@ -1,15 +1,21 @@
 """OpenKarotz lights."""
 
 import logging
+from typing import Any, Callable, Dict, Optional
 
-from homeassistant.components.light import LightEntity, LightEntityDescription
+from homeassistant.components.light import (
+    LightEntity,
+    LightEntityDescription,
+    LightEntityFeature,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import OpenKarotzCoordinator
-from .const import DOMAIN, LIGHT_ATTRIBUTES
+from .const import DOMAIN, LIGHT_ATTRIBUTES, LIGHT_EFFECTS
+from .effects import EffectPlayer, effect_frames, fade_frames, is_rgb_value
+from .entity import OpenKarotzEntity
 
 
 # Predefined colors for Karotz LED
@@ -25,6 +31,60 @@ PREDEFINED_COLORS = {
 }
 _LOGGER = logging.getLogger(__name__)
 
+_RGB_MODES = frozenset({"rgb"})
+_TEMPERATURE_MODES = frozenset({"color_temperature"})
+_RGB_AND_TEMPERATURE_MODES = frozenset({"rgb", "color_temperature"})
+
+
+class LightState:
+    """LED state as a light shows it, derived once per LED state.
+
+    Home Assistant reads a light's properties many times for each state
+    write. Deriving them once when the coordinator publishes new LED state
+    leaves each read a single attribute lookup. Instances are immutable, so
+    they and the shared sets of supported modes are handed out uncopied.
+    """
+
+    __slots__ = ("is_on", "color_mode", "supported_color_modes", "color", "brightness", "color_temperature")
+
+    def __init__(self, leds: Optional[Dict[str, Any]]) -> None:
+        """Initialize light state.
+
+        Args:
+            leds: LED section of the coordinator data, if any
+        """
+        leds = leds or {}
+        has_color = bool(leds.get("color") or leds.get("rgb_value"))
+        color_temperature = leds.get("color_temperature")
+
+        if color_temperature is not None:
+            color_mode = "color_temperature"
+            modes = _RGB_AND_TEMPERATURE_MODES if has_color or leds.get("preset") else _TEMPERATURE_MODES
+        else:
+            color_mode = "rgb" if has_color else None
+            # rgb is also the default while no state is available yet
+            modes = _RGB_MODES
+
+        color = None
+        rgb_value = leds.get("rgb_value")
+        if rgb_value:
+            try:
+                color = (int(rgb_value[0:2], 16), int(rgb_value[2:4], 16), int(rgb_value[4:6], 16))
+            except (ValueError, IndexError):
+                pass
+
+        set_slot = object.__setattr__
+        set_slot(self, "is_on", leds.get("enabled", False))
+        set_slot(self, "color_mode", color_mode)
+        set_slot(self, "supported_color_modes", modes)
+        set_slot(self, "color", color)
+        set_slot(self, "brightness", leds.get("brightness", 0))
+        set_slot(self, "color_temperature", color_temperature)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse changes; a new LED state gets a new instance."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -47,9 +107,13 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class OpenKarotzLight(CoordinatorEntity[OpenKarotzCoordinator], LightEntity):
+class OpenKarotzLight(OpenKarotzEntity, LightEntity):
     """Light entity for OpenKarotz LEDs."""
 
+    _coordinator_sections = ("leds",)
+    _attr_supported_features = LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
+    _attr_effect_list = LIGHT_EFFECTS
+
     entity_description = LightEntityDescription(
         key="led",
         name="LED Light",
@@ -61,66 +125,57 @@ class OpenKarotzLight(CoordinatorEntity[OpenKarotzCoordinator], LightEntity):
         self.led_data = led_data
         self._led_id = led_data.get("id", 1)
         self._led_name = led_data.get("name", f"LED {self._led_id}")
-        
-        device_id = coordinator.data.get('info', {}).get('id', 'unknown') if coordinator.data else 'unknown'
-        self._attr_unique_id = f"{device_id}_led_{self._led_id}"
+        self._attr_unique_id = f"{coordinator.device_id}_led_{self._led_id}"
         self._attr_name = self._led_name
         self._attr_device_info = coordinator.device_info
+        self._attr_effect = None
+        self._player = EffectPlayer(coordinator.api)
+        self._light_state_source: Optional[Dict[str, Any]] = None
+        self._light_state = LightState(None)
+
+    @property
+    def light_state(self) -> LightState:
+        """Return the state derived from the coordinator's current LED state.
+
+        The coordinator replaces the LED state on every change rather than
+        updating it in place, so it is derived again only when it is a
+        different object.
+        """
+        leds = self.coordinator.leds_state
+        if leds is not self._light_state_source:
+            self._light_state = LightState(leds)
+            self._light_state_source = leds
+        return self._light_state
 
     @property
     def is_on(self) -> bool:
         """Check if light is on."""
-        led_state = self.coordinator.leds_state or {} if self.coordinator and self.coordinator.leds_state else {}
-        return led_state.get("enabled", False) if led_state else False
+        return self.light_state.is_on
 
     @property
     def color_mode(self) -> str | None:
         """Return color mode."""
-        led_state = self.coordinator.leds_state or {}
-        if led_state.get("color_temperature") is not None:
-            return "color_temperature"
-        if led_state.get("color") or led_state.get("rgb_value"):
-            return "rgb"
-        return None
+        return self.light_state.color_mode
 
     @property
-    def supported_color_modes(self) -> set[str]:
+    def supported_color_modes(self) -> frozenset[str]:
         """Return supported color modes."""
-        led_state = self.coordinator.leds_state or {} if self.coordinator else {}
-        modes = set()
-        if led_state.get("color") or led_state.get("rgb_value"):
-            modes.add("rgb")
-        if led_state.get("color_temperature") is not None:
-            modes.add("color_temperature")
-        if led_state.get("preset"):
-            modes.add("rgb")
-        if not modes:
-            # Default to rgb if no state available yet
-            modes.add("rgb")
-        return modes
+        return self.light_state.supported_color_modes
 
     @property
     def color(self) -> tuple[int, int, int] | None:
         """Return current color."""
-        led_state = self.coordinator.leds_state or {}
-        if led_state.get("rgb_value"):
-            try:
-                return tuple(int(led_state["rgb_value"][i:i+2], 16) for i in (0, 2, 4))
-            except (ValueError, IndexError):
-                pass
-        return None
+        return self.light_state.color
 
     @property
     def brightness(self) -> int:
         """Return brightness level."""
-        led_state = self.coordinator.leds_state or {}
-        return led_state.get("brightness", 0)
+        return self.light_state.brightness
 
     @property
     def color_temperature(self) -> int | None:
         """Return color temperature in Kelvin."""
-        led_state = self.coordinator.leds_state or {}
-        return led_state.get("color_temperature")
+        return self.light_state.color_temperature
 
     async def async_turn_on(
         self,
@@ -129,7 +184,20 @@ class OpenKarotzLight(CoordinatorEntity[OpenKarotzCoordinator], LightEntity):
     ) -> None:
         """Turn on the light."""
         led_state = self.coordinator.leds_state or {}
-        led_id = self.led_data.get("id", 1)
+        effect = kwargs.pop("effect", None)
+        transition = kwargs.pop("transition", None)
+
+        # Any new command ends a running effect or transition
+        await self._player.async_stop()
+        self._attr_effect = None
+
+        if effect in LIGHT_EFFECTS:
+            brightness = kwargs.get("brightness", led_state.get("brightness") or 100)
+            table = effect_frames(effect, self._current_rgb(), brightness)
+            self._attr_effect = effect
+            rollback = self.coordinator.async_apply_optimistic_leds({"brightness": brightness})
+            await self._player.async_play(table, on_error=self._effect_failed_callback(rollback))
+            return
 
         data = {}
         if "brightness" in kwargs:
@@ -147,15 +215,70 @@ class OpenKarotzLight(CoordinatorEntity[OpenKarotzCoordinator], LightEntity):
         if "color_temperature" in kwargs:
             data["color_temperature"] = kwargs["color_temperature"]
 
-        if data:
-            await self.coordinator.api.set_led(**data)
-        else:
+        if not data:
             # Just turn on without changing color
-            await self.coordinator.api.set_led(brightness=100)
+            data = {"brightness": 100}
+
+        if transition and ("brightness" in data or "rgb_value" in data):
+            await self._async_transition(transition, **data)
+        else:
+            await self._async_set_led(**data)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off the light."""
-        await self.coordinator.api.set_led(brightness=0)
+        await self._player.async_stop()
+        self._attr_effect = None
+
+        transition = kwargs.get("transition")
+        if transition:
+            await self._async_transition(transition, brightness=0)
+        else:
+            await self._async_set_led(brightness=0)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop any running effect."""
+        await self._player.async_stop()
+        await super().async_will_remove_from_hass()
+
+    async def _async_transition(self, duration: float, **data) -> None:
+        """Fade from the current state to the target, showing the target at once."""
+        led_state = self.coordinator.leds_state or {}
+        current_rgb = self._current_rgb()
+        current_brightness = led_state.get("brightness", 0) if led_state.get("enabled", True) else 0
+        table = fade_frames(
+            current_rgb,
+            current_brightness,
+            data.get("rgb_value", current_rgb),
+            data.get("brightness", current_brightness),
+            duration,
+        )
+        rollback = self.coordinator.async_apply_optimistic_leds(data)
+        await self._player.async_play(table, on_error=self._effect_failed_callback(rollback))
+
+    def _current_rgb(self) -> str:
+        """Return the color effects start from, white if the device reports none."""
+        rgb_value = (self.coordinator.leds_state or {}).get("rgb_value")
+        return rgb_value if is_rgb_value(rgb_value) else "FFFFFF"
+
+    def _effect_failed_callback(self, rollback: Callable[[], None]) -> Callable[[], None]:
+        """Return the handler of an effect or transition the device rejected."""
+
+        @callback
+        def effect_failed() -> None:
+            self._attr_effect = None
+            rollback()
+            self.async_write_ha_state()
+
+        return effect_failed
+
+    async def _async_set_led(self, **data) -> None:
+        """Send an LED command, showing its result before the device confirms it."""
+        rollback = self.coordinator.async_apply_optimistic_leds(data)
+        try:
+            await self.coordinator.api.set_led(**data)
+        except Exception:
+            rollback()
+            raise
 
     async def async_select_color(self, color_name: str) -> None:
         """Select a predefined color for the LED."""
@@ -173,4 +296,5 @@ class OpenKarotzLight(CoordinatorEntity[OpenKarotzCoordinator], LightEntity):
             "preset": led_state.get("preset"),
             "color": led_state.get("color"),
             "rgb_value": led_state.get("rgb_value"),
+            "effect_player": self._player.stats,
         }
\ No newline at end of file
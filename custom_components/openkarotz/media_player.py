@@ -1,14 +1,125 @@
-"""OpenKarotz media player.""" 
+"""OpenKarotz media player."""
 
-from homeassistant.config_entries import ConfigEntry 
-from homeassistant.core import HomeAssistant 
-from homeassistant.helpers.entity_platform import AddEntitiesCallback 
+import logging
+from typing import Any, Optional
 
+from homeassistant.components import media_source
+from homeassistant.components.media_player import (
+    BrowseMedia,
+    MediaPlayerEntity,
+    MediaPlayerEntityFeature,
+    MediaPlayerState,
+    MediaType,
+    async_process_play_media_url,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-async def async_setup_entry( 
-    hass: HomeAssistant, 
-    entry: ConfigEntry, 
-    async_add_entities: AddEntitiesCallback, 
-) -> None: 
-    """Set up OpenKarotz media players.""" 
-    async_add_entities([])
\ No newline at end of file
+from .coordinator import OpenKarotzCoordinator
+from .const import DOMAIN
+from .entity import OpenKarotzEntity
+from .relay import MediaRelay, async_get_relay
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up OpenKarotz media players."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    relay = await async_get_relay(hass)
+    async_add_entities([OpenKarotzMediaPlayer(coordinator, relay)])
+
+
+class OpenKarotzMediaPlayer(OpenKarotzEntity, MediaPlayerEntity):
+    """Media player playing audio streams on the rabbit."""
+
+    _coordinator_sections = ("state",)
+    _attr_has_entity_name = True
+    _attr_name = "Speaker"
+    _attr_media_content_type = MediaType.MUSIC
+    _attr_supported_features = (
+        MediaPlayerEntityFeature.PLAY_MEDIA
+        | MediaPlayerEntityFeature.PLAY
+        | MediaPlayerEntityFeature.PAUSE
+        | MediaPlayerEntityFeature.STOP
+        | MediaPlayerEntityFeature.BROWSE_MEDIA
+    )
+
+    def __init__(self, coordinator: OpenKarotzCoordinator, relay: Optional[MediaRelay] = None) -> None:
+        """Initialize media player."""
+        super().__init__(coordinator)
+        self._relay = relay
+        self._paused = False
+        self._attr_unique_id = f"{coordinator.device_id}_media_player"
+        self._attr_device_info = coordinator.device_info
+        self._attr_media_content_id = None
+
+    @property
+    def state(self) -> MediaPlayerState:
+        """Return playback state."""
+        device_state = self.coordinator.device_state or {}
+        if str(device_state.get("sleep", "0")) == "1":
+            return MediaPlayerState.OFF
+        if device_state.get("state") == "playing":
+            return MediaPlayerState.PLAYING
+        if self._paused:
+            return MediaPlayerState.PAUSED
+        return MediaPlayerState.IDLE
+
+    async def async_play_media(self, media_type: str, media_id: str, **kwargs: Any) -> None:
+        """Play a URL or media source item, through the relay if possible."""
+        # Resume replays what was asked for, not a signed URL that expires
+        content_id = media_id
+        identity = None
+        if media_source.is_media_source_id(media_id):
+            # Resolved URLs are signed afresh on every play; cache by the ID
+            identity = media_id
+            play_item = await media_source.async_resolve_media(self.hass, media_id, self.entity_id)
+            media_id = play_item.url
+        media_id = async_process_play_media_url(self.hass, media_id)
+
+        url = self._relay.url_for(media_id, identity) if self._relay is not None else media_id
+        await self.coordinator.api.play_stream(url)
+        self._attr_media_content_id = content_id
+        self._paused = False
+        self.async_write_ha_state()
+
+    async def async_media_play(self) -> None:
+        """Resume by replaying the last media."""
+        if self._attr_media_content_id is None:
+            return
+        await self.async_play_media(MediaType.MUSIC, self._attr_media_content_id)
+
+    async def async_media_pause(self) -> None:
+        """Pause playback."""
+        await self.coordinator.api.pause()
+        self._paused = True
+        self.async_write_ha_state()
+
+    async def async_media_stop(self) -> None:
+        """Stop playback."""
+        await self.coordinator.api.pause()
+        self._paused = False
+        self.async_write_ha_state()
+
+    async def async_browse_media(
+        self,
+        media_content_type: Optional[str] = None,
+        media_content_id: Optional[str] = None,
+    ) -> BrowseMedia:
+        """Browse the audio available from media sources."""
+        return await media_source.async_browse_media(
+            self.hass,
+            media_content_id,
+            content_filter=lambda item: item.media_content_type.startswith("audio/"),
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return relay and cache counters."""
+        return {"relay": self._relay.stats if self._relay is not None else None}
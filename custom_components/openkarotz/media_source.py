@@ -0,0 +1,170 @@
+"""Media source browsing the snapshots archived by OpenKarotz cameras."""
+
+import math
+from typing import Optional, Tuple
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.media_player import MediaClass
+from homeassistant.components.media_source import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SNAPSHOT_ARCHIVE_URL
+from .snapshot_store import SnapshotArchive
+
+
+async def async_get_media_source(hass: HomeAssistant) -> MediaSource:
+    """Set up the snapshot media source and the view serving its frames."""
+    hass.http.register_view(OpenKarotzSnapshotView(hass))
+    return OpenKarotzSnapshotSource(hass)
+
+
+def _get_archive(hass: HomeAssistant, entry_id: str) -> Optional[SnapshotArchive]:
+    """Return the snapshot archive of a loaded config entry."""
+    return hass.data.get(DOMAIN, {}).get(entry_id, {}).get("snapshot_archive")
+
+
+def _parse_identifier(identifier: str) -> Tuple[str, Optional[float]]:
+    """Split a media identifier into its entry ID and frame timestamp.
+
+    Raises:
+        ValueError: If the timestamp is not a finite number
+    """
+    entry_id, _, timestamp = identifier.partition("/")
+    return entry_id, _parse_timestamp(timestamp) if timestamp else None
+
+
+def _parse_timestamp(timestamp: str) -> float:
+    """Return a frame timestamp, refusing infinities and NaN.
+
+    Raises:
+        ValueError: If the timestamp is not a finite number
+    """
+    value = float(timestamp)
+    if not math.isfinite(value):
+        raise ValueError(f"Timestamp is not finite: {timestamp}")
+    return value
+
+
+class OpenKarotzSnapshotSource(MediaSource):
+    """Archived snapshots, one folder per camera and one frame per interval.
+
+    Identifiers are the config entry ID of a camera, followed by the
+    capture time of a frame when they refer to one.
+    """
+
+    name = "OpenKarotz snapshots"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize snapshot media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Return the URL an archived frame is served from."""
+        try:
+            entry_id, timestamp = _parse_identifier(item.identifier or "")
+        except ValueError as e:
+            raise Unresolvable(f"Invalid snapshot: {item.identifier}") from e
+        archive = _get_archive(self.hass, entry_id)
+        if archive is None or timestamp is None:
+            raise Unresolvable(f"Unknown snapshot: {item.identifier}")
+
+        frame = await archive.async_describe(timestamp)
+        if frame is None:
+            raise Unresolvable(f"Snapshot is no longer archived: {item.identifier}")
+        _, content_type = frame
+        return PlayMedia(SNAPSHOT_ARCHIVE_URL.format(entry_id=entry_id, timestamp=f"{timestamp:.3f}"), content_type)
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Return the cameras, or the archived frames of one, newest first."""
+        if not item.identifier:
+            return self._browse_cameras()
+
+        try:
+            entry_id, timestamp = _parse_identifier(item.identifier)
+        except ValueError as e:
+            raise Unresolvable(f"Invalid snapshot: {item.identifier}") from e
+        archive = _get_archive(self.hass, entry_id)
+        if archive is None or timestamp is not None:
+            raise Unresolvable(f"Unknown camera: {item.identifier}")
+
+        folder = self._camera_folder(entry_id)
+        folder.children = [
+            BrowseMediaSource(
+                domain=DOMAIN,
+                identifier=f"{entry_id}/{captured_at:.3f}",
+                media_class=MediaClass.IMAGE,
+                media_content_type=content_type,
+                title=dt_util.as_local(dt_util.utc_from_timestamp(captured_at)).strftime("%Y-%m-%d %H:%M"),
+                can_play=True,
+                can_expand=False,
+            )
+            for captured_at, content_type in reversed(await archive.async_captures())
+        ]
+        return folder
+
+    def _browse_cameras(self) -> BrowseMediaSource:
+        """Return the folders of the cameras with an archive."""
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=None,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=self.name,
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.DIRECTORY,
+            children=[
+                self._camera_folder(entry_id)
+                for entry_id, data in self.hass.data.get(DOMAIN, {}).items()
+                if data.get("snapshot_archive") is not None
+            ],
+        )
+
+    def _camera_folder(self, entry_id: str) -> BrowseMediaSource:
+        """Return the folder of one camera's archive."""
+        entry = self.hass.config_entries.async_get_entry(entry_id)
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=entry_id,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=entry.title if entry is not None else entry_id,
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.IMAGE,
+        )
+
+
+class OpenKarotzSnapshotView(HomeAssistantView):
+    """Serve archived snapshots to authenticated clients."""
+
+    url = SNAPSHOT_ARCHIVE_URL
+    name = f"api:{DOMAIN}:snapshot"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize snapshot view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, entry_id: str, timestamp: str) -> web.Response:
+        """Serve the archived frame of the interval containing a timestamp."""
+        archive = _get_archive(self.hass, entry_id)
+        if archive is None:
+            raise web.HTTPNotFound()
+        try:
+            frame = await archive.async_lookup(_parse_timestamp(timestamp))
+        except ValueError as e:
+            raise web.HTTPNotFound() from e
+        if frame is None:
+            raise web.HTTPNotFound()
+
+        image, content_type, _ = frame
+        return web.Response(body=image, content_type=content_type)
@@ -0,0 +1,120 @@
+"""Request metrics for the OpenKarotz API client."""
+
+import bisect
+from typing import Any, Dict, Optional, Sequence
+
+from .const import LATENCY_BUCKETS_MS
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with interpolated percentiles.
+
+    Memory use is constant regardless of the number of samples, which keeps
+    per-device overhead flat for long-running installations.
+    """
+
+    def __init__(self, bounds_ms: Sequence[float] = LATENCY_BUCKETS_MS) -> None:
+        """Initialize histogram with ascending bucket upper bounds in ms."""
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        """Add a sample."""
+        self.counts[bisect.bisect_left(self.bounds_ms, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimate a percentile, e.g. 0.95, in milliseconds."""
+        if not self.count:
+            return None
+
+        rank = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or cumulative + bucket_count < rank:
+                cumulative += bucket_count
+                continue
+            lower = self.bounds_ms[index - 1] if index else 0.0
+            upper = self.bounds_ms[index] if index < len(self.bounds_ms) else self.max_ms
+            upper = min(upper, self.max_ms)
+            position = (rank - cumulative) / bucket_count
+            return round(lower + (upper - lower) * position, 1)
+        return round(self.max_ms, 1)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean latency in milliseconds."""
+        return round(self.total_ms / self.count, 1) if self.count else None
+
+
+class EndpointMetrics:
+    """Request, error and latency counters for one endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize endpoint metrics."""
+        self.requests = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a summary of the metrics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 3) if self.requests else 0.0,
+            "last_error": self.last_error,
+            "mean_ms": self.latency.mean,
+            "p50_ms": self.latency.percentile(0.50),
+            "p95_ms": self.latency.percentile(0.95),
+            "p99_ms": self.latency.percentile(0.99),
+            "max_ms": round(self.latency.max_ms, 1),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint request metrics for one device."""
+
+    def __init__(self) -> None:
+        """Initialize request metrics."""
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+
+    def record(self, endpoint: str, latency: float, error: Optional[str] = None) -> None:
+        """Record one request to an endpoint.
+
+        Args:
+            endpoint: Endpoint path
+            latency: Time the exchange took in seconds
+            error: Error description if the request failed
+        """
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        metrics.requests += 1
+        metrics.latency.record(latency * 1000)
+        if error is not None:
+            metrics.errors += 1
+            metrics.last_error = error
+
+    def get(self, endpoint: str) -> Optional[EndpointMetrics]:
+        """Return the metrics of an endpoint, if any requests were made."""
+        return self.endpoints.get(endpoint)
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests across all endpoints."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def total_errors(self) -> int:
+        """Return the number of failed requests across all endpoints."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return a summary for every endpoint."""
+        return {endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()}
@@ -0,0 +1,442 @@
+"""Local caching audio relay for OpenKarotz media playback."""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import mimetypes
+import os
+import secrets
+from collections import OrderedDict
+from typing import IO, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.auth import SIGN_QUERY_PARAM
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+
+from .const import (
+    DATA_RELAY,
+    DEFAULT_MEDIA_CACHE_MAX_CLIP,
+    DEFAULT_MEDIA_CACHE_SIZE,
+    DEFAULT_RELAY_CHUNK_SIZE,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    MEDIA_CACHE_DIR,
+    RELAY_MAX_SOURCES,
+    RELAY_URL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CLIP_SUFFIX = ".clip"
+PART_SUFFIX = ".part"
+DEFAULT_CONTENT_TYPE = "audio/mpeg"
+
+
+class MediaCache:
+    """On-disk LRU cache of relayed clips.
+
+    Clips are stored by the hash of their source's identity and evicted least
+    recently played first once the cache exceeds its size budget. Clips
+    larger than the per-clip limit, such as radio streams, are never kept.
+    Recency survives restarts through file modification times.
+
+    The index is only read and changed on the event loop, by ``load``,
+    ``lookup``, ``add`` and ``stats``. The other methods only touch the disk
+    and must run in the executor; evicted clips are handed back to the
+    caller to be removed there.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MEDIA_CACHE_SIZE,
+        max_clip_bytes: int = DEFAULT_MEDIA_CACHE_MAX_CLIP,
+    ) -> None:
+        """Initialize media cache.
+
+        Args:
+            directory: Directory holding the cached clips
+            max_bytes: Total size budget of the cache
+            max_clip_bytes: Largest clip that is cached
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_clip_bytes = min(max_clip_bytes, max_bytes)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key: str) -> str:
+        """Return the file a clip is stored in."""
+        return os.path.join(self.directory, key + CLIP_SUFFIX)
+
+    def scan(self) -> List[Tuple[str, int]]:
+        """Return the keys and sizes of the clips on disk, oldest first."""
+        os.makedirs(self.directory, exist_ok=True)
+        clips: List[Tuple[float, str, int]] = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(PART_SUFFIX):
+                    # Left behind by a relay interrupted by a restart
+                    os.remove(entry.path)
+                elif entry.name.endswith(CLIP_SUFFIX):
+                    stat = entry.stat()
+                    clips.append((stat.st_mtime, entry.name[: -len(CLIP_SUFFIX)], stat.st_size))
+        return [(key, size) for _, key, size in sorted(clips)]
+
+    def load(self, clips: List[Tuple[str, int]]) -> List[str]:
+        """Index the clips found on disk.
+
+        Returns:
+            Keys of the clips evicted to fit the budget
+        """
+        self._index.clear()
+        self.total_bytes = 0
+        for key, size in clips:
+            self._index[key] = size
+            self.total_bytes += size
+        return self._evict()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the path of a cached clip, marking it recently played."""
+        if key not in self._index:
+            self.misses += 1
+            return None
+        self._index.move_to_end(key)
+        self.hits += 1
+        return self.path(key)
+
+    def add(self, key: str, size: int) -> List[str]:
+        """Index a clip moved into the cache.
+
+        Returns:
+            Keys of the clips evicted to fit the budget
+        """
+        self.total_bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+        return self._evict()
+
+    def touch(self, key: str) -> None:
+        """Persist that a clip was played, for recency after a restart."""
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def open_writer(self, key: str) -> IO[bytes]:
+        """Open a temporary file receiving a clip while it is relayed."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{key}.{secrets.token_hex(4)}{PART_SUFFIX}"
+        return open(os.path.join(self.directory, name), "wb")
+
+    def finish(self, key: str, handle: IO[bytes]) -> int:
+        """Move a fully received clip into the cache and return its size."""
+        size = handle.tell()
+        handle.close()
+        os.replace(handle.name, self.path(key))
+        return size
+
+    @staticmethod
+    def discard(handle: IO[bytes]) -> None:
+        """Drop a clip that was not received completely or is too large."""
+        handle.close()
+        try:
+            os.remove(handle.name)
+        except FileNotFoundError:
+            pass
+
+    def remove(self, keys: List[str]) -> None:
+        """Delete the files of evicted clips."""
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> List[str]:
+        """Drop least recently played clips from the index until within budget."""
+        evicted = []
+        while self.total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit counters."""
+        return {
+            "clips": len(self._index),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class MediaRelay:
+    """Serve media to rabbits from Home Assistant, caching recent clips.
+
+    The rabbit is handed a relay URL instead of the source URL. The first
+    time a clip is played, the relay fetches it from the source and passes
+    it on chunk by chunk, reading the next chunk only once the previous one
+    has been written to the rabbit, so a slow rabbit throttles the download
+    instead of filling memory. The clip is written to the on-disk cache on
+    the way through, and later plays are served from disk without
+    contacting the source. A clip requested again while it is still being
+    fetched is downloaded only once: later requests wait until it is in
+    the cache, or until it turns out not to fit and cannot be shared.
+
+    Clips are identified by a stable identity rather than by the URL they
+    are fetched from: the media source ID they were resolved from, or else
+    the URL without Home Assistant's signature, which changes every time a
+    URL is signed. The clip is always fetched from the latest signed URL.
+    Relay URLs carry a keyed hash of the identity, so they cannot be
+    guessed, but the same clip always maps to the same URL.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cache: MediaCache,
+        session: Optional[aiohttp.ClientSession] = None,
+        chunk_size: int = DEFAULT_RELAY_CHUNK_SIZE,
+    ) -> None:
+        """Initialize media relay.
+
+        Args:
+            hass: Home Assistant instance
+            cache: On-disk clip cache
+            session: Client session fetching from media sources
+            chunk_size: Bytes read from the source and written at a time
+        """
+        self.hass = hass
+        self.cache = cache
+        self.session = session
+        self.chunk_size = chunk_size
+        self._secret = secrets.token_bytes(32)
+        self._sources: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._downloads: Dict[str, asyncio.Event] = {}
+        self.relayed = 0
+        self.relayed_bytes = 0
+        self.served_from_cache = 0
+        self.joined_downloads = 0
+
+    def token_for(self, source: str, identity: Optional[str] = None) -> str:
+        """Return the relay token of a clip and remember where to fetch it.
+
+        Args:
+            source: URL the clip is fetched from
+            identity: Stable identity of the clip; defaults to the source
+                URL without its signature
+        """
+        identity = identity or _unsigned(source)
+        token = hmac.new(self._secret, identity.encode(), hashlib.sha256).hexdigest()[:32]
+        self._sources[token] = (source, identity)
+        self._sources.move_to_end(token)
+        while len(self._sources) > RELAY_MAX_SOURCES:
+            self._sources.popitem(last=False)
+        return token
+
+    def url_for(self, source: str, identity: Optional[str] = None) -> str:
+        """Return the URL a rabbit plays a clip from.
+
+        The source URL itself is returned when Home Assistant has no URL
+        reachable from the local network.
+
+        Args:
+            source: URL the clip is fetched from
+            identity: Stable identity of the clip, such as its media source ID
+        """
+        try:
+            base_url = get_url(self.hass, allow_external=False)
+        except NoURLAvailableError:
+            _LOGGER.debug("No internal URL, rabbit fetches %s directly", source)
+            return source
+        return base_url + RELAY_URL.format(token=self.token_for(source, identity))
+
+    async def async_serve(self, request: web.Request, token: str) -> web.StreamResponse:
+        """Serve a clip from the cache, or relay it from its source."""
+        entry = self._sources.get(token)
+        if entry is None:
+            raise web.HTTPNotFound()
+
+        source, identity = entry
+        key = hashlib.sha256(identity.encode()).hexdigest()
+        download = self._downloads.get(key)
+        if download is not None:
+            # Another rabbit is already fetching the clip into the cache
+            self.joined_downloads += 1
+            await download.wait()
+        path = self.cache.lookup(key)
+        if path is not None:
+            self.served_from_cache += 1
+            self.hass.async_add_executor_job(self.cache.touch, key)
+            return web.FileResponse(
+                path,
+                chunk_size=self.chunk_size,
+                headers={"Content-Type": _content_type(source)},
+            )
+        return await self._async_relay(request, source, key)
+
+    async def _async_relay(self, request: web.Request, source: str, key: str) -> web.StreamResponse:
+        """Pass a clip from its source to the rabbit, caching it on the way.
+
+        Only the first of concurrent relays of a clip writes it to the
+        cache. It wakes the requests waiting for it once the clip is cached,
+        or as soon as the clip turns out not to fit, and those then pass the
+        clip through without caching it.
+        """
+        download: Optional[asyncio.Event] = None
+        if key not in self._downloads:
+            download = self._downloads[key] = asyncio.Event()
+        try:
+            return await self._async_stream(request, source, key, download)
+        finally:
+            if download is not None:
+                del self._downloads[key]
+                download.set()
+
+    async def _async_stream(
+        self,
+        request: web.Request,
+        source: str,
+        key: str,
+        download: Optional[asyncio.Event],
+    ) -> web.StreamResponse:
+        """Fetch a clip and write it to the rabbit, and to the cache if a download is owned."""
+        session = self.session or async_get_clientsession(self.hass)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=DEFAULT_TIMEOUT, sock_read=DEFAULT_TIMEOUT)
+        try:
+            upstream = await session.get(source, timeout=timeout)
+            upstream.raise_for_status()
+        except (aiohttp.ClientError, TimeoutError) as e:
+            _LOGGER.warning("Could not fetch %s for relay: %s", source, e)
+            raise web.HTTPBadGateway() from e
+
+        async with upstream:
+            response = web.StreamResponse(
+                headers={"Content-Type": upstream.headers.get("Content-Type", _content_type(source))}
+            )
+            if upstream.content_length is not None:
+                response.content_length = upstream.content_length
+            await response.prepare(request)
+
+            writer: Optional[IO[bytes]] = None
+            if download is not None and (
+                upstream.content_length is None or upstream.content_length <= self.cache.max_clip_bytes
+            ):
+                writer = await self.hass.async_add_executor_job(self.cache.open_writer, key)
+            elif download is not None:
+                # Will not be cached; waiting requests can relay it themselves
+                download.set()
+
+            self.relayed += 1
+            received = 0
+            complete = False
+            try:
+                async for chunk in upstream.content.iter_chunked(self.chunk_size):
+                    # Waits until the rabbit has taken the previous chunks
+                    await response.write(chunk)
+                    received += len(chunk)
+                    self.relayed_bytes += len(chunk)
+                    if writer is not None:
+                        if received > self.cache.max_clip_bytes:
+                            await self.hass.async_add_executor_job(self.cache.discard, writer)
+                            writer = None
+                            download.set()
+                        else:
+                            await self.hass.async_add_executor_job(writer.write, chunk)
+                complete = True
+            finally:
+                if writer is not None:
+                    if complete:
+                        await self._async_commit(key, writer)
+                    else:
+                        await self.hass.async_add_executor_job(self.cache.discard, writer)
+
+        await response.write_eof()
+        return response
+
+    async def _async_commit(self, key: str, writer: IO[bytes]) -> None:
+        """Move a received clip into the cache and delete the clips it evicts."""
+        size = await self.hass.async_add_executor_job(self.cache.finish, key, writer)
+        evicted = self.cache.add(key, size)
+        if evicted:
+            await self.hass.async_add_executor_job(self.cache.remove, evicted)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return relay and cache counters."""
+        return {
+            "relayed": self.relayed,
+            "relayed_bytes": self.relayed_bytes,
+            "served_from_cache": self.served_from_cache,
+            "joined_downloads": self.joined_downloads,
+            "cache": self.cache.stats,
+        }
+
+
+class OpenKarotzMediaRelayView(HomeAssistantView):
+    """Relay endpoint the rabbits fetch media from."""
+
+    url = RELAY_URL
+    name = f"api:{DOMAIN}:relay"
+    # The rabbit cannot authenticate; relay tokens are unguessable instead
+    requires_auth = False
+
+    def __init__(self, relay: MediaRelay) -> None:
+        """Initialize relay view."""
+        self.relay = relay
+
+    async def get(self, request: web.Request, token: str) -> web.StreamResponse:
+        """Serve a relayed clip."""
+        return await self.relay.async_serve(request, token)
+
+
+def _unsigned(source: str) -> str:
+    """Return a URL without the signature Home Assistant adds to it."""
+    parts = urlsplit(source)
+    if SIGN_QUERY_PARAM not in parts.query:
+        return source
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name != SIGN_QUERY_PARAM
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _content_type(source: str) -> str:
+    """Guess the media type of a source URL."""
+    content_type, _ = mimetypes.guess_type(source.split("?", 1)[0])
+    return content_type or DEFAULT_CONTENT_TYPE
+
+
+async def async_get_relay(hass: HomeAssistant) -> MediaRelay:
+    """Return the integration-wide media relay, creating it if needed.
+
+    The relay and its view live as long as Home Assistant, as views cannot
+    be unregistered.
+    """
+    relay: Optional[MediaRelay] = hass.data.get(DATA_RELAY)
+    if relay is None:
+        cache = MediaCache(hass.config.path(MEDIA_CACHE_DIR))
+        relay = hass.data[DATA_RELAY] = MediaRelay(hass, cache)
+        hass.http.register_view(OpenKarotzMediaRelayView(relay))
+        clips = await hass.async_add_executor_job(cache.scan)
+        evicted = cache.load(clips)
+        if evicted:
+            await hass.async_add_executor_job(cache.remove, evicted)
+        _LOGGER.debug("Started OpenKarotz media relay with %d cached clips", cache.stats["clips"])
+    return relay
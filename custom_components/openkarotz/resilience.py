@@ -0,0 +1,131 @@
+"""Retry and circuit breaker policies for OpenKarotz requests."""
+
+import logging
+import random
+import time
+from typing import FrozenSet
+
+from .const import (
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_RECONNECT_ATTEMPTS,
+    DEFAULT_RECONNECT_DELAY,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_RETRY_MAX_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class RetryPolicy:
+    """Decide which requests are retried and how long to wait between tries."""
+
+    def __init__(
+        self,
+        attempts: int = DEFAULT_RECONNECT_ATTEMPTS,
+        base_delay: float = DEFAULT_RETRY_BACKOFF,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        methods: FrozenSet[str] = frozenset({"GET"}),
+    ) -> None:
+        """Initialize retry policy.
+
+        Args:
+            attempts: Total number of tries per request, including the first
+            base_delay: Backoff ceiling for the first retry in seconds
+            max_delay: Upper bound for any single backoff in seconds
+            methods: HTTP methods that are safe to repeat
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.methods = methods
+
+    def should_retry(self, method: str, attempt: int) -> bool:
+        """Return True if a failed try number ``attempt`` may be repeated."""
+        return method.upper() in self.methods and attempt + 1 < self.attempts
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered delay before the retry following ``attempt``.
+
+        Uses "full jitter": a uniform delay between zero and an exponentially
+        growing ceiling, so devices that failed together do not retry together.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Per-device circuit breaker.
+
+    After ``failure_threshold`` consecutive failed requests the breaker
+    opens and requests fail immediately instead of waiting for a timeout.
+    While open, the owner probes the device every ``recovery_timeout``
+    seconds; a successful probe closes the breaker again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECONNECT_DELAY,
+    ) -> None:
+        """Initialize circuit breaker."""
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state."""
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests should fail fast."""
+        return self._state != BREAKER_CLOSED
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Return the number of consecutive failures recorded."""
+        return self._failures
+
+    @property
+    def open_for(self) -> float:
+        """Return how long the breaker has been open in seconds."""
+        if self._state == BREAKER_CLOSED:
+            return 0.0
+        return time.monotonic() - self._opened_at
+
+    def record_success(self) -> None:
+        """Record a successful exchange with the device."""
+        if self._state != BREAKER_CLOSED:
+            _LOGGER.info("Circuit closed after %.1fs, device is reachable again", self.open_for)
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> bool:
+        """Record a request that failed after all of its attempts.
+
+        Returns:
+            True if this failure opened the breaker
+        """
+        self._failures += 1
+        if self._state == BREAKER_HALF_OPEN:
+            self._state = BREAKER_OPEN
+            return False
+        if self._state == BREAKER_CLOSED and self._failures >= self.failure_threshold:
+            self._state = BREAKER_OPEN
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            return True
+        return False
+
+    def begin_probe(self) -> None:
+        """Mark that a recovery probe is in flight."""
+        if self._state == BREAKER_OPEN:
+            self._state = BREAKER_HALF_OPEN
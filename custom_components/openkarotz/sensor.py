@@ -2,18 +2,29 @@
 
 import logging
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import OpenKarotzAPI
 from .coordinator import OpenKarotzCoordinator
-from .const import SENSOR_TYPES, ATTR_ERROR_MESSAGE, DOMAIN
+from .entity import OpenKarotzEntity
+from .const import SENSOR_TYPES, ATTR_ERROR_MESSAGE, DIAGNOSTIC_ENDPOINTS, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+LATENCY_SENSOR_NAMES = {
+    "status": "Status Latency",
+    "leds": "LED Latency",
+    "tts": "TTS Latency",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -30,18 +41,26 @@ async def async_setup_entry(
     entities.append(OpenKarotzMemoryUsageSensor(coordinator))
     entities.append(OpenKarotzUptimeSensor(coordinator))
 
+    # Diagnostic sensors
+    for key, endpoint in DIAGNOSTIC_ENDPOINTS.items():
+        entities.append(OpenKarotzLatencySensor(coordinator, key, endpoint))
+    entities.append(OpenKarotzRequestErrorsSensor(coordinator))
+    entities.append(OpenKarotzTtsQueueSensor(coordinator))
+
     async_add_entities(entities)
 
 
-class OpenKarotzSensor(CoordinatorEntity[OpenKarotzCoordinator]):
+class OpenKarotzSensor(OpenKarotzEntity):
     """Base sensor for OpenKarotz devices."""
 
     _attr_has_entity_name = True
     _attr_device_info = None
+    _unique_id_suffix: str
 
     def __init__(self, coordinator: OpenKarotzCoordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.device_id}_{self._unique_id_suffix}"
         self._attr_device_info = coordinator.device_info
 
 
@@ -49,11 +68,8 @@ class OpenKarotzInfoSensor(OpenKarotzSensor):
     """Device information sensor."""
 
     _attr_name = "Device Name"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self.coordinator.data.get('info', {}).get('id', 'unknown') if self.coordinator.data else 'unknown'}_info"
+    _unique_id_suffix = "info"
+    _coordinator_sections = ("info",)
 
     @property
     def native_value(self):
@@ -65,11 +81,8 @@ class OpenKarotzStateSensor(OpenKarotzSensor):
     """Device state sensor."""
 
     _attr_name = "Device State"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self.coordinator.data.get('info', {}).get('id', 'unknown') if self.coordinator.data else 'unknown'}_state"
+    _unique_id_suffix = "state"
+    _coordinator_sections = ("state",)
 
     @property
     def native_value(self):
@@ -81,11 +94,8 @@ class OpenKarotzMemoryUsageSensor(OpenKarotzSensor):
     """Memory usage sensor."""
 
     _attr_name = "Memory Usage"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self.coordinator.data.get('info', {}).get('id', 'unknown') if self.coordinator.data else 'unknown'}_memory_usage"
+    _unique_id_suffix = "memory_usage"
+    _coordinator_sections = ("state",)
 
     @property
     def native_value(self):
@@ -116,11 +126,8 @@ class OpenKarotzUptimeSensor(OpenKarotzSensor):
     """Device uptime sensor."""
 
     _attr_name = "Device Uptime"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self.coordinator.data.get('info', {}).get('id', 'unknown') if self.coordinator.data else 'unknown'}_uptime"
+    _unique_id_suffix = "uptime"
+    _coordinator_sections = ("info",)
 
     @property
     def native_value(self):
@@ -133,4 +140,92 @@ class OpenKarotzUptimeSensor(OpenKarotzSensor):
     @property
     def unit_of_measurement(self):
         """Return unit of measurement."""
-        return "seconds"
\ No newline at end of file
+        return "seconds"
+
+
+class OpenKarotzLatencySensor(OpenKarotzSensor):
+    """95th percentile request latency of one device endpoint."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    # The summary moves with every request; only the p95 state is recorded
+    _unrecorded_attributes = frozenset(
+        {"requests", "errors", "error_rate", "last_error", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+    )
+
+    def __init__(self, coordinator: OpenKarotzCoordinator, key: str, endpoint: str) -> None:
+        """Initialize latency sensor."""
+        self._unique_id_suffix = f"{key}_latency"
+        super().__init__(coordinator)
+        self._key = key
+        self._endpoint = endpoint
+        self._attr_name = LATENCY_SENSOR_NAMES.get(key, f"{key} Latency")
+
+    @property
+    def native_value(self):
+        """Return the 95th percentile latency in milliseconds."""
+        metrics = self.coordinator.api.metrics.get(self._endpoint)
+        return metrics.latency.percentile(0.95) if metrics else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the full latency and error summary."""
+        metrics = self.coordinator.api.metrics.get(self._endpoint)
+        if metrics is None:
+            return {"endpoint": self._endpoint}
+        return {"endpoint": self._endpoint, **metrics.as_dict()}
+
+
+class OpenKarotzRequestErrorsSensor(OpenKarotzSensor):
+    """Number of failed requests to the device."""
+
+    _attr_name = "Request Errors"
+    _unique_id_suffix = "request_errors"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        """Return the number of failed requests."""
+        return self.coordinator.api.metrics.total_errors
+
+    @property
+    def extra_state_attributes(self):
+        """Return failed requests per endpoint and the circuit breaker state.
+
+        Only values that change when requests fail are shown, so the
+        recorder does not store a row per poll; the client's internals are
+        in the config entry diagnostics.
+        """
+        api = self.coordinator.api
+        return {
+            "errors": {
+                endpoint: metrics.errors
+                for endpoint, metrics in api.metrics.endpoints.items()
+                if metrics.errors
+            },
+            "circuit_state": api.breaker.state,
+            "circuit_trips": api.breaker.trips,
+        }
+
+
+class OpenKarotzTtsQueueSensor(OpenKarotzSensor):
+    """Number of utterances waiting to be spoken."""
+
+    _attr_name = "TTS Queue"
+    _unique_id_suffix = "tts_queue"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Return the number of queued utterances."""
+        return self.coordinator.api.tts_queue.depth
+
+    @property
+    def extra_state_attributes(self):
+        """Return speech counters and latency."""
+        return self.coordinator.api.tts_queue.stats
@@ -1,11 +1,23 @@
 """OpenKarotz services."""
 
+import asyncio
 import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN, SERVICE_NAMES, SERVICE_DATA_SCHEMAS
+from .api import OpenKarotzAPI
+from .const import (
+    DEFAULT_BULK_CONCURRENCY,
+    DEFAULT_BULK_TIMEOUT,
+    DOMAIN,
+    SERVICE_NAMES,
+    SERVICE_DATA_SCHEMAS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -79,6 +91,7 @@ async def handle_play_tts(hass: HomeAssistant, service_data: dict) -> bool:
             text=service_data.get("text"),
             voice=service_data.get("voice"),
             category=service_data.get("category"),
+            stream=service_data.get("stream"),
         )
         return True
     except Exception as e:
@@ -86,6 +99,141 @@ async def handle_play_tts(hass: HomeAssistant, service_data: dict) -> bool:
         return False
 
 
+def _resolve_entry_ids(hass: HomeAssistant, service_data: dict) -> Tuple[List[str], List[str]]:
+    """Return the loaded config entries a bulk call targets, and unknown ones.
+
+    Devices and areas are resolved through the device registry; devices of
+    other integrations are ignored.
+    """
+    loaded = hass.data.get(DOMAIN, {})
+    requested = list(service_data.get("config_entry_ids") or [])
+    missing = [entry_id for entry_id in requested if entry_id not in loaded]
+
+    device_ids = list(service_data.get("device_ids") or [])
+    area_ids = service_data.get("area_ids") or []
+    if device_ids or area_ids:
+        registry = dr.async_get(hass)
+        for area_id in area_ids:
+            device_ids.extend(device.id for device in dr.async_entries_for_area(registry, area_id))
+        for device_id in device_ids:
+            device = registry.async_get(device_id)
+            if device is not None:
+                requested.extend(device.config_entries)
+
+    targets = [entry_id for entry_id in dict.fromkeys(requested) if entry_id in loaded]
+    return targets, missing
+
+
+async def _async_fan_out(
+    hass: HomeAssistant,
+    service_data: dict,
+    command: Callable[[OpenKarotzAPI], Awaitable[Any]],
+) -> Dict[str, Any]:
+    """Run a command on every targeted device with bounded parallelism.
+
+    Devices that do not answer within the timeout are reported as timed
+    out rather than failed: commands wait in the device's LED or TTS queue
+    and are still sent after the caller stops waiting.
+
+    Args:
+        hass: Home Assistant instance
+        service_data: Bulk service call data
+        command: Coroutine function sending the command to one device
+
+    Returns:
+        Outcome, latency and error of every targeted config entry
+    """
+    entry_ids, missing = _resolve_entry_ids(hass, service_data)
+    timeout = service_data.get("timeout", DEFAULT_BULK_TIMEOUT)
+    semaphore = asyncio.Semaphore(DEFAULT_BULK_CONCURRENCY)
+
+    async def run(entry_id: str) -> Tuple[str, Dict[str, Any]]:
+        api = hass.data[DOMAIN][entry_id].get("api")
+        async with semaphore:
+            start = time.monotonic()
+            timed_out = False
+            try:
+                async with asyncio.timeout(timeout):
+                    await command(api)
+            except TimeoutError:
+                timed_out = True
+                error = f"No answer within {timeout}s, the command is still queued"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                error = None
+            latency = round((time.monotonic() - start) * 1000, 1)
+
+        if timed_out:
+            _LOGGER.info(f"OpenKarotz entry {entry_id} timed out: {error}")
+        elif error is not None:
+            _LOGGER.warning(f"OpenKarotz entry {entry_id} failed: {error}")
+        return entry_id, {
+            "success": error is None,
+            "timed_out": timed_out,
+            "latency_ms": latency,
+            "error": error,
+        }
+
+    results = dict(await asyncio.gather(*(run(entry_id) for entry_id in entry_ids)))
+    for entry_id in missing:
+        results[entry_id] = {"success": False, "timed_out": False, "latency_ms": None, "error": "Entry not found"}
+
+    succeeded = sum(1 for result in results.values() if result["success"])
+    timed_out = sum(1 for result in results.values() if result["timed_out"])
+    return {
+        "succeeded": succeeded,
+        "timed_out": timed_out,
+        "failed": len(results) - succeeded - timed_out,
+        "results": results,
+    }
+
+
+async def handle_set_led_bulk(hass: HomeAssistant, service_data: dict) -> Dict[str, Any]:
+    """Handle bulk set LED service.
+
+    Args:
+        hass: Home Assistant instance
+        service_data: Service call data
+
+    Returns:
+        Per-device success and latency
+    """
+
+    async def set_led(api: OpenKarotzAPI) -> None:
+        await api.set_led(
+            color=service_data.get("color"),
+            brightness=service_data.get("brightness"),
+            color_temperature=service_data.get("color_temperature"),
+            preset=service_data.get("preset"),
+            rgb_value=service_data.get("rgb_value"),
+        )
+
+    return await _async_fan_out(hass, service_data, set_led)
+
+
+async def handle_play_tts_bulk(hass: HomeAssistant, service_data: dict) -> Dict[str, Any]:
+    """Handle bulk play TTS service.
+
+    Args:
+        hass: Home Assistant instance
+        service_data: Service call data
+
+    Returns:
+        Per-device success and latency
+    """
+
+    async def play_tts(api: OpenKarotzAPI) -> None:
+        await api.play_tts(
+            text=service_data.get("text"),
+            voice=service_data.get("voice"),
+            category=service_data.get("category"),
+            stream=service_data.get("stream"),
+        )
+
+    return await _async_fan_out(hass, service_data, play_tts)
+
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up OpenKarotz services."""
 
@@ -101,6 +249,14 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not success:
             _LOGGER.error("play_tts service failed")
 
+    async def handle_set_led_bulk_wrapper(service: ServiceCall) -> ServiceResponse:
+        """Handle bulk set LED service wrapper."""
+        return await handle_set_led_bulk(hass, service.data)
+
+    async def handle_play_tts_bulk_wrapper(service: ServiceCall) -> ServiceResponse:
+        """Handle bulk play TTS service wrapper."""
+        return await handle_play_tts_bulk(hass, service.data)
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_NAMES["SET_LED"],
@@ -115,4 +271,20 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=vol.Schema(SERVICE_DATA_SCHEMAS["play_tts"]),
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NAMES["SET_LED_BULK"],
+        handle_set_led_bulk_wrapper,
+        schema=vol.Schema(SERVICE_DATA_SCHEMAS["set_led_bulk"]),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NAMES["PLAY_TTS_BULK"],
+        handle_play_tts_bulk_wrapper,
+        schema=vol.Schema(SERVICE_DATA_SCHEMAS["play_tts_bulk"]),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     _LOGGER.info("OpenKarotz services registered")
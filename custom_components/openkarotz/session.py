@@ -0,0 +1,108 @@
+"""Shared HTTP connection pool for OpenKarotz devices."""
+
+import logging
+from typing import Callable, Optional
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    DATA_EVENT_SESSION,
+    DATA_SESSION,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_POOL_LIMIT,
+    DEFAULT_POOL_LIMIT_PER_HOST,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def create_connector() -> aiohttp.TCPConnector:
+    """Create a connector tuned for the Karotz embedded web server.
+
+    The Karotz serves its CGI scripts from a tiny single-threaded server, so
+    each host gets at most a couple of sockets. Idle sockets are kept warm for
+    longer than the default polling interval so consecutive refreshes reuse
+    them, and are evicted by the connector once the keep-alive expires.
+    """
+    return aiohttp.TCPConnector(
+        limit=DEFAULT_POOL_LIMIT,
+        limit_per_host=DEFAULT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+    )
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a standalone pooled client session."""
+    return aiohttp.ClientSession(
+        connector=create_connector(),
+        timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+    )
+
+
+def create_event_session() -> aiohttp.ClientSession:
+    """Create a client session for event long polls.
+
+    Each device holds one long poll open for most of the time, so a fleet
+    sharing the regular pool would tie up most of its sockets. Long polls
+    get their own connector instead, with one socket per device and no
+    limit on the total. Each poll sets its own timeout.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=1,
+            keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+        ),
+    )
+
+
+@callback
+def _async_get_pooled_session(
+    hass: HomeAssistant, key: str, factory: Callable[[], aiohttp.ClientSession]
+) -> aiohttp.ClientSession:
+    """Return an integration-wide client session, creating it if needed."""
+    session: Optional[aiohttp.ClientSession] = hass.data.get(key)
+    if session is not None and not session.closed:
+        return session
+
+    session = factory()
+    hass.data[key] = session
+
+    async def _async_close_session(event: Event) -> None:
+        """Close the shared session when Home Assistant stops."""
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    _LOGGER.debug("Created shared OpenKarotz connection pool %s", key)
+    return session
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the integration-wide client session, creating it if needed."""
+    return _async_get_pooled_session(hass, DATA_SESSION, create_session)
+
+
+@callback
+def async_get_event_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the integration-wide session for event long polls."""
+    return _async_get_pooled_session(hass, DATA_EVENT_SESSION, create_event_session)
+
+
+async def async_release_session(hass: HomeAssistant) -> None:
+    """Close the shared sessions once no config entry is using them."""
+    if hass.data.get(DOMAIN):
+        return
+
+    for key in (DATA_SESSION, DATA_EVENT_SESSION):
+        session: Optional[aiohttp.ClientSession] = hass.data.pop(key, None)
+        if session is not None and not session.closed:
+            await session.close()
+            _LOGGER.debug("Closed shared OpenKarotz connection pool %s", key)
@@ -0,0 +1,133 @@
+"""Snapshot capture and latest-frame cache for OpenKarotz cameras."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .const import DEFAULT_SNAPSHOT_MAX_AGE
+
+_LOGGER = logging.getLogger(__name__)
+
+ImageBytes = Union[bytes, bytearray]
+
+
+class Frame:
+    """One captured image."""
+
+    __slots__ = ("image", "content_type", "captured_at")
+
+    def __init__(self, image: ImageBytes, content_type: str, captured_at: float) -> None:
+        """Initialize frame.
+
+        Args:
+            image: Encoded image bytes
+            content_type: Media type of the image
+            captured_at: Monotonic time the capture completed
+        """
+        self.image = image
+        self.content_type = content_type
+        self.captured_at = captured_at
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Return the age of the frame in seconds."""
+        return (time.monotonic() if now is None else now) - self.captured_at
+
+
+class SnapshotFetcher:
+    """Capture snapshots on demand, sharing frames between viewers.
+
+    The latest frame is kept in memory and handed to every viewer while it
+    is younger than the max age, so a dashboard open on many screens
+    triggers one capture per max age rather than one per screen. Viewers
+    asking for a frame while a capture is in flight wait for that capture
+    instead of starting another. The image is held in the single buffer it
+    was read into; viewers all receive that same object.
+    """
+
+    def __init__(
+        self,
+        capture: Callable[[], Awaitable[Tuple[ImageBytes, str]]],
+        max_age: float = DEFAULT_SNAPSHOT_MAX_AGE,
+    ) -> None:
+        """Initialize snapshot fetcher.
+
+        Args:
+            capture: Coroutine function capturing one image and returning
+                its bytes and content type
+            max_age: Seconds a frame is served before a new one is captured
+        """
+        self._capture = capture
+        self.max_age = max_age
+        self.latest: Optional[Frame] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[Frame], None]] = []
+        self.captures = 0
+        self.failures = 0
+        self.served_from_cache = 0
+        self.coalesced = 0
+
+    def add_listener(self, listener: Callable[[Frame], None]) -> Callable[[], None]:
+        """Call a listener with every newly captured frame.
+
+        Returns:
+            Function removing the listener
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    async def async_get(self, max_age: Optional[float] = None) -> Frame:
+        """Return a frame no older than the max age, capturing one if needed.
+
+        Args:
+            max_age: Overrides the fetcher's max age for this call; 0
+                always waits for a fresh capture
+
+        Raises:
+            OpenKarotzAPIError: If the capture fails
+        """
+        max_age = self.max_age if max_age is None else max_age
+        latest = self.latest
+        if latest is not None and max_age > 0 and latest.age() <= max_age:
+            self.served_from_cache += 1
+            return latest
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._async_capture())
+        else:
+            self.coalesced += 1
+
+        # Shield the shared capture so one viewer's cancellation does not
+        # cancel it for the others
+        return await asyncio.shield(self._task)
+
+    async def _async_capture(self) -> Frame:
+        """Capture a frame and make it the latest."""
+        try:
+            image, content_type = await self._capture()
+        except Exception:
+            self.failures += 1
+            raise
+
+        frame = Frame(image, content_type, time.monotonic())
+        self.latest = frame
+        self.captures += 1
+        for listener in list(self._listeners):
+            try:
+                listener(frame)
+            except Exception:
+                _LOGGER.exception("Error in OpenKarotz snapshot listener")
+        return frame
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return capture counters and the age of the latest frame."""
+        latest = self.latest
+        return {
+            "captures": self.captures,
+            "failures": self.failures,
+            "served_from_cache": self.served_from_cache,
+            "coalesced": self.coalesced,
+            "latest_age": round(latest.age(), 1) if latest is not None else None,
+            "latest_bytes": len(latest.image) if latest is not None else None,
+        }
@@ -0,0 +1,358 @@
+"""Disk-backed ring of archived snapshots for OpenKarotz cameras."""
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from homeassistant.core import HomeAssistant
+
+from .api import OpenKarotzAPIError
+from .const import (
+    DEFAULT_SNAPSHOT_ARCHIVE_INTERVAL,
+    DEFAULT_SNAPSHOT_ARCHIVE_SLOTS,
+    DEFAULT_SNAPSHOT_CLEAR_BATCH,
+)
+from .snapshot import Frame
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "index"
+_MAGIC = b"OKSR"
+_VERSION = 1
+# Magic, version, slot count, seconds per slot
+_HEADER = struct.Struct("<4sHId")
+# Time bucket (-1 when empty), capture time, image size, content type
+_RECORD = struct.Struct("<qdI16s")
+_EMPTY = -1
+
+
+class SnapshotStore:
+    """Fixed-size ring of snapshots on disk, indexed by capture time.
+
+    Time is divided into slots of ``interval`` seconds and the ring holds
+    the last ``slots`` of them. A frame lands in the slot its capture time
+    falls in, so finding the frame for a timestamp is one index read, and
+    a slot is overwritten when the ring comes round to it again, evicting
+    the frame from ``slots * interval`` seconds before. Only the first frame
+    captured within an interval is kept, so a camera that is watched
+    continuously writes each slot once. Each slot's image is a file of its
+    own; the index of fixed-size records is memory-mapped.
+
+    Not thread-safe; the methods do blocking IO and run in the executor.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        slots: int = DEFAULT_SNAPSHOT_ARCHIVE_SLOTS,
+        interval: float = DEFAULT_SNAPSHOT_ARCHIVE_INTERVAL,
+    ) -> None:
+        """Initialize snapshot store.
+
+        Args:
+            directory: Directory holding the index and images
+            slots: Number of slots in the ring
+            interval: Seconds of capture time covered by one slot
+        """
+        self.directory = directory
+        self.slots = slots
+        self.interval = interval
+        self._index: Optional[mmap.mmap] = None
+        self.frames = 0
+        self.total_bytes = 0
+        self.archived = 0
+        self.skipped = 0
+        self.evicted = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether the index is mapped."""
+        return self._index is not None
+
+    def path(self, slot: int) -> str:
+        """Return the path of a slot's image."""
+        return os.path.join(self.directory, f"{slot:05d}.img")
+
+    def open(self) -> None:
+        """Map the index, creating it or discarding one of another layout."""
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        size = _HEADER.size + self.slots * _RECORD.size
+        header = _HEADER.pack(_MAGIC, _VERSION, self.slots, self.interval)
+
+        with open(index_path, "a+b") as index_file:
+            index_file.seek(0)
+            valid = index_file.read(_HEADER.size) == header and os.fstat(index_file.fileno()).st_size == size
+            if not valid:
+                self._remove_images()
+                index_file.truncate(0)
+                index_file.write(header)
+                index_file.write(_RECORD.pack(_EMPTY, 0.0, 0, b"") * self.slots)
+                index_file.flush()
+            self._index = mmap.mmap(index_file.fileno(), size)
+
+        self.frames = 0
+        self.total_bytes = 0
+        for slot in range(self.slots):
+            bucket, _, length, _ = self._read(slot)
+            if bucket == _EMPTY:
+                continue
+            try:
+                intact = os.path.getsize(self.path(slot)) == length
+            except OSError:
+                intact = False
+            if intact:
+                self.frames += 1
+                self.total_bytes += length
+            else:
+                self._write(slot, _EMPTY, 0.0, 0, "")
+
+    def close(self) -> None:
+        """Flush and unmap the index."""
+        if self._index is not None:
+            self._index.flush()
+            self._index.close()
+            self._index = None
+
+    def _remove_images(self) -> None:
+        """Delete the images of a discarded index."""
+        for name in os.listdir(self.directory):
+            if name.endswith((".img", ".tmp")):
+                os.remove(os.path.join(self.directory, name))
+
+    def _locate(self, timestamp: float) -> Tuple[int, int]:
+        """Return the time bucket of a timestamp and its slot in the ring."""
+        bucket = int(timestamp // self.interval)
+        return bucket, bucket % self.slots
+
+    def _read(self, slot: int) -> Tuple[int, float, int, str]:
+        """Read a slot's index record."""
+        if self._index is None:
+            raise ValueError("Snapshot store is not open")
+        bucket, captured_at, length, content_type = _RECORD.unpack_from(
+            self._index, _HEADER.size + slot * _RECORD.size
+        )
+        return bucket, captured_at, length, content_type.rstrip(b"\0").decode("ascii", "replace")
+
+    def _write(self, slot: int, bucket: int, captured_at: float, length: int, content_type: str) -> None:
+        """Write a slot's index record."""
+        if self._index is None:
+            raise ValueError("Snapshot store is not open")
+        _RECORD.pack_into(
+            self._index,
+            _HEADER.size + slot * _RECORD.size,
+            bucket,
+            captured_at,
+            length,
+            content_type.encode("ascii", "replace"),
+        )
+
+    def add(self, image: Union[bytes, bytearray], content_type: str, captured_at: float) -> Optional[int]:
+        """Archive a frame in the slot of its capture time.
+
+        Args:
+            image: Encoded image bytes
+            content_type: Media type of the image
+            captured_at: Wall-clock time of the capture
+
+        Returns:
+            Slot the frame was written to, or None if its interval already
+            has a frame
+        """
+        bucket, slot = self._locate(captured_at)
+        previous, _, previous_length, _ = self._read(slot)
+        if previous == bucket:
+            self.skipped += 1
+            return None
+        if previous != _EMPTY:
+            self.frames -= 1
+            self.total_bytes -= previous_length
+            self.evicted += 1
+
+        # Empty the record first, so a crash while the image is replaced
+        # leaves an empty slot rather than one pointing at the wrong image
+        self._write(slot, _EMPTY, 0.0, 0, "")
+        temp_path = self.path(slot) + ".tmp"
+        with open(temp_path, "wb") as image_file:
+            image_file.write(image)
+        os.replace(temp_path, self.path(slot))
+        self._write(slot, bucket, captured_at, len(image), content_type)
+
+        self.frames += 1
+        self.total_bytes += len(image)
+        self.archived += 1
+        return slot
+
+    def lookup(self, timestamp: float) -> Optional[Tuple[bytes, str, float]]:
+        """Return the frame captured in the interval containing a timestamp.
+
+        Args:
+            timestamp: Wall-clock time
+
+        Returns:
+            Image bytes, content type and capture time, or None if no frame
+            of that interval is held
+        """
+        held = self._held(timestamp)
+        if held is None:
+            return None
+        slot, captured_at, length, content_type = held
+        try:
+            with open(self.path(slot), "rb") as image_file:
+                image = image_file.read()
+        except OSError:
+            return None
+        if len(image) != length:
+            return None
+        return image, content_type, captured_at
+
+    def describe(self, timestamp: float) -> Optional[Tuple[float, str]]:
+        """Return the capture time and content type of the frame of an interval.
+
+        Only the index is read, not the image.
+        """
+        held = self._held(timestamp)
+        if held is None:
+            return None
+        return held[1], held[3]
+
+    def _held(self, timestamp: float) -> Optional[Tuple[int, float, int, str]]:
+        """Return the slot and record of the frame held for a timestamp."""
+        bucket, slot = self._locate(timestamp)
+        stored, captured_at, length, content_type = self._read(slot)
+        if stored != bucket:
+            return None
+        return slot, captured_at, length, content_type
+
+    def captures(self) -> List[Tuple[float, str]]:
+        """Return the capture time and content type of all held frames, oldest first."""
+        captured = []
+        for slot in range(self.slots):
+            bucket, captured_at, _, content_type = self._read(slot)
+            if bucket != _EMPTY:
+                captured.append((captured_at, content_type))
+        return sorted(captured)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return ring occupancy and archive counters."""
+        return {
+            "slots": self.slots,
+            "interval": self.interval,
+            "frames": self.frames,
+            "bytes": self.total_bytes,
+            "archived": self.archived,
+            "skipped": self.skipped,
+            "evicted": self.evicted,
+        }
+
+
+class SnapshotArchive:
+    """Archive captured frames and free their space on the device.
+
+    Frames are written to the store in the executor, one at a time. The
+    rabbit keeps every snapshot it takes, so once a batch of captures has
+    been archived, or skipped as its interval already had a frame on disk,
+    it is asked to delete its copies. Archived frames are read back through
+    the archive, so reads never overlap a write.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: SnapshotStore,
+        clear: Callable[[], Awaitable[Any]],
+        clear_every: int = DEFAULT_SNAPSHOT_CLEAR_BATCH,
+    ) -> None:
+        """Initialize snapshot archive.
+
+        Args:
+            hass: Home Assistant instance
+            store: Ring the frames are written to
+            clear: Coroutine function deleting the snapshots on the device
+            clear_every: Frames archived between two clears of the device
+        """
+        self.hass = hass
+        self.store = store
+        self._clear = clear
+        self.clear_every = clear_every
+        self._lock = asyncio.Lock()
+        self._store_lock = asyncio.Lock()
+        self._uncleared = 0
+        self.clears = 0
+        self.failures = 0
+
+    async def async_open(self) -> None:
+        """Open the store."""
+        await self.hass.async_add_executor_job(self.store.open)
+        _LOGGER.debug("Opened snapshot archive %s with %d frames", self.store.directory, self.store.frames)
+
+    async def async_close(self) -> None:
+        """Close the store once frames being written are done."""
+        async with self._store_lock:
+            await self.hass.async_add_executor_job(self.store.close)
+
+    async def async_captures(self) -> List[Tuple[float, str]]:
+        """Return the capture time and content type of all archived frames."""
+        async with self._store_lock:
+            if not self.store.is_open:
+                return []
+            return await self.hass.async_add_executor_job(self.store.captures)
+
+    async def async_describe(self, timestamp: float) -> Optional[Tuple[float, str]]:
+        """Return the capture time and content type of the frame of an interval."""
+        async with self._store_lock:
+            if not self.store.is_open:
+                return None
+            return await self.hass.async_add_executor_job(self.store.describe, timestamp)
+
+    async def async_lookup(self, timestamp: float) -> Optional[Tuple[bytes, str, float]]:
+        """Return the archived frame of the interval containing a timestamp."""
+        async with self._store_lock:
+            if not self.store.is_open:
+                return None
+            return await self.hass.async_add_executor_job(self.store.lookup, timestamp)
+
+    async def async_archive(self, frame: Frame) -> None:
+        """Write a frame to the store, clearing the device after a batch.
+
+        Failures are logged rather than raised, as archiving runs in the
+        background of a capture that has already been served.
+        """
+        captured_at = time.time() - frame.age()
+        async with self._lock:
+            try:
+                async with self._store_lock:
+                    await self.hass.async_add_executor_job(
+                        self.store.add, frame.image, frame.content_type, captured_at
+                    )
+            except (OSError, ValueError) as e:
+                self.failures += 1
+                _LOGGER.warning("Could not archive snapshot in %s: %s", self.store.directory, e)
+                return
+
+            self._uncleared += 1
+            if self._uncleared < self.clear_every:
+                return
+            try:
+                await self._clear()
+            except OpenKarotzAPIError as e:
+                # Left pending, so the next archived frame retries the clear
+                _LOGGER.debug("Could not clear snapshots on device: %s", e)
+                return
+            self._uncleared = 0
+            self.clears += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return store and device clearing counters."""
+        return {
+            **self.store.stats,
+            "failures": self.failures,
+            "device_clears": self.clears,
+            "awaiting_clear": self._uncleared,
+        }
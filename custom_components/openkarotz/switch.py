@@ -6,11 +6,11 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import OpenKarotzAPI
 from .coordinator import OpenKarotzCoordinator
 from .const import DOMAIN
+from .entity import OpenKarotzEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,15 +32,19 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class OpenKarotzSwitch(CoordinatorEntity[OpenKarotzCoordinator], SwitchEntity):
+class OpenKarotzSwitch(OpenKarotzEntity, SwitchEntity):
     """Base switch for OpenKarotz devices."""
 
+    _coordinator_sections = ("state",)
+
     _attr_has_entity_name = True
     _attr_device_info = None
+    _unique_id_suffix: str
 
     def __init__(self, coordinator: OpenKarotzCoordinator) -> None:
         """Initialize switch."""
         super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.device_id}_{self._unique_id_suffix}"
         self._attr_device_info = coordinator.device_info
 
 
@@ -48,11 +52,7 @@ class OpenKarotzMainSwitch(OpenKarotzSwitch):
     """Main device enable/disable switch."""
 
     _attr_name = "Enable Device"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self.coordinator.data.get('info', {}).get('id', 'unknown') if self.coordinator.data else 'unknown'}_enable_switch"
+    _unique_id_suffix = "enable_switch"
 
     @property
     def is_on(self) -> bool:
@@ -0,0 +1,356 @@
+"""Per-device text-to-speech queue for OpenKarotz devices."""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .const import (
+    DEFAULT_TTS_DEDUP_WINDOW,
+    TTS_CHUNK_MAX_CHARS,
+    TTS_MAX_UTTERANCE_DURATION,
+    TTS_STATUS_POLL_INTERVAL,
+    TTS_URGENT_CATEGORIES,
+)
+from .metrics import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Text, voice and category identifying identical utterances
+UtteranceKey = Tuple[str, Optional[str], Optional[str]]
+
+# Whitespace following the end of a sentence
+_SENTENCE_END = re.compile(r"(?<=[.!?;:\u2026])\s+")
+
+
+def split_text(text: str, max_chars: int = TTS_CHUNK_MAX_CHARS) -> List[str]:
+    """Split text into chunks at sentence boundaries.
+
+    The first sentence becomes a chunk of its own so that speech starts as
+    soon as possible; the following sentences are merged into chunks of up
+    to ``max_chars``. Longer sentences are cut at the last space before the
+    limit.
+    """
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut].rstrip())
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks = pieces[:1]
+    for piece in pieces[1:]:
+        if len(chunks) > 1 and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] += " " + piece
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+class Utterance:
+    """One queued text-to-speech request and the callers waiting for it."""
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        future: asyncio.Future,
+        chunks: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize utterance.
+
+        Args:
+            data: TTS request body
+            future: Resolved with the device's response once speech starts
+            chunks: Texts sent one after another; defaults to the whole text
+        """
+        self.data = data
+        self.future = future
+        self.chunks = chunks or [data["text"]]
+        self.queued_at = time.monotonic()
+
+    @property
+    def key(self) -> UtteranceKey:
+        """Return the key identifying identical utterances."""
+        return (self.data["text"], self.data.get("voice"), self.data.get("category"))
+
+
+class TtsQueue:
+    """Speak utterances on one device in order, one at a time.
+
+    Utterances are sent in submission order, and the next one is only sent
+    once the device reports that the previous one finished speaking, so
+    concurrent callers never talk over each other. An utterance identical to
+    one still waiting joins it, and one identical to an utterance sent
+    within the dedup window is not spoken again. Urgent categories overtake
+    everything queued and interrupt the utterance being spoken.
+
+    Long texts are streamed: they are split at sentence boundaries and sent
+    chunk by chunk, so the first sentence is spoken without waiting for the
+    whole text to be synthesized and no single request risks timing out.
+    When the device reports how long a chunk takes to speak, the next chunk
+    is sent ahead of its end by the typical request latency, so it reaches
+    the device as the previous one finishes.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        fetch_status: Callable[[], Awaitable[Dict[str, Any]]],
+        dedup_window: float = DEFAULT_TTS_DEDUP_WINDOW,
+        poll_interval: float = TTS_STATUS_POLL_INTERVAL,
+        max_duration: float = TTS_MAX_UTTERANCE_DURATION,
+        chunk_max_chars: int = TTS_CHUNK_MAX_CHARS,
+    ) -> None:
+        """Initialize TTS queue.
+
+        Args:
+            send: Coroutine function sending one TTS request
+            fetch_status: Coroutine function returning the device's
+                current TTS state
+            dedup_window: Seconds an utterance suppresses identical ones
+            poll_interval: Seconds between checks whether speech finished
+            max_duration: Longest time to wait for one utterance to finish
+            chunk_max_chars: Longest text sent in one request when streaming
+        """
+        self._send = send
+        self._fetch_status = fetch_status
+        self.dedup_window = dedup_window
+        self.poll_interval = poll_interval
+        self.max_duration = max_duration
+        self.chunk_max_chars = chunk_max_chars
+        self._urgent: Deque[Utterance] = deque()
+        self._normal: Deque[Utterance] = deque()
+        self._pending: Dict[UtteranceKey, Utterance] = {}
+        self._recent: Dict[UtteranceKey, Tuple[float, Dict[str, Any]]] = {}
+        self._interrupt = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._current: Optional[Utterance] = None
+        self.latency = LatencyHistogram()
+        self.first_audio = LatencyHistogram()
+        self.send_latency = LatencyHistogram()
+        self.submitted = 0
+        self.spoken = 0
+        self.deduplicated = 0
+        self.interrupted = 0
+        self.failed = 0
+        self.streamed = 0
+        self.chunks_sent = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of utterances waiting to be spoken."""
+        return len(self._urgent) + len(self._normal)
+
+    @property
+    def is_speaking(self) -> bool:
+        """Return whether an utterance is being sent or spoken."""
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def is_urgent(data: Dict[str, Any]) -> bool:
+        """Return whether an utterance overtakes and interrupts other speech."""
+        return str(data.get("category") or "").lower() in TTS_URGENT_CATEGORIES
+
+    async def submit(self, data: Dict[str, Any], stream: Optional[bool] = None) -> Dict[str, Any]:
+        """Queue an utterance and wait until the device starts speaking it.
+
+        Args:
+            data: TTS request body with text and optional voice and category
+            stream: Whether to send the text in sentence chunks; by default
+                only texts longer than one chunk are streamed
+
+        Returns:
+            API response of the request that started the utterance
+        """
+        self.submitted += 1
+        loop = asyncio.get_running_loop()
+        key: UtteranceKey = (data["text"], data.get("voice"), data.get("category"))
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(pending.future)
+
+        recent = self._recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < self.dedup_window:
+            self.deduplicated += 1
+            _LOGGER.debug("Not repeating recently spoken TTS: %s", data["text"])
+            return {**recent[1], "deduplicated": True}
+
+        if stream is None:
+            stream = len(data["text"]) > self.chunk_max_chars
+        chunks = split_text(data["text"], self.chunk_max_chars) if stream else None
+        utterance = Utterance(data, loop.create_future(), chunks)
+        self._pending[key] = utterance
+        if self.is_urgent(data):
+            self._urgent.append(utterance)
+            self._interrupt.set()
+        else:
+            self._normal.append(utterance)
+        self.max_depth = max(self.max_depth, self.depth)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._async_run())
+
+        # Shield the shared request so one caller's cancellation does not
+        # cancel it for the others that joined it
+        return await asyncio.shield(utterance.future)
+
+    async def _async_run(self) -> None:
+        """Speak queued utterances until none are left."""
+        while self._urgent or self._normal:
+            utterance = (self._urgent or self._normal).popleft()
+            key = utterance.key
+            del self._pending[key]
+            self._interrupt.clear()
+            self._current = utterance
+            try:
+                await self._async_speak(utterance)
+            finally:
+                self._current = None
+
+    async def _async_speak(self, utterance: Utterance) -> None:
+        """Send the chunks of one utterance and wait until they are spoken."""
+        count = len(utterance.chunks)
+        for index, chunk in enumerate(utterance.chunks):
+            sent_at = time.monotonic()
+            try:
+                result = await self._send({**utterance.data, "text": chunk})
+            except asyncio.CancelledError:
+                # Stopped before speech started; do not leave the callers waiting
+                if not utterance.future.done():
+                    utterance.future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                if not utterance.future.done():
+                    utterance.future.set_exception(e)
+                else:
+                    _LOGGER.warning("Stopping streamed TTS after chunk %d of %d: %s", index, count, e)
+                return
+
+            now = time.monotonic()
+            self.chunks_sent += 1
+            self.send_latency.record((now - sent_at) * 1000)
+            if index == 0:
+                self._record_start(utterance, now, result)
+
+            duration = result.get("duration")
+            if not isinstance(duration, (int, float)) or isinstance(duration, bool):
+                duration = None
+
+            if index < count - 1 and duration is not None:
+                # Send the next chunk so that it arrives as this one ends
+                lead = (self.send_latency.mean or 0) / 1000
+                if await self._async_interrupted(max(0.0, duration - lead)):
+                    self.interrupted += 1
+                    return
+            elif await self._async_wait_until_spoken(duration):
+                return
+
+    def _record_start(self, utterance: Utterance, now: float, result: Dict[str, Any]) -> None:
+        """Record that the device started speaking an utterance."""
+        elapsed_ms = (now - utterance.queued_at) * 1000
+        self.spoken += 1
+        self.latency.record(elapsed_ms)
+        if len(utterance.chunks) > 1:
+            self.streamed += 1
+            self.first_audio.record(elapsed_ms)
+            result = {**result, "chunks": len(utterance.chunks)}
+        self._remember(utterance.key, now, result)
+        if not utterance.future.done():
+            utterance.future.set_result(result)
+
+    def _remember(self, key: UtteranceKey, now: float, result: Dict[str, Any]) -> None:
+        """Record a spoken utterance and forget those outside the window."""
+        self._recent = {
+            recent_key: recent
+            for recent_key, recent in self._recent.items()
+            if now - recent[0] < self.dedup_window
+        }
+        self._recent[key] = (now, result)
+
+    async def _async_interrupted(self, delay: float) -> bool:
+        """Wait up to ``delay`` seconds, returning whether urgent speech arrived."""
+        if self._interrupt.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._interrupt.wait(), delay)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _async_wait_until_spoken(self, expected: Optional[float] = None) -> bool:
+        """Wait until the device stops speaking or urgent speech arrives.
+
+        Args:
+            expected: Seconds the device reported the speech would take;
+                its status is first checked once that time has passed
+
+        Returns:
+            Whether the wait was cut short by urgent speech
+        """
+        deadline = time.monotonic() + self.max_duration
+        delay = expected if expected else self.poll_interval
+        while time.monotonic() < deadline:
+            if await self._async_interrupted(delay):
+                self.interrupted += 1
+                return True
+            delay = self.poll_interval
+
+            try:
+                status = await self._fetch_status()
+            except Exception as e:
+                _LOGGER.debug("Could not check whether speech finished: %s", e)
+                return False
+            if status.get("status") != "playing":
+                return False
+
+        _LOGGER.warning("Speech did not finish within %ss, continuing", self.max_duration)
+        return False
+
+    def cancel(self, error: Exception) -> None:
+        """Stop speaking and fail the current and every queued utterance.
+
+        Args:
+            error: Exception raised to the callers still waiting
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for utterance in (self._current, *self._urgent, *self._normal):
+            if utterance is None:
+                continue
+            if not utterance.future.done():
+                utterance.future.set_exception(error)
+        self._urgent.clear()
+        self._normal.clear()
+        self._pending.clear()
+        self._recent.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return queue length and speech latency metrics."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "speaking": self.is_speaking,
+            "submitted": self.submitted,
+            "spoken": self.spoken,
+            "deduplicated": self.deduplicated,
+            "interrupted": self.interrupted,
+            "failed": self.failed,
+            "streamed": self.streamed,
+            "chunks_sent": self.chunks_sent,
+            "latency_mean_ms": self.latency.mean,
+            "latency_p50_ms": self.latency.percentile(0.50),
+            "latency_p95_ms": self.latency.percentile(0.95),
+            "first_audio_p50_ms": self.first_audio.percentile(0.50),
+            "first_audio_p95_ms": self.first_audio.percentile(0.95),
+        }
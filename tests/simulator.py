@@ -0,0 +1,471 @@
+"""Local OpenKarotz device simulator for testing and benchmarking.
+
+Serves every path in ``API_ENDPOINTS`` from an aiohttp application with
+configurable latency, jitter, failures, slow bodies and content-type quirks.
+Many virtual rabbits can be started on localhost, each on its own port.
+
+Run standalone to keep a fleet up for manual testing:
+
+    python tests/simulator.py --count 100 --latency 0.05 --jitter 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Set
+
+from aiohttp import web
+
+# Minimal JPEG: SOI, a comment segment with the device id, EOI
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_EOI = b"\xff\xd9"
+
+FAILURE_ERROR = "error"
+FAILURE_DISCONNECT = "disconnect"
+FAILURE_TIMEOUT = "timeout"
+
+
+@dataclass
+class SimulatorProfile:
+    """Network and firmware behaviour of a simulated rabbit."""
+
+    # Seconds added before every response
+    latency: float = 0.0
+    # Uniform +/- variation applied to latency
+    jitter: float = 0.0
+    # Probability that a request fails
+    failure_rate: float = 0.0
+    # How failures manifest: "error" (HTTP 500), "disconnect" or "timeout"
+    failure_mode: str = FAILURE_ERROR
+    # Seconds to wait between body chunks; 0 sends the body in one write
+    slow_body: float = 0.0
+    # Body chunk size when slow_body is set
+    chunk_size: int = 64
+    # Content-Type sent with JSON bodies; the real CGI scripts use text/html
+    content_type: str = "text/html"
+    # Characters spoken per second, used to simulate TTS duration
+    speech_rate: float = 15.0
+    # Whether the firmware serves the long-poll event endpoint
+    events: bool = True
+    # Random seed for reproducible jitter and failures
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimulatorState:
+    """Mutable device state served by the simulator."""
+
+    device_id: str
+    name: str
+    status: Dict[str, Any] = field(default_factory=dict)
+    leds: Dict[str, Any] = field(default_factory=dict)
+    tts: Dict[str, Any] = field(default_factory=dict)
+    moods: Dict[str, Any] = field(default_factory=dict)
+    version: Dict[str, Any] = field(default_factory=dict)
+    snapshots: int = 0
+    stream: Optional[str] = None
+    speaking_until: float = 0.0
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    event_cursor: int = 0
+
+
+class KarotzSimulator:
+    """A single simulated OpenKarotz device."""
+
+    def __init__(
+        self,
+        profile: Optional[SimulatorProfile] = None,
+        device_id: str = "00:00:00:00:00:01",
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the simulator; call start() to begin serving."""
+        self.profile = profile or SimulatorProfile()
+        self.host = host
+        self.port = port
+        self.state = self._initial_state(device_id)
+        self.requests: Dict[str, int] = {}
+        self.connections: Set[Any] = set()
+        self.received: List[Dict[str, Any]] = []
+        self._rng = random.Random(self.profile.seed)
+        self._event_signal = asyncio.Event()
+        self._closing = False
+        self._runner: Optional[web.AppRunner] = None
+        self.app = self._build_app()
+
+    @staticmethod
+    def _initial_state(device_id: str) -> SimulatorState:
+        """Return the state of a freshly booted rabbit."""
+        name = f"Karotz {device_id[-5:].replace(':', '')}"
+        return SimulatorState(
+            device_id=device_id,
+            name=name,
+            status={
+                "id": device_id,
+                "name": name,
+                "version": "200",
+                "wlan_mac": device_id,
+                "sleep": "0",
+                "state": "awake",
+                "enabled": True,
+                "ears_disabled": "0",
+                "karotz_free_space": "148.4M",
+                "nb_moods": "305",
+            },
+            leds={
+                "enabled": True,
+                "brightness": 100,
+                "rgb_value": "00FF00",
+                "color": "green",
+                "leds": [{"id": 1, "name": "Main LED", "enabled": True}],
+            },
+            tts={"status": "idle", "completed": True, "text": None},
+            moods={"moods": [{"id": index, "name": f"mood_{index}"} for index in range(1, 306)]},
+            version={"version": "200", "firmware": "OpenKarotz 200", "karotz": "12.07.19.00"},
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL the simulator is reachable at."""
+        return f"http://{self.host}:{self.port}"
+
+    def _build_app(self) -> web.Application:
+        """Create the aiohttp application with every device route."""
+        app = web.Application(middlewares=[self._network_middleware])
+        routes = [
+            ("GET", "/cgi-bin/status", self._handle_status),
+            ("GET", "/cgi-bin/leds", self._handle_get_leds),
+            ("POST", "/cgi-bin/leds", self._handle_post_leds),
+            ("GET", "/cgi-bin/tts", self._handle_get_tts),
+            ("POST", "/cgi-bin/tts", self._handle_post_tts),
+            ("GET", "/cgi-bin/moods", self._handle_moods),
+            ("GET", "/cgi-bin/get_version", self._handle_version),
+            ("GET", "/cgi-bin/wakeup", self._handle_wakeup),
+            ("GET", "/cgi-bin/sleep", self._handle_sleep),
+            ("GET", "/cgi-bin/clear_cache", self._handle_ok),
+            ("GET", "/cgi-bin/clear_snapshots", self._handle_clear_snapshots),
+            ("GET", "/cgi-bin/take_snapshot", self._handle_take_snapshot),
+            ("GET", "/cgi-bin/play_stream", self._handle_play_stream),
+            ("GET", "/cgi-bin/pause", self._handle_pause),
+            ("GET", "/cgi-bin/squeezebox_start", self._handle_ok),
+            ("GET", "/cgi-bin/squeezebox_stop", self._handle_ok),
+        ]
+        if self.profile.events:
+            routes.append(("GET", "/cgi-bin/events", self._handle_events))
+        for method, path, handler in routes:
+            app.router.add_route(method, path, handler)
+        return app
+
+    async def start(self) -> None:
+        """Start serving on the configured host and port."""
+        self._closing = False
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        # Release pending long polls so shutdown does not wait for them
+        self._closing = True
+        self._event_signal.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "KarotzSimulator":
+        """Start the simulator in an async with block."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Stop the simulator at the end of an async with block."""
+        await self.stop()
+
+    @web.middleware
+    async def _network_middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Apply latency, failures and body quirks to every request."""
+        key = f"{request.method} {request.path}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.connections.add(request.transport.get_extra_info("peername"))
+
+        profile = self.profile
+        delay = profile.latency
+        if profile.jitter:
+            delay += self._rng.uniform(-profile.jitter, profile.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if profile.failure_rate and self._rng.random() < profile.failure_rate:
+            if profile.failure_mode == FAILURE_DISCONNECT:
+                request.transport.close()
+                raise web.HTTPInternalServerError()
+            if profile.failure_mode == FAILURE_TIMEOUT:
+                await asyncio.sleep(3600)
+            raise web.HTTPInternalServerError(text="simulated failure")
+
+        result = await handler(request)
+        if isinstance(result, web.StreamResponse):
+            return result
+        return await self._send_json(request, result)
+
+    async def _send_json(self, request: web.Request, payload: Any) -> web.StreamResponse:
+        """Send a JSON body using the profile's content type and pacing."""
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": self.profile.content_type}
+        if not self.profile.slow_body:
+            return web.Response(body=body, headers=headers)
+
+        response = web.StreamResponse(headers=headers)
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        size = max(1, self.profile.chunk_size)
+        for offset in range(0, len(body), size):
+            await response.write(body[offset:offset + size])
+            await asyncio.sleep(self.profile.slow_body)
+        await response.write_eof()
+        return response
+
+    async def _read_payload(self, request: web.Request) -> Dict[str, Any]:
+        """Return the JSON request body, or an empty dict."""
+        if not request.can_read_body:
+            return {}
+        try:
+            payload = await request.json()
+        except ValueError:
+            return {}
+        self.received.append({"path": request.path, **payload})
+        return payload if isinstance(payload, dict) else {}
+
+    def push_event(self, event_type: str, **payload: Any) -> Dict[str, Any]:
+        """Record a device event and release waiting long polls.
+
+        Args:
+            event_type: Event type, such as "button", "ears" or "rfid"
+            payload: Event fields; a "status" dict is also applied to the
+                device status
+
+        Returns:
+            The recorded event
+        """
+        self.state.event_cursor += 1
+        event = {"id": self.state.event_cursor, "type": event_type, "time": time.time(), **payload}
+        if isinstance(payload.get("status"), dict):
+            self.state.status.update(payload["status"])
+        self.state.events = self.state.events[-99:] + [event]
+        self._event_signal.set()
+        self._event_signal = asyncio.Event()
+        return event
+
+    def _refresh_tts(self) -> None:
+        """Mark speech as finished once its simulated duration has passed."""
+        if self.state.tts["status"] == "playing" and time.monotonic() >= self.state.speaking_until:
+            self.state.tts.update(status="idle", completed=True)
+
+    async def _handle_status(self, request: web.Request) -> Dict[str, Any]:
+        """Return device status."""
+        return self.state.status
+
+    async def _handle_get_leds(self, request: web.Request) -> Dict[str, Any]:
+        """Return LED state."""
+        return self.state.leds
+
+    async def _handle_post_leds(self, request: web.Request) -> Dict[str, Any]:
+        """Apply an LED change."""
+        payload = await self._read_payload(request)
+        leds = self.state.leds
+        for key in ("color", "brightness", "color_temperature", "preset", "rgb_value"):
+            if key in payload:
+                leds[key] = payload[key]
+        leds["enabled"] = leds.get("brightness", 0) != 0
+        self.state.status["led_color"] = leds.get("rgb_value")
+        return {"status": "ok"}
+
+    async def _handle_get_tts(self, request: web.Request) -> Dict[str, Any]:
+        """Return TTS state."""
+        self._refresh_tts()
+        return self.state.tts
+
+    async def _handle_post_tts(self, request: web.Request) -> Dict[str, Any]:
+        """Start speaking a text."""
+        payload = await self._read_payload(request)
+        text = str(payload.get("text", ""))
+        duration = len(text) / self.profile.speech_rate if self.profile.speech_rate else 0
+        self.state.speaking_until = time.monotonic() + duration
+        self.state.tts.update(
+            status="playing" if duration else "idle",
+            completed=not duration,
+            text=text,
+            voice=payload.get("voice"),
+            category=payload.get("category"),
+        )
+        return {"status": "ok", "duration": round(duration, 3)}
+
+    async def _handle_moods(self, request: web.Request) -> Dict[str, Any]:
+        """Return the moods catalog."""
+        return self.state.moods
+
+    async def _handle_events(self, request: web.Request) -> Dict[str, Any]:
+        """Return events after the cursor, waiting for one if there are none."""
+        if "cursor" not in request.query:
+            return {"cursor": self.state.event_cursor, "events": []}
+
+        cursor = int(request.query["cursor"])
+        deadline = time.monotonic() + float(request.query.get("wait", 25))
+        while True:
+            events = [event for event in self.state.events if event["id"] > cursor]
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0 or self._closing:
+                return {"cursor": self.state.event_cursor, "events": events}
+            try:
+                await asyncio.wait_for(self._event_signal.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _handle_version(self, request: web.Request) -> Dict[str, Any]:
+        """Return firmware versions."""
+        return self.state.version
+
+    async def _handle_wakeup(self, request: web.Request) -> Dict[str, Any]:
+        """Wake the rabbit up."""
+        self.state.status.update(sleep="0", state="awake")
+        return {"return": "0", "silent": request.query.get("silent", "0")}
+
+    async def _handle_sleep(self, request: web.Request) -> Dict[str, Any]:
+        """Put the rabbit to sleep."""
+        self.state.status.update(sleep="1", state="sleeping")
+        return {"return": "0"}
+
+    async def _handle_ok(self, request: web.Request) -> Dict[str, Any]:
+        """Acknowledge a command without side effects."""
+        return {"return": "0"}
+
+    async def _handle_clear_snapshots(self, request: web.Request) -> Dict[str, Any]:
+        """Delete stored snapshots."""
+        cleared = self.state.snapshots
+        self.state.snapshots = 0
+        return {"return": "0", "cleared": cleared}
+
+    async def _handle_take_snapshot(self, request: web.Request) -> web.StreamResponse:
+        """Return a tiny JPEG image."""
+        self.state.snapshots += 1
+        comment = f"{self.state.device_id} #{self.state.snapshots}".encode()
+        segment = b"\xff\xfe" + (len(comment) + 2).to_bytes(2, "big") + comment
+        return web.Response(body=_JPEG_SOI + segment + _JPEG_EOI, content_type="image/jpeg")
+
+    async def _handle_play_stream(self, request: web.Request) -> Dict[str, Any]:
+        """Start playing a stream URL."""
+        self.state.stream = request.query.get("url")
+        self.state.status["state"] = "playing"
+        return {"return": "0"}
+
+    async def _handle_pause(self, request: web.Request) -> Dict[str, Any]:
+        """Pause stream playback."""
+        self.state.status["state"] = "awake"
+        return {"return": "0"}
+
+
+class KarotzFleet:
+    """A group of simulated rabbits, each on its own localhost port."""
+
+    def __init__(
+        self,
+        count: int,
+        profile: Optional[SimulatorProfile] = None,
+        host: str = "127.0.0.1",
+    ) -> None:
+        """Initialize the fleet; call start() to begin serving.
+
+        With a seeded profile, each rabbit gets the seed plus its index, so
+        jitter and failures are reproducible but not in lockstep.
+        """
+        profile = profile or SimulatorProfile()
+        self.simulators = [
+            KarotzSimulator(
+                profile=profile if profile.seed is None else replace(profile, seed=profile.seed + index),
+                device_id=f"00:00:00:00:{index >> 8 & 0xFF:02X}:{index & 0xFF:02X}",
+                host=host,
+            )
+            for index in range(count)
+        ]
+
+    def __iter__(self):
+        """Iterate over the simulators."""
+        return iter(self.simulators)
+
+    def __len__(self) -> int:
+        """Return the number of simulators."""
+        return len(self.simulators)
+
+    async def start(self) -> None:
+        """Start every simulator."""
+        await asyncio.gather(*(simulator.start() for simulator in self.simulators))
+
+    async def stop(self) -> None:
+        """Stop every simulator."""
+        await asyncio.gather(*(simulator.stop() for simulator in self.simulators))
+
+    async def __aenter__(self) -> "KarotzFleet":
+        """Start the fleet in an async with block."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Stop the fleet at the end of an async with block."""
+        await self.stop()
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served by the whole fleet."""
+        return sum(sum(simulator.requests.values()) for simulator in self.simulators)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run a fleet until interrupted."""
+    profile = SimulatorProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        failure_mode=args.failure_mode,
+        slow_body=args.slow_body,
+        content_type=args.content_type,
+        events=not args.no_events,
+        seed=args.seed,
+    )
+    async with KarotzFleet(args.count, profile, args.host) as fleet:
+        for simulator in fleet:
+            print(f"{simulator.state.device_id} {simulator.base_url}")
+        sys.stdout.flush()
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Parse arguments and serve a simulated fleet."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--failure-mode",
+        choices=(FAILURE_ERROR, FAILURE_DISCONNECT, FAILURE_TIMEOUT),
+        default=FAILURE_ERROR,
+    )
+    parser.add_argument("--slow-body", type=float, default=0.0)
+    parser.add_argument("--content-type", default="text/html")
+    parser.add_argument("--no-events", action="store_true", help="serve no event endpoint")
+    parser.add_argument("--seed", type=int, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,577 @@
+"""Tests for the OpenKarotz API client."""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.openkarotz.api import (
+    OpenKarotzAPI,
+    OpenKarotzConnectionError,
+    OpenKarotzUnavailableError,
+)
+from custom_components.openkarotz.cache import ResponseCache
+from custom_components.openkarotz.coalescer import LedCommandCoalescer
+from custom_components.openkarotz.codec import ResponseDecoder, ResponseTooLargeError
+from custom_components.openkarotz.command_queue import CommandQueue
+from custom_components.openkarotz.const import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from custom_components.openkarotz.metrics import LatencyHistogram
+from custom_components.openkarotz.resilience import (
+    BREAKER_CLOSED,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+)
+
+
+class TestOpenKarotzAPIResilience:
+    """Test cases for retries and the circuit breaker."""
+
+    @pytest.fixture
+    def api(self):
+        """Create a connected API client without network access."""
+        api = OpenKarotzAPI(
+            "192.168.1.201",
+            session=MagicMock(),
+            retry_policy=RetryPolicy(attempts=3, base_delay=0, max_delay=0),
+            breaker=CircuitBreaker(failure_threshold=5, recovery_timeout=3600),
+        )
+        api._is_connected = True
+        return api
+
+    @pytest.mark.asyncio
+    async def test_get_is_retried_after_transport_error(self, api):
+        """Test that a dropped GET is retried and succeeds."""
+        api._async_fetch = AsyncMock(
+            side_effect=[OpenKarotzConnectionError("reset"), {"version": "200"}]
+        )
+
+        result = await api.get_state()
+
+        assert result == {"version": "200"}
+        assert api._async_fetch.call_count == 2
+        assert api.breaker.state == BREAKER_CLOSED
+        assert api.breaker.consecutive_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_get_gives_up_after_attempts(self, api):
+        """Test that retries stop after the configured number of attempts."""
+        api._async_fetch = AsyncMock(side_effect=OpenKarotzConnectionError("down"))
+
+        with pytest.raises(OpenKarotzConnectionError):
+            await api.get_leds()
+
+        assert api._async_fetch.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried(self, api):
+        """Test that non-idempotent POSTs are sent only once."""
+        api._async_fetch = AsyncMock(side_effect=OpenKarotzConnectionError("reset"))
+
+        with pytest.raises(OpenKarotzConnectionError):
+            await api.set_led(brightness=50)
+
+        assert api._async_fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_breaker_opens_and_fails_fast(self, api):
+        """Test that a dead device stops costing network round trips."""
+        api.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=3600)
+        api._async_fetch = AsyncMock(side_effect=OpenKarotzConnectionError("timeout"))
+
+        for _ in range(2):
+            with pytest.raises(OpenKarotzConnectionError):
+                await api.get_state()
+        assert api.breaker.state == BREAKER_OPEN
+        calls = api._async_fetch.call_count
+
+        with pytest.raises(OpenKarotzUnavailableError):
+            await api.get_leds()
+        assert api._async_fetch.call_count == calls
+
+        await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_one_request_exhausting_retries_keeps_breaker_closed(self, api):
+        """Test that retries of one request count as a single failure."""
+        api.breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=3600)
+        api._async_fetch = AsyncMock(side_effect=OpenKarotzConnectionError("timeout"))
+
+        with pytest.raises(OpenKarotzConnectionError):
+            await api.get_state()
+
+        assert api._async_fetch.call_count == 3
+        assert api.breaker.state == BREAKER_CLOSED
+        assert api.breaker.consecutive_failures == 1
+
+        api._async_fetch = AsyncMock(return_value={"return": "0"})
+        assert await api.set_led(brightness=50) == {"return": "0"}
+
+    @pytest.mark.asyncio
+    async def test_probe_closes_breaker(self, api):
+        """Test that a successful background probe closes the breaker."""
+        api.breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        api._async_fetch = AsyncMock(side_effect=OpenKarotzConnectionError("timeout"))
+
+        with pytest.raises(OpenKarotzConnectionError):
+            await api.set_led(brightness=0)
+        assert api.breaker.is_open
+
+        api._async_fetch = AsyncMock(return_value={"version": "200"})
+        await api._probe_task
+
+        assert api.breaker.state == BREAKER_CLOSED
+        assert await api.get_state() == {"version": "200"}
+
+
+class TestRetryPolicy:
+    """Test cases for the retry policy."""
+
+    def test_backoff_is_bounded(self):
+        """Test that jittered backoff never exceeds the ceiling."""
+        policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=2)
+        for attempt in range(6):
+            delay = policy.backoff(attempt)
+            assert 0 <= delay <= min(2, 0.5 * 2 ** attempt)
+
+    def test_only_listed_methods_retry(self):
+        """Test which methods are retried."""
+        policy = RetryPolicy(attempts=2)
+        assert policy.should_retry("GET", 0)
+        assert not policy.should_retry("GET", 1)
+        assert not policy.should_retry("POST", 0)
+
+
+class TestOpenKarotzAPICoalescing:
+    """Test cases for single-flight request coalescing."""
+
+    @pytest.fixture
+    def api(self):
+        """Create a connected API client without network access."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api._is_connected = True
+        return api
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_share_one_request(self, api):
+        """Test that get_info and get_state share a /cgi-bin/status call."""
+        release = asyncio.Event()
+
+        async def fetch(method, endpoint, data=None, params=None):
+            await release.wait()
+            return {"version": "200"}
+
+        api._async_fetch = AsyncMock(side_effect=fetch)
+
+        pending = [
+            asyncio.ensure_future(api.get_info()),
+            asyncio.ensure_future(api.get_state()),
+            asyncio.ensure_future(api.get_state()),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending)
+
+        assert api._async_fetch.call_count == 1
+        assert api.coalesced_requests == 2
+        assert all(result == {"version": "200"} for result in results)
+        assert not api._inflight
+
+    @pytest.mark.asyncio
+    async def test_different_params_are_not_coalesced(self, api):
+        """Test that requests with different parameters are sent separately."""
+        api._async_fetch = AsyncMock(return_value={"return": "0"})
+
+        await asyncio.gather(api.wakeup(silent=True), api.wakeup(silent=False))
+
+        assert api._async_fetch.call_count == 2
+        assert api.coalesced_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_posts_are_never_coalesced(self, api):
+        """Test that commands are always sent."""
+        api._async_fetch = AsyncMock(return_value={"status": "ok"})
+
+        data = {"text": "Hello"}
+        await asyncio.gather(
+            api._async_request("POST", "/cgi-bin/tts", data),
+            api._async_request("POST", "/cgi-bin/tts", data),
+        )
+
+        assert api._async_fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self, api):
+        """Test that one caller giving up leaves the others unaffected."""
+        release = asyncio.Event()
+
+        async def fetch(method, endpoint, data=None, params=None):
+            await release.wait()
+            return {"leds": []}
+
+        api._async_fetch = AsyncMock(side_effect=fetch)
+
+        first = asyncio.ensure_future(api.get_leds())
+        second = asyncio.ensure_future(api.get_leds())
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == {"leds": []}
+        assert first.cancelled()
+
+
+class TestOpenKarotzAPICache:
+    """Test cases for the response cache."""
+
+    @pytest.fixture
+    def api(self):
+        """Create a connected API client without network access."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api._is_connected = True
+        return api
+
+    @pytest.mark.asyncio
+    async def test_moods_are_served_from_cache(self, api):
+        """Test that the moods catalog is fetched once."""
+        api._async_fetch = AsyncMock(return_value={"moods": [1, 2, 3]})
+
+        first = await api.get_apps()
+        second = await api.get_apps()
+
+        assert first == second == {"moods": [1, 2, 3]}
+        assert api._async_fetch.call_count == 1
+        assert api.cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_set_led_invalidates_leds(self, api):
+        """Test that a successful LED write drops the cached LED state."""
+        api._async_fetch = AsyncMock(return_value={"brightness": 10})
+        await api.get_leds()
+        await api.get_apps()
+
+        api._async_fetch = AsyncMock(return_value={"status": "ok"})
+        await api.set_led(brightness=80)
+
+        api._async_fetch = AsyncMock(return_value={"brightness": 80})
+        assert await api.get_leds() == {"brightness": 80}
+        await api.get_apps()
+        api._async_fetch.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_in_flight_during_write_is_not_cached(self, api):
+        """Test that a GET sent before a write neither caches nor is joined."""
+        release = asyncio.Event()
+        led_states = iter([{"brightness": 10}, {"brightness": 80}])
+
+        async def fetch(method, endpoint, data=None, params=None):
+            if method == "POST":
+                return {"status": "ok"}
+            state = next(led_states)
+            if state["brightness"] == 10:
+                await release.wait()
+            return state
+
+        api._async_fetch = AsyncMock(side_effect=fetch)
+
+        before_write = asyncio.ensure_future(api.get_leds())
+        await asyncio.sleep(0)
+        await api.set_led(brightness=80)
+        after_write = asyncio.ensure_future(api.get_leds())
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await before_write == {"brightness": 10}
+        assert await after_write == {"brightness": 80}
+        assert await api.get_leds() == {"brightness": 80}
+        assert api.cache.stale_discarded == 1
+        assert api.coalesced_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_wakeup_invalidates_status(self, api):
+        """Test that state-changing GETs invalidate the status cache."""
+        api._async_fetch = AsyncMock(return_value={"sleep": "1"})
+        await api.get_state()
+
+        api._async_fetch = AsyncMock(return_value={"return": "0"})
+        await api.wakeup()
+
+        api._async_fetch = AsyncMock(return_value={"sleep": "0"})
+        assert await api.get_state() == {"sleep": "0"}
+
+    def test_lru_eviction_and_expiry(self):
+        """Test that the cache stays bounded and honours TTLs."""
+        cache = ResponseCache(ttls={"/a": 60, "/b": 0.0001}, max_entries=2)
+        cache.set(("/a", (("n", 1),)), 1)
+        cache.set(("/a", (("n", 2),)), 2)
+        assert cache.get(("/a", (("n", 1),))) == 1
+        cache.set(("/a", (("n", 3),)), 3)
+
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        assert cache.get(("/a", (("n", 2),))) is None
+
+        cache.set(("/b", ()), "stale")
+        time.sleep(0.001)
+        assert cache.get(("/b", ())) is None
+        cache.set(("/c", ()), "uncached")
+        assert cache.get(("/c", ())) is None
+
+
+class TestCommandQueue:
+    """Test cases for the per-device command queue."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_background(self):
+        """Test that queued interactive commands are served first."""
+        queue = CommandQueue(max_in_flight=1, rate=0)
+        order = []
+
+        async def request(name, priority):
+            async with queue.slot(priority):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await queue.acquire(PRIORITY_BACKGROUND)
+        pending = [
+            asyncio.ensure_future(request("poll-1", PRIORITY_BACKGROUND)),
+            asyncio.ensure_future(request("poll-2", PRIORITY_BACKGROUND)),
+            asyncio.ensure_future(request("led", PRIORITY_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert queue.depth == 3
+
+        queue.release()
+        await asyncio.gather(*pending)
+
+        assert order == ["led", "poll-1", "poll-2"]
+        assert queue.stats["max_depth"] == 3
+        assert queue.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight_is_respected(self):
+        """Test that no more than max_in_flight requests run at once."""
+        queue = CommandQueue(max_in_flight=2, rate=0)
+        running = 0
+        peak = 0
+
+        async def request():
+            nonlocal running, peak
+            async with queue.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        assert queue.dispatched == 6
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_spaces_requests(self):
+        """Test that the token bucket delays requests beyond the burst."""
+        queue = CommandQueue(max_in_flight=4, rate=50, burst=2)
+        start = time.monotonic()
+
+        async def request():
+            async with queue.slot():
+                pass
+
+        await asyncio.gather(*(request() for _ in range(4)))
+
+        # Two requests ride the burst, the other two wait ~20ms each
+        assert time.monotonic() - start >= 0.03
+        assert queue.stats["max_wait_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test that cancelling a queued request does not leak a slot."""
+        queue = CommandQueue(max_in_flight=1, rate=0)
+        await queue.acquire()
+        waiter = asyncio.ensure_future(queue.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        queue.release()
+        await asyncio.sleep(0)
+
+        assert queue.in_flight == 0
+        await asyncio.wait_for(queue.acquire(), 1)
+        queue.release()
+
+
+class TestResponseDecoder:
+    """Test cases for response body decoding."""
+
+    @staticmethod
+    def _response(chunks, content_length=None):
+        """Create a mock response streaming the given chunks."""
+
+        async def iter_any():
+            for chunk in chunks:
+                yield chunk
+
+        response = MagicMock()
+        response.content_length = content_length
+        response.read = AsyncMock(return_value=b"".join(chunks))
+        response.content.iter_any = iter_any
+        return response
+
+    @pytest.mark.asyncio
+    async def test_html_labelled_json_is_decoded_from_bytes(self):
+        """Test that the body is decoded straight from bytes."""
+        decoder = ResponseDecoder()
+        body = b'{"version": "200", "wlan_mac": "00:11:22:33:44:55"}'
+
+        raw = await decoder.async_read(self._response([body], len(body)))
+
+        assert decoder.decode(raw) == {"version": "200", "wlan_mac": "00:11:22:33:44:55"}
+        assert decoder.stats["decoded"] == 1
+        assert decoder.stats["decoded_bytes"] == len(body)
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_is_rejected(self):
+        """Test the maximum body size with and without Content-Length."""
+        decoder = ResponseDecoder(max_body_size=8)
+
+        with pytest.raises(ResponseTooLargeError):
+            await decoder.async_read(self._response([b"0123456789"], 10))
+        with pytest.raises(ResponseTooLargeError):
+            await decoder.async_read(self._response([b"01234", b"56789"]))
+
+        raw = await decoder.async_read(self._response([b"[1,", b"2]"]))
+        assert decoder.decode(raw) == [1, 2]
+
+    def test_invalid_json_raises_value_error(self):
+        """Test that malformed bodies surface as ValueError."""
+        decoder = ResponseDecoder()
+
+        with pytest.raises(ValueError):
+            decoder.decode(b"<html>Not found</html>")
+        assert decoder.decoded == 1
+
+
+class TestRequestMetrics:
+    """Test cases for per-endpoint request metrics."""
+
+    def test_percentiles_follow_samples(self):
+        """Test that histogram percentiles land in the right buckets."""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(20)
+        for _ in range(10):
+            histogram.record(900)
+
+        assert 10 <= histogram.percentile(0.50) <= 25
+        assert 750 <= histogram.percentile(0.95) <= 900
+        assert histogram.percentile(0.99) <= 900
+        assert LatencyHistogram().percentile(0.5) is None
+
+    @pytest.mark.asyncio
+    async def test_api_records_latency_and_errors(self):
+        """Test that each attempt is recorded against its endpoint."""
+        api = OpenKarotzAPI(
+            "192.168.1.201",
+            session=MagicMock(),
+            retry_policy=RetryPolicy(attempts=2, base_delay=0, max_delay=0),
+        )
+        api._is_connected = True
+        api._async_fetch = AsyncMock(
+            side_effect=[OpenKarotzConnectionError("reset"), {"leds": []}]
+        )
+
+        await api.get_leds()
+
+        leds = api.metrics.get("/cgi-bin/leds").as_dict()
+        assert leds["requests"] == 2
+        assert leds["errors"] == 1
+        assert leds["p99_ms"] is not None
+        assert api.metrics.total_errors == 1
+
+
+class TestLedCommandCoalescer:
+    """Test cases for merging rapid LED commands."""
+
+    @pytest.mark.asyncio
+    async def test_commands_behind_inflight_request_are_merged(self):
+        """Test that a slider drag becomes two requests, the last value winning."""
+        release = asyncio.Event()
+        sent = []
+
+        async def send(data):
+            sent.append(data)
+            await release.wait()
+            return {"status": "ok"}
+
+        coalescer = LedCommandCoalescer(send)
+        first = asyncio.ensure_future(coalescer.submit({"brightness": 10}))
+        await asyncio.sleep(0)
+        rest = [
+            asyncio.ensure_future(coalescer.submit({"brightness": value}))
+            for value in range(20, 100, 10)
+        ]
+        rest.append(asyncio.ensure_future(coalescer.submit({"rgb_value": "00FF00"})))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, *rest)
+
+        assert sent == [{"brightness": 10}, {"brightness": 90, "rgb_value": "00FF00"}]
+        assert all(result == {"status": "ok"} for result in results)
+        assert coalescer.stats == {
+            "submitted": 10,
+            "sent": 2,
+            "collapsed": 8,
+            "superseded_values": 7,
+        }
+
+    @pytest.mark.asyncio
+    async def test_new_color_mode_replaces_pending_one(self):
+        """Test that conflicting color attributes are not sent together."""
+        sent = []
+
+        async def send(data):
+            sent.append(data)
+            return {}
+
+        coalescer = LedCommandCoalescer(send)
+        await asyncio.gather(
+            coalescer.submit({"color_temperature": 3500}),
+            coalescer.submit({"rgb_value": "FF0000", "brightness": 50}),
+        )
+
+        assert sent == [{"rgb_value": "FF0000", "brightness": 50}]
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_merged_caller(self):
+        """Test that a failed request fails all commands it carried."""
+        coalescer = LedCommandCoalescer(AsyncMock(side_effect=OpenKarotzConnectionError("down")))
+
+        results = await asyncio.gather(
+            coalescer.submit({"brightness": 10}),
+            coalescer.submit({"brightness": 20}),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, OpenKarotzConnectionError) for result in results)
+        assert coalescer.sent == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_releases_every_caller(self):
+        """Test that callers do not hang when the flush task is cancelled."""
+        started = asyncio.Event()
+
+        async def send(data):
+            started.set()
+            await asyncio.Event().wait()
+
+        coalescer = LedCommandCoalescer(send)
+        first = asyncio.ensure_future(coalescer.submit({"brightness": 10}))
+        await started.wait()
+        queued = asyncio.ensure_future(coalescer.submit({"brightness": 20}))
+        await asyncio.sleep(0)
+
+        coalescer._task.cancel()
+        results = await asyncio.wait_for(asyncio.gather(first, queued, return_exceptions=True), 1)
+
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
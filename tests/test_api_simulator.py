@@ -0,0 +1,155 @@
+"""Tests for the OpenKarotz API client against the local device simulator."""
+
+import asyncio
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from custom_components.openkarotz.api import (
+    OpenKarotzAPI,
+    OpenKarotzAPIError,
+    OpenKarotzConnectionError,
+)
+from custom_components.openkarotz.command_queue import CommandQueue
+from custom_components.openkarotz.resilience import CircuitBreaker, RetryPolicy
+from custom_components.openkarotz.session import create_session
+from tests.simulator import (
+    FAILURE_DISCONNECT,
+    KarotzFleet,
+    KarotzSimulator,
+    SimulatorProfile,
+)
+
+
+def _api(simulator: KarotzSimulator, **kwargs) -> OpenKarotzAPI:
+    """Create an API client pointed at a simulator."""
+    kwargs.setdefault("command_queue", CommandQueue(rate=0))
+    return OpenKarotzAPI(simulator.host, simulator.port, timeout=2, **kwargs)
+
+
+class TestOpenKarotzAPISimulator:
+    """Test cases exercising real HTTP against simulated rabbits."""
+
+    @pytest.mark.asyncio
+    async def test_status_and_led_round_trip(self):
+        """Test that reads and writes reach the device and back."""
+        async with KarotzSimulator() as simulator:
+            api = _api(simulator)
+            assert await api.async_connect()
+
+            info = await api.get_info()
+            assert info["wlan_mac"] == simulator.state.device_id
+
+            await api.set_led(rgb_value="FF0000", brightness=40)
+            leds = await api.get_leds()
+            assert leds["rgb_value"] == "FF0000"
+            assert leds["brightness"] == 40
+
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content_type", ["text/html", "application/json", "text/plain"])
+    async def test_content_type_quirks(self, content_type):
+        """Test that JSON is decoded whatever the device calls it."""
+        profile = SimulatorProfile(content_type=content_type)
+        async with KarotzSimulator(profile) as simulator:
+            api = _api(simulator)
+            await api.async_connect()
+
+            moods = await api.get_apps()
+            assert len(moods["moods"]) == 305
+
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_slow_chunked_body(self):
+        """Test that bodies trickling in small chunks decode correctly."""
+        profile = SimulatorProfile(slow_body=0.001, chunk_size=16)
+        async with KarotzSimulator(profile) as simulator:
+            api = _api(simulator)
+            await api.async_connect()
+
+            assert (await api.get_version())["version"] == "200"
+
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_reuses_connection(self):
+        """Test that consecutive polls reuse one pooled socket."""
+        async with KarotzSimulator() as simulator:
+            api = _api(simulator)
+            await api.async_connect()
+
+            for _ in range(5):
+                api.cache.clear()
+                await api.get_state()
+
+            assert simulator.requests["GET /cgi-bin/status"] == 6
+            assert len(simulator.connections) == 1
+
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_dropped_connections_are_retried(self):
+        """Test that GETs survive a flaky link while POSTs are not repeated."""
+        profile = SimulatorProfile(failure_rate=0.5, failure_mode=FAILURE_DISCONNECT, seed=3)
+        async with KarotzSimulator(profile) as simulator, create_session() as session:
+            api = _api(
+                simulator,
+                session=session,
+                retry_policy=RetryPolicy(attempts=10, base_delay=0, max_delay=0),
+                breaker=CircuitBreaker(failure_threshold=100),
+            )
+            api._is_connected = True
+
+            for _ in range(5):
+                api.cache.clear()
+                assert "wlan_mac" in await api.get_state()
+
+            posts = 0
+            for _ in range(5):
+                try:
+                    await api.set_led(brightness=10)
+                except OpenKarotzConnectionError:
+                    pass
+                posts += 1
+            assert simulator.requests["POST /cgi-bin/leds"] == posts
+
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_not_retried(self):
+        """Test that HTTP 500 surfaces as an API error."""
+        profile = SimulatorProfile(failure_rate=1.0)
+        async with KarotzSimulator(profile) as simulator, create_session() as session:
+            api = _api(simulator, session=session)
+            api._is_connected = True
+
+            with pytest.raises(OpenKarotzAPIError):
+                await api.get_leds()
+            assert simulator.requests["GET /cgi-bin/leds"] == 1
+
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_fleet_of_rabbits(self):
+        """Test that a fleet serves every device on its own port."""
+        async with KarotzFleet(20) as fleet:
+            apis = [_api(simulator) for simulator in fleet]
+            await asyncio.gather(*(api.async_connect() for api in apis))
+
+            infos = await asyncio.gather(*(api.get_info() for api in apis))
+
+            assert len({info["wlan_mac"] for info in infos}) == 20
+            assert fleet.total_requests == 20
+            await asyncio.gather(*(api.async_disconnect() for api in apis))
+
+    def test_fleet_seeds_each_rabbit_differently(self):
+        """Test that a seeded fleet is reproducible but not correlated."""
+        profile = SimulatorProfile(seed=7)
+        draws = [simulator._rng.random() for simulator in KarotzFleet(5, profile)]
+
+        assert len(set(draws)) == 5
+        assert draws == [simulator._rng.random() for simulator in KarotzFleet(5, profile)]
+        assert profile.seed == 7
@@ -0,0 +1,174 @@
+"""Tests for OpenKarotz bulk services."""
+
+import asyncio
+from types import MappingProxyType
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.openkarotz import services
+from custom_components.openkarotz.api import OpenKarotzAPI, OpenKarotzConnectionError
+from custom_components.openkarotz.const import DOMAIN
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.light import OpenKarotzLight
+from custom_components.openkarotz.sensor import OpenKarotzStateSensor
+
+
+class TestBulkServices:
+    """Test cases for fanning commands out to many devices."""
+
+    @pytest.fixture
+    def mock_hass(self):
+        """Create a mock Home Assistant instance with three devices."""
+        hass = MagicMock()
+        hass.data = {
+            DOMAIN: {
+                f"entry_{index}": {"api": AsyncMock(), "coordinator": MagicMock()}
+                for index in range(3)
+            }
+        }
+        return hass
+
+    @pytest.mark.asyncio
+    async def test_set_led_reports_per_device(self, mock_hass):
+        """Test that every device is commanded and failures are reported per device."""
+        mock_hass.data[DOMAIN]["entry_1"]["api"].set_led.side_effect = OpenKarotzConnectionError("down")
+
+        result = await services.handle_set_led_bulk(
+            mock_hass,
+            {"config_entry_ids": ["entry_0", "entry_1", "missing"], "color": "red"},
+        )
+
+        assert result["succeeded"] == 1
+        assert result["failed"] == 2
+        assert result["results"]["entry_0"]["success"]
+        assert result["results"]["entry_0"]["latency_ms"] >= 0
+        assert result["results"]["entry_1"]["error"] == "down"
+        assert result["results"]["missing"]["error"] == "Entry not found"
+        mock_hass.data[DOMAIN]["entry_0"]["api"].set_led.assert_awaited_once_with(
+            color="red", brightness=None, color_temperature=None, preset=None, rgb_value=None
+        )
+        mock_hass.data[DOMAIN]["entry_2"]["api"].set_led.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_slow_device_times_out(self, mock_hass):
+        """Test that a hanging device times out on its own without holding up the others."""
+
+        async def hang(**kwargs):
+            await asyncio.Event().wait()
+
+        mock_hass.data[DOMAIN]["entry_2"]["api"].play_tts.side_effect = hang
+
+        result = await services.handle_play_tts_bulk(
+            mock_hass,
+            {"config_entry_ids": list(mock_hass.data[DOMAIN]), "text": "Hello", "timeout": 0.1},
+        )
+
+        assert result["succeeded"] == 2
+        assert result["timed_out"] == 1
+        assert result["failed"] == 0
+        assert not result["results"]["entry_2"]["success"]
+        assert result["results"]["entry_2"]["timed_out"]
+        assert "still queued" in result["results"]["entry_2"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_parallelism_is_bounded(self, mock_hass):
+        """Test that no more than the configured number of devices are commanded at once."""
+        mock_hass.data[DOMAIN] = {
+            f"entry_{index}": {"api": AsyncMock()} for index in range(10)
+        }
+        running = 0
+        peak = 0
+
+        async def play_tts(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for entry in mock_hass.data[DOMAIN].values():
+            entry["api"].play_tts.side_effect = play_tts
+
+        with patch.object(services, "DEFAULT_BULK_CONCURRENCY", 4):
+            result = await services.handle_play_tts_bulk(
+                mock_hass, {"config_entry_ids": list(mock_hass.data[DOMAIN]), "text": "Hi"}
+            )
+
+        assert result["succeeded"] == 10
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_resolves_devices_and_areas(self, mock_hass):
+        """Test that devices and areas are resolved to their config entries once each."""
+        registry = MagicMock()
+        registry.async_get.side_effect = lambda device_id: {
+            "device_a": MagicMock(config_entries={"entry_0"}),
+            "device_b": MagicMock(config_entries={"entry_1"}),
+            "device_other": MagicMock(config_entries={"other_integration"}),
+        }.get(device_id)
+
+        with patch.object(services.dr, "async_get", return_value=registry), patch.object(
+            services.dr,
+            "async_entries_for_area",
+            return_value=[MagicMock(id="device_b"), MagicMock(id="device_other")],
+        ):
+            result = await services.handle_set_led_bulk(
+                mock_hass,
+                {"device_ids": ["device_a", "device_b"], "area_ids": ["kitchen"], "brightness": 20},
+            )
+
+        assert set(result["results"]) == {"entry_0", "entry_1"}
+        mock_hass.data[DOMAIN]["entry_1"]["api"].set_led.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_targets_devices_registered_by_entities(self, tmp_path):
+        """Test that devices and areas resolve through a real device registry."""
+        hass = HomeAssistant(str(tmp_path))
+        hass.config_entries = ConfigEntries(hass, {})
+        await dr.async_load(hass)
+        registry = dr.async_get(hass)
+        hass.data[DOMAIN] = {}
+
+        devices = []
+        for index in range(3):
+            entry = ConfigEntry(
+                domain=DOMAIN,
+                title=f"Rabbit {index}",
+                data={},
+                options={},
+                source=SOURCE_USER,
+                unique_id=None,
+                version=2,
+                minor_version=1,
+                discovery_keys=MappingProxyType({}),
+                subentries_data=(),
+                entry_id=f"entry_{index}",
+            )
+            hass.config_entries._entries[entry.entry_id] = entry
+            api = OpenKarotzAPI(f"192.168.1.{index + 10}", session=MagicMock())
+            api.set_led = AsyncMock()
+            # No refresh has run yet, as when the platforms are set up
+            coordinator = OpenKarotzCoordinator(MagicMock(), api, device_id=f"00:11:22:33:44:{index:02X}")
+            hass.data[DOMAIN][entry.entry_id] = {"api": api, "coordinator": coordinator}
+
+            # Register devices the way the entity platform does
+            for entity in (OpenKarotzLight(coordinator, {"id": 1}), OpenKarotzStateSensor(coordinator)):
+                device = registry.async_get_or_create(config_entry_id=entry.entry_id, **entity.device_info)
+            devices.append(device)
+        registry.async_update_device(devices[2].id, area_id="kitchen")
+
+        assert len(registry.devices) == 3
+        assert devices[0].identifiers == {(DOMAIN, "00:11:22:33:44:00")}
+
+        result = await services.handle_set_led_bulk(
+            hass, {"device_ids": [devices[0].id], "area_ids": ["kitchen"], "brightness": 20}
+        )
+
+        assert set(result["results"]) == {"entry_0", "entry_2"}
+        assert result["succeeded"] == 2
+        hass.data[DOMAIN]["entry_1"]["api"].set_led.assert_not_awaited()
@@ -0,0 +1,279 @@
+"""Tests for OpenKarotz snapshots and the camera entity."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from aiohttp import web
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.components.media_source import MediaSourceItem, Unresolvable
+
+from custom_components.openkarotz.api import OpenKarotzAPI, OpenKarotzConnectionError
+from custom_components.openkarotz.camera import OpenKarotzCamera
+from custom_components.openkarotz.command_queue import CommandQueue
+from custom_components.openkarotz.const import DOMAIN
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.media_source import OpenKarotzSnapshotSource, OpenKarotzSnapshotView
+from custom_components.openkarotz.snapshot import Frame, SnapshotFetcher
+from custom_components.openkarotz.snapshot_store import SnapshotArchive, SnapshotStore
+from tests.simulator import KarotzSimulator
+
+
+class TestSnapshotFetcher:
+    """Test cases for sharing snapshots between viewers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_viewers_share_one_capture(self):
+        """Test that viewers arriving during a capture wait for it."""
+
+        async def capture():
+            await asyncio.sleep(0.02)
+            return b"\xff\xd8frame\xff\xd9", "image/jpeg"
+
+        fetcher = SnapshotFetcher(AsyncMock(side_effect=capture), max_age=60)
+
+        frames = await asyncio.gather(*(fetcher.async_get() for _ in range(10)))
+
+        assert fetcher.captures == 1
+        assert fetcher.coalesced == 9
+        assert all(frame is frames[0] for frame in frames)
+
+    @pytest.mark.asyncio
+    async def test_frame_is_reused_until_max_age(self):
+        """Test that a fresh frame is served from memory and a stale one replaced."""
+        capture = AsyncMock(return_value=(b"jpeg", "image/jpeg"))
+        fetcher = SnapshotFetcher(capture, max_age=0.05)
+
+        first = await fetcher.async_get()
+        assert await fetcher.async_get() is first
+        await asyncio.sleep(0.06)
+        second = await fetcher.async_get()
+
+        assert second is not first
+        assert capture.await_count == 2
+        assert fetcher.served_from_cache == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_capture_is_retried_by_next_viewer(self):
+        """Test that a failure is reported and does not stick."""
+        capture = AsyncMock(side_effect=[OpenKarotzConnectionError("down"), (b"jpeg", "image/jpeg")])
+        fetcher = SnapshotFetcher(capture)
+
+        with pytest.raises(OpenKarotzConnectionError):
+            await fetcher.async_get()
+        frame = await fetcher.async_get()
+
+        assert frame.image == b"jpeg"
+        assert fetcher.failures == 1
+
+
+def _hass() -> MagicMock:
+    """Create a Home Assistant stand-in that runs executor jobs."""
+    hass = MagicMock()
+    hass.async_add_executor_job = lambda target, *args: asyncio.get_running_loop().run_in_executor(
+        None, target, *args
+    )
+    return hass
+
+
+class TestSnapshotStore:
+    """Test cases for the on-disk snapshot ring."""
+
+    def test_lookup_finds_frame_of_interval(self, tmp_path):
+        """Test that a timestamp finds the frame captured in its interval."""
+        store = SnapshotStore(str(tmp_path), slots=4, interval=10)
+        store.open()
+        store.add(b"first", "image/jpeg", 1003.0)
+        store.add(b"second", "image/png", 1012.5)
+
+        assert store.lookup(1009.9) == (b"first", "image/jpeg", 1003.0)
+        assert store.lookup(1010.0) == (b"second", "image/png", 1012.5)
+        assert store.lookup(1020.0) is None
+        store.close()
+
+    def test_first_frame_of_interval_is_kept(self, tmp_path):
+        """Test that frames of an interval already archived are not written."""
+        store = SnapshotStore(str(tmp_path), slots=4, interval=60)
+        store.open()
+        assert store.add(b"first", "image/jpeg", 1200.0) is not None
+        os.utime(store.path(0), (0, 0))
+        for second in range(1202, 1260, 2):
+            assert store.add(b"later", "image/jpeg", second) is None
+
+        assert store.lookup(1259.0) == (b"first", "image/jpeg", 1200.0)
+        assert store.describe(1230.0) == (1200.0, "image/jpeg")
+        assert os.path.getmtime(store.path(0)) == 0
+        assert store.stats["archived"] == 1
+        assert store.stats["skipped"] == 29
+        store.close()
+
+    def test_ring_evicts_oldest_interval(self, tmp_path):
+        """Test that the ring keeps a fixed number of slots on disk."""
+        store = SnapshotStore(str(tmp_path), slots=4, interval=10)
+        store.open()
+        for second in range(1000, 1060, 10):
+            store.add(b"x" * 100, "image/jpeg", second)
+
+        assert [captured_at for captured_at, _ in store.captures()] == [1020, 1030, 1040, 1050]
+        assert store.lookup(1000) is None
+        assert store.evicted == 2
+        assert store.stats["bytes"] == 400
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".img")]) == 4
+        store.close()
+
+    def test_reopen_keeps_frames_and_drops_torn_ones(self, tmp_path):
+        """Test that frames survive a restart unless their image is damaged."""
+        store = SnapshotStore(str(tmp_path), slots=4, interval=10)
+        store.open()
+        store.add(b"kept", "image/jpeg", 1000.0)
+        torn = store.add(b"torn", "image/jpeg", 1010.0)
+        store.close()
+        with open(store.path(torn), "wb") as image_file:
+            image_file.write(b"to")
+
+        reopened = SnapshotStore(str(tmp_path), slots=4, interval=10)
+        reopened.open()
+
+        assert reopened.lookup(1000.0) == (b"kept", "image/jpeg", 1000.0)
+        assert reopened.lookup(1010.0) is None
+        assert reopened.frames == 1
+        reopened.close()
+
+        resized = SnapshotStore(str(tmp_path), slots=8, interval=10)
+        resized.open()
+        assert resized.frames == 0
+        assert resized.lookup(1000.0) is None
+        resized.close()
+
+
+class TestSnapshotArchive:
+    """Test cases for archiving frames and clearing the device."""
+
+    @pytest.mark.asyncio
+    async def test_device_cleared_after_each_batch(self, tmp_path):
+        """Test that the device is cleared once a batch of frames is on disk."""
+        clear = AsyncMock(return_value={"return": "0"})
+        archive = SnapshotArchive(_hass(), SnapshotStore(str(tmp_path), interval=1), clear, clear_every=3)
+        await archive.async_open()
+
+        for index in range(7):
+            await archive.async_archive(Frame(b"jpeg%d" % index, "image/jpeg", time.monotonic() - 10 + index))
+
+        assert clear.await_count == 2
+        assert archive.stats["awaiting_clear"] == 1
+        assert archive.store.archived == 7
+        await archive.async_close()
+
+    @pytest.mark.asyncio
+    async def test_failed_clear_is_retried(self, tmp_path):
+        """Test that a failed clear is retried with the next archived frame."""
+        clear = AsyncMock(side_effect=[OpenKarotzConnectionError("down"), {"return": "0"}])
+        archive = SnapshotArchive(_hass(), SnapshotStore(str(tmp_path)), clear, clear_every=1)
+        await archive.async_open()
+
+        await archive.async_archive(Frame(b"jpeg", "image/jpeg", time.monotonic()))
+        assert archive.stats["awaiting_clear"] == 1
+        await archive.async_archive(Frame(b"jpeg", "image/jpeg", time.monotonic()))
+
+        assert clear.await_count == 2
+        assert archive.clears == 1
+        assert archive.stats["awaiting_clear"] == 0
+        await archive.async_close()
+
+
+class TestSnapshotMediaSource:
+    """Test cases for browsing and serving archived snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_browse_resolve_and_serve(self, tmp_path):
+        """Test that archived frames are listed newest first and served by time."""
+        hass = _hass()
+        archive = SnapshotArchive(hass, SnapshotStore(str(tmp_path), interval=60), AsyncMock())
+        await archive.async_open()
+        archive.store.add(b"first", "image/jpeg", 1200.0)
+        archive.store.add(b"second", "image/png", 1260.0)
+        archive.store.add(b"third", "image/jpeg", 1330.0)
+        hass.data = {DOMAIN: {"entry_1": {"snapshot_archive": archive}, "entry_2": {}}}
+        hass.config_entries.async_get_entry.return_value = MagicMock(title="Rabbit")
+        source = OpenKarotzSnapshotSource(hass)
+
+        root = await source.async_browse_media(MediaSourceItem(hass, DOMAIN, "", None))
+        assert [(child.identifier, child.title) for child in root.children] == [("entry_1", "Rabbit")]
+
+        folder = await source.async_browse_media(MediaSourceItem(hass, DOMAIN, "entry_1", None))
+        assert [child.identifier for child in folder.children] == [
+            "entry_1/1330.000",
+            "entry_1/1260.000",
+            "entry_1/1200.000",
+        ]
+
+        play = await source.async_resolve_media(MediaSourceItem(hass, DOMAIN, "entry_1/1260.000", None))
+        assert play.url == "/api/openkarotz/snapshot/entry_1/1260.000"
+        assert play.mime_type == "image/png"
+        with pytest.raises(Unresolvable):
+            await source.async_resolve_media(MediaSourceItem(hass, DOMAIN, "entry_1/9000", None))
+
+        view = OpenKarotzSnapshotView(hass)
+        response = await view.get(MagicMock(), "entry_1", "1290")
+        assert response.body == b"second"
+        assert response.content_type == "image/png"
+        with pytest.raises(web.HTTPNotFound):
+            await view.get(MagicMock(), "entry_1", "now")
+        for timestamp in ("inf", "-inf", "nan"):
+            with pytest.raises(Unresolvable):
+                await source.async_resolve_media(MediaSourceItem(hass, DOMAIN, f"entry_1/{timestamp}", None))
+            with pytest.raises(web.HTTPNotFound):
+                await view.get(MagicMock(), "entry_1", timestamp)
+
+        await archive.async_close()
+        assert await archive.async_lookup(1260.0) is None
+
+
+class TestOpenKarotzCamera:
+    """Test cases for the camera entity against the simulator."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_viewers_trigger_one_capture(self):
+        """Test that many viewers of the camera cause a single device capture."""
+        async with KarotzSimulator() as simulator:
+            api = OpenKarotzAPI(simulator.host, simulator.port, timeout=2, command_queue=CommandQueue(rate=0))
+            await api.async_connect()
+            camera = OpenKarotzCamera(OpenKarotzCoordinator(MagicMock(), api))
+
+            images = await asyncio.gather(*(camera.async_camera_image() for _ in range(20)))
+
+            assert simulator.state.snapshots == 1
+            assert images[0].startswith(b"\xff\xd8") and images[0].endswith(b"\xff\xd9")
+            assert all(image is images[0] for image in images)
+            assert camera.content_type == "image/jpeg"
+            assert api.metrics.get("/cgi-bin/take_snapshot").requests == 1
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_captures_are_archived_and_cleared_from_device(self, tmp_path):
+        """Test that captured frames are archived and then deleted on the device."""
+        async with KarotzSimulator() as simulator:
+            api = OpenKarotzAPI(simulator.host, simulator.port, timeout=2, command_queue=CommandQueue(rate=0))
+            await api.async_connect()
+            archive = SnapshotArchive(
+                _hass(), SnapshotStore(str(tmp_path), interval=0.01), api.clear_snapshots, clear_every=2
+            )
+            await archive.async_open()
+            fetcher = SnapshotFetcher(api.take_snapshot, max_age=0)
+            camera = OpenKarotzCamera(OpenKarotzCoordinator(MagicMock(), api), fetcher, archive)
+            archiving = []
+            fetcher.add_listener(lambda frame: archiving.append(asyncio.ensure_future(archive.async_archive(frame))))
+
+            images = []
+            for _ in range(2):
+                images.append(await camera.async_camera_image())
+                await asyncio.sleep(0.02)
+            await asyncio.gather(*archiving)
+
+            assert simulator.state.snapshots == 0
+            assert archive.store.frames == 2
+            assert [archive.store.lookup(t)[0] for t, _ in archive.store.captures()] == images
+            await archive.async_close()
+            await api.async_disconnect()
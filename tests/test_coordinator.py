@@ -0,0 +1,359 @@
+"""Tests for the OpenKarotz data coordinator."""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.openkarotz.api import OpenKarotzAPI, OpenKarotzConnectionError
+from custom_components.openkarotz.const import FAST_POLL_COUNT
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.light import OpenKarotzLight
+from custom_components.openkarotz.sensor import OpenKarotzStateSensor
+
+
+class TestAdaptivePolling:
+    """Test cases for the adaptive polling interval."""
+
+    @pytest.fixture
+    def api(self):
+        """Create an API client whose reads return an idle, awake rabbit."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_info = AsyncMock(return_value={"wlan_mac": "00:11", "sleep": "0", "state": "awake"})
+        api.get_leds = AsyncMock(return_value={"rgb_value": "FF0000"})
+        api.get_tts = AsyncMock(return_value={"status": "idle"})
+        api.get_apps = AsyncMock(return_value={"moods": []})
+        api.get_version = AsyncMock(return_value={"version": "200"})
+        return api
+
+    @pytest.fixture
+    def coordinator(self, api):
+        """Create a coordinator with a 30s base interval."""
+        return OpenKarotzCoordinator(MagicMock(), api, update_interval=30, min_interval=2, max_interval=240)
+
+    @pytest.mark.asyncio
+    async def test_backs_off_while_unchanged(self, coordinator):
+        """Test that unchanged state doubles the interval up to the maximum."""
+        intervals = []
+        for _ in range(6):
+            await coordinator._async_update_data()
+            intervals.append(coordinator.effective_interval)
+
+        assert intervals == [30, 60, 120, 240, 240, 240]
+
+    @pytest.mark.asyncio
+    async def test_change_restores_base_interval(self, coordinator, api):
+        """Test that a state change resets the backoff."""
+        for _ in range(3):
+            await coordinator._async_update_data()
+        assert coordinator.effective_interval == 120
+
+        api.get_leds.return_value = {"rgb_value": "00FF00"}
+        await coordinator._async_update_data()
+
+        assert coordinator.effective_interval == 30
+
+    @pytest.mark.asyncio
+    async def test_fast_polls_after_command(self, coordinator, api):
+        """Test that a command switches to fast polling for a few cycles."""
+        for _ in range(3):
+            await coordinator._async_update_data()
+
+        api._notify_command("/cgi-bin/leds")
+        assert coordinator.effective_interval == 2
+
+        for _ in range(FAST_POLL_COUNT):
+            await coordinator._async_update_data()
+            assert coordinator.effective_interval == 2
+
+        # Unchanged afterwards, so backoff starts again from the base interval
+        await coordinator._async_update_data()
+        assert coordinator.effective_interval == 60
+
+    @pytest.mark.asyncio
+    async def test_fast_polls_reach_device(self):
+        """Test that fast polls within the response cache TTL still read the device."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api._is_connected = True
+        device = {"/cgi-bin/status": {"wlan_mac": "00:11"}, "/cgi-bin/tts": {"status": "idle"}}
+
+        async def request(method, endpoint, *args):
+            return dict(device.get(endpoint, {}))
+
+        api._async_request_with_retries = AsyncMock(side_effect=request)
+        coordinator = OpenKarotzCoordinator(MagicMock(), api, update_interval=30, min_interval=2)
+        await coordinator._async_update_data()
+
+        api._notify_command("/cgi-bin/tts")
+        data = await coordinator._async_update_data()
+        assert data["tts"] == {"status": "idle"}
+
+        # The rabbit starts speaking a moment after accepting the text
+        device["/cgi-bin/tts"] = {"status": "playing"}
+        data = await coordinator._async_update_data()
+
+        assert data["tts"] == {"status": "playing"}
+        endpoints = [call.args[1] for call in api._async_request_with_retries.await_args_list]
+        assert endpoints.count("/cgi-bin/tts") == 3
+
+    @pytest.mark.asyncio
+    async def test_active_device_polled_quickly(self, coordinator, api):
+        """Test that speech keeps the interval at the minimum."""
+        api.get_tts.return_value = {"status": "playing"}
+
+        for _ in range(3):
+            await coordinator._async_update_data()
+            assert coordinator.effective_interval == 2
+
+    @pytest.mark.asyncio
+    async def test_sleeping_or_offline_backs_off(self, coordinator, api):
+        """Test that sleep and unreachable devices back off even when changing."""
+        api.get_info.return_value = {"wlan_mac": "00:11", "sleep": "1"}
+        await coordinator._async_update_data()
+        assert coordinator.effective_interval == 60
+
+        api.get_info.side_effect = OpenKarotzConnectionError("down")
+        api.get_tts.side_effect = OpenKarotzConnectionError("down")
+        await coordinator._async_update_data()
+        assert coordinator.effective_interval == 120
+
+    @pytest.mark.asyncio
+    async def test_successful_writes_notify_listeners(self, api):
+        """Test that commands, but not reads, reach command listeners."""
+        api._async_request_with_retries = AsyncMock(return_value={"status": "ok"})
+        api._is_connected = True
+        commands = []
+        remove = api.add_command_listener(commands.append)
+
+        await api.set_led(brightness=10)
+        await api.sleep()
+        await api.get_version()
+        remove()
+        await api.set_led(brightness=20)
+
+        assert commands == ["/cgi-bin/leds", "/cgi-bin/sleep"]
+
+
+class TestPollSources:
+    """Test cases for per-source polling schedules."""
+
+    @pytest.fixture
+    def api(self):
+        """Create an API client with mocked reads."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_info = AsyncMock(return_value={"wlan_mac": "00:11", "sleep": "0"})
+        api.get_leds = AsyncMock(return_value={"rgb_value": "FF0000"})
+        api.get_tts = AsyncMock(return_value={"status": "idle"})
+        api.get_apps = AsyncMock(return_value={"moods": [1, 2]})
+        api.get_version = AsyncMock(return_value={"version": "200"})
+        return api
+
+    @pytest.fixture
+    def coordinator(self, api):
+        """Create a coordinator."""
+        return OpenKarotzCoordinator(MagicMock(), api)
+
+    @pytest.mark.asyncio
+    async def test_cold_sources_fetched_rarely(self, coordinator, api):
+        """Test that moods and version are not refetched on every update."""
+        for _ in range(5):
+            data = await coordinator._async_update_data()
+
+        assert api.get_info.await_count == 5
+        assert api.get_leds.await_count == 5
+        assert api.get_apps.await_count == 1
+        assert api.get_version.await_count == 1
+        assert data["moods"] == {"moods": [1, 2]}
+        assert data["version"] == "200"
+
+    @pytest.mark.asyncio
+    async def test_cold_source_refreshed_when_due(self, coordinator, api):
+        """Test that a source is fetched again once its interval has passed."""
+        await coordinator._async_update_data()
+        coordinator.sources["moods"].fetched_at -= 3600
+
+        await coordinator._async_update_data()
+
+        assert api.get_apps.await_count == 2
+        assert api.get_version.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_source_keeps_last_value_until_stale(self, coordinator, api):
+        """Test the freshness budget of a failing source."""
+        await coordinator._async_update_data()
+        api.get_leds.side_effect = OpenKarotzConnectionError("down")
+
+        data = await coordinator._async_update_data()
+        assert data["leds"] == {"rgb_value": "FF0000"}
+        assert "leds" in data["error_message"]
+
+        coordinator.sources["leds"].fetched_at = time.monotonic() - 301
+        data = await coordinator._async_update_data()
+        assert data["leds"] == {}
+        assert coordinator.source_stats["leds"]["failures"] == 2
+
+
+class TestChangeDetection:
+    """Test cases for per-section change notifications."""
+
+    @pytest.fixture
+    def api(self):
+        """Create an API client with mocked reads."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_info = AsyncMock(return_value={"wlan_mac": "00:11", "state": "awake"})
+        api.get_leds = AsyncMock(return_value={"rgb_value": "FF0000"})
+        api.get_tts = AsyncMock(return_value={"status": "idle"})
+        api.get_apps = AsyncMock(return_value={"moods": []})
+        api.get_version = AsyncMock(return_value={"version": "200"})
+        return api
+
+    @pytest.fixture
+    def coordinator(self, api):
+        """Create a coordinator."""
+        return OpenKarotzCoordinator(MagicMock(), api)
+
+    async def _refresh(self, coordinator):
+        """Run one update the way the coordinator stores its result."""
+        coordinator.data = await coordinator._async_update_data()
+
+    @pytest.mark.asyncio
+    async def test_changed_sections(self, coordinator, api):
+        """Test that only differing sections are reported, ignoring the timestamp."""
+        await self._refresh(coordinator)
+        assert "leds" in coordinator.changed_sections
+
+        await self._refresh(coordinator)
+        assert coordinator.changed_sections == frozenset()
+
+        api.get_leds.return_value = {"rgb_value": "00FF00"}
+        await self._refresh(coordinator)
+        assert coordinator.changed_sections == {"leds"}
+
+    @pytest.mark.asyncio
+    async def test_entities_skip_unchanged_writes(self, coordinator, api):
+        """Test that entities write state only when their sections change."""
+        light = OpenKarotzLight(coordinator, {"id": 1, "name": "Main LED"})
+        sensor = OpenKarotzStateSensor(coordinator)
+        for entity in (light, sensor):
+            entity.async_write_ha_state = MagicMock()
+
+        for _ in range(3):
+            await self._refresh(coordinator)
+            light._handle_coordinator_update()
+            sensor._handle_coordinator_update()
+
+        api.get_leds.return_value = {"rgb_value": "00FF00"}
+        await self._refresh(coordinator)
+        light._handle_coordinator_update()
+        sensor._handle_coordinator_update()
+
+        assert light.async_write_ha_state.call_count == 2
+        assert sensor.async_write_ha_state.call_count == 1
+        assert coordinator.suppressed_writes == 5
+
+
+class TestOptimisticLeds:
+    """Test cases for optimistic LED state."""
+
+    @pytest.fixture
+    def api(self):
+        """Create a connected API client with mocked reads and writes."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api._is_connected = True
+        api.get_info = AsyncMock(return_value={"wlan_mac": "00:11"})
+        api.get_leds = AsyncMock(return_value={"enabled": True, "brightness": 100, "rgb_value": "FF0000"})
+        api.get_tts = AsyncMock(return_value={"status": "idle"})
+        api.get_apps = AsyncMock(return_value={"moods": []})
+        api.get_version = AsyncMock(return_value={"version": "200"})
+        api._async_request_with_retries = AsyncMock(return_value={"status": "ok"})
+        return api
+
+    @pytest.fixture
+    def light(self, api):
+        """Create a light listening to a coordinator."""
+        coordinator = OpenKarotzCoordinator(MagicMock(), api)
+        light = OpenKarotzLight(coordinator, {"id": 1, "name": "Main LED"})
+        light.async_write_ha_state = MagicMock()
+        coordinator.async_add_listener(light._handle_coordinator_update)
+        return light
+
+    @pytest.mark.asyncio
+    async def test_command_shown_before_next_poll(self, light, api):
+        """Test that the commanded state shows at once without a GET."""
+        light.coordinator.data = await light.coordinator._async_update_data()
+
+        await light.async_turn_on(brightness=40)
+
+        assert light.brightness == 40
+        assert light.coordinator.data["leds"]["brightness"] == 40
+        light.async_write_ha_state.assert_called_once()
+        assert api.get_leds.await_count == 1
+        assert light.coordinator.effective_interval == 30
+
+    @pytest.mark.asyncio
+    async def test_state_derived_once_per_update(self, light):
+        """Test that properties share one state object until the LEDs change."""
+        light.coordinator.data = await light.coordinator._async_update_data()
+        state = light.light_state
+
+        assert light.is_on and light.color == (255, 0, 0) and light.color_mode == "rgb"
+        assert light.light_state is state
+
+        await light.async_turn_on(brightness=40)
+
+        assert light.light_state is not state
+        assert light.brightness == 40 and state.brightness == 100
+        with pytest.raises(AttributeError):
+            state.brightness = 40
+
+    @pytest.mark.asyncio
+    async def test_reconciled_with_device_state(self, light, api):
+        """Test that a refresh after the command replaces the optimistic state."""
+        coordinator = light.coordinator
+        coordinator.data = await coordinator._async_update_data()
+
+        await light.async_turn_off()
+        assert not light.is_on
+
+        # A refresh that began before the command was confirmed is ignored
+        coordinator._optimistic_confirmed_at = time.monotonic() + 60
+        coordinator.data = await coordinator._async_update_data()
+        assert not light.is_on
+
+        coordinator._optimistic_confirmed_at = time.monotonic() - 1
+        api.get_leds.return_value = {"enabled": True, "brightness": 5, "rgb_value": "FF0000"}
+        coordinator.data = await coordinator._async_update_data()
+        assert light.is_on
+        assert light.brightness == 5
+
+    @pytest.mark.asyncio
+    async def test_kept_when_led_fetch_fails(self, light, api):
+        """Test that a refresh failing to read the LEDs keeps the optimistic state."""
+        coordinator = light.coordinator
+        coordinator.data = await coordinator._async_update_data()
+
+        await light.async_turn_on(brightness=40)
+        coordinator._optimistic_confirmed_at = time.monotonic() - 1
+
+        api.get_leds.side_effect = OpenKarotzConnectionError("down")
+        coordinator.data = await coordinator._async_update_data()
+        assert light.brightness == 40
+
+        api.get_leds.side_effect = None
+        api.get_leds.return_value = {"enabled": True, "brightness": 40, "rgb_value": "FF0000"}
+        coordinator.data = await coordinator._async_update_data()
+        assert light.brightness == 40
+        assert coordinator._optimistic_leds is None
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_on_failure(self, light, api):
+        """Test that a failed command restores the previous state."""
+        light.coordinator.data = await light.coordinator._async_update_data()
+        api._async_request_with_retries.side_effect = OpenKarotzConnectionError("down")
+
+        with pytest.raises(OpenKarotzConnectionError):
+            await light.async_turn_on(brightness=10)
+
+        assert light.brightness == 100
+        assert light.coordinator.data["leds"]["brightness"] == 100
+        assert light.async_write_ha_state.call_count == 2
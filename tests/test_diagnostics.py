@@ -0,0 +1,66 @@
+"""Tests for OpenKarotz diagnostics and the request errors sensor."""
+
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.openkarotz.api import OpenKarotzAPI
+from custom_components.openkarotz.const import DOMAIN
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.diagnostics import async_get_config_entry_diagnostics
+from custom_components.openkarotz.sensor import OpenKarotzRequestErrorsSensor
+
+
+@pytest.fixture
+def coordinator():
+    """Create a coordinator whose client has made a few requests."""
+    api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+    api.metrics.record("/cgi-bin/status", 0.01)
+    api.metrics.record("/cgi-bin/leds", 0.02, "timeout")
+    return OpenKarotzCoordinator(MagicMock(), api)
+
+
+class TestDiagnostics:
+    """Test cases for where request internals are reported."""
+
+    def test_sensor_shows_only_error_breakdown(self, coordinator):
+        """Test that the sensor's attributes do not move with every poll."""
+        sensor = OpenKarotzRequestErrorsSensor(coordinator)
+
+        assert sensor.native_value == 1
+        assert sensor.extra_state_attributes == {
+            "errors": {"/cgi-bin/leds": 1},
+            "circuit_state": "closed",
+            "circuit_trips": 0,
+        }
+
+        coordinator.api.metrics.record("/cgi-bin/status", 0.01)
+        assert sensor.extra_state_attributes["errors"] == {"/cgi-bin/leds": 1}
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_report_internals(self, coordinator):
+        """Test that the client internals are in the entry diagnostics."""
+        entry = MagicMock(entry_id="entry_1", data={"host": "192.168.1.201", "port": 80, "device_id": "00:11"})
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"entry_1": {"coordinator": coordinator}}}
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+        assert diagnostics["entry"] == {"host": "**REDACTED**", "port": 80, "device_id": "**REDACTED**"}
+        assert diagnostics["requests"]["/cgi-bin/leds"]["last_error"] == "timeout"
+        assert {"cache", "queue", "led_commands", "tts", "decoder", "sources"} <= diagnostics.keys()
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_redact_host_from_errors(self, coordinator):
+        """Test that error messages naming the device do not leak its address."""
+        error = "API request failed: ClientConnectorError(ConnectionKey(host='192.168.1.201', port=80))"
+        coordinator.api.metrics.record("/cgi-bin/tts", 0.01, error)
+        coordinator.sources["info"].record_failure("OpenKarotz at http://192.168.1.201:80 is unreachable")
+        entry = MagicMock(entry_id="entry_1", data={"host": "192.168.1.201", "port": 80})
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"entry_1": {"coordinator": coordinator}}}
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+        assert "192.168.1.201" not in repr(diagnostics)
+        assert diagnostics["requests"]["/cgi-bin/tts"]["last_error"].startswith("API request failed: ")
+        assert diagnostics["sources"]["info"]["last_error"] == "OpenKarotz at http://**REDACTED**:80 is unreachable"
@@ -0,0 +1,213 @@
+"""Tests for OpenKarotz LED transitions and effects."""
+
+import asyncio
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.openkarotz.api import OpenKarotzAPI, OpenKarotzConnectionError
+from custom_components.openkarotz.command_queue import CommandQueue
+from custom_components.openkarotz.const import EFFECT_COLOR_CYCLE, EFFECT_PULSE
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.effects import (
+    EffectPlayer,
+    FrameTable,
+    effect_frames,
+    fade_frames,
+)
+from custom_components.openkarotz.light import OpenKarotzLight
+
+
+class TestFrameTables:
+    """Test cases for precomputed frame tables."""
+
+    def test_fade_ends_on_target(self):
+        """Test that a fade is sampled at the frame rate and ends exactly on target."""
+        table = fade_frames("000000", 0, "FF8000", 80, 1.0)
+
+        assert len(table.frames) == 20
+        assert table.frames[9] == ("804000", 40)
+        assert table.frames[-1] == ("FF8000", 80)
+        assert not table.loop
+
+    def test_effects_loop(self):
+        """Test that named effects are looping tables that are reused."""
+        pulse = effect_frames(EFFECT_PULSE, "FF0000", 100)
+        cycle = effect_frames(EFFECT_COLOR_CYCLE, "FF0000", 60)
+
+        assert pulse.loop and cycle.loop
+        assert max(brightness for _, brightness in pulse.frames) == 100
+        assert len({rgb for rgb, _ in cycle.frames}) > 100
+        assert effect_frames(EFFECT_PULSE, "FF0000", 100) is pulse
+        with pytest.raises(ValueError):
+            effect_frames("sparkle", "FF0000", 100)
+
+    @pytest.mark.parametrize("rgb", ["FF00", "GG0000", "+F0000", "FF00001"])
+    def test_malformed_color_rejected_up_front(self, rgb):
+        """Test that a malformed color fails when the table is built, not while playing."""
+        with pytest.raises(ServiceValidationError):
+            fade_frames("000000", 0, rgb, 80, 1.0)
+        with pytest.raises(ServiceValidationError):
+            effect_frames(EFFECT_PULSE, rgb, 100)
+
+
+class TestEffectPlayer:
+    """Test cases for playing frames against a device."""
+
+    @pytest.fixture
+    def api(self):
+        """Create an API client whose LED writes take 30ms."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock(), command_queue=CommandQueue(rate=0))
+
+        async def set_led(*args, **data):
+            await asyncio.sleep(0.03)
+            return {"status": "ok"}
+
+        api.set_led = AsyncMock(side_effect=set_led)
+        api.send_led_frame = AsyncMock(side_effect=set_led)
+        return api
+
+    @pytest.mark.asyncio
+    async def test_slow_device_drops_frames(self, api):
+        """Test that frames are dropped rather than queued, and the last one is sent."""
+        frames = [("FFFFFF", brightness) for brightness in range(1, 21)]
+        player = EffectPlayer(api, min_frame_interval=0)
+
+        await player.async_play(FrameTable(frames, step=0.01))
+        await player._task
+
+        assert 3 <= player.frames_sent < 20
+        assert player.frames_sent + player.frames_dropped == 20
+        assert api.send_led_frame.await_count == player.frames_sent - 1
+        api.set_led.assert_awaited_once_with(rgb_value="FFFFFF", brightness=20)
+
+    @pytest.mark.asyncio
+    async def test_repeated_frames_are_not_resent(self, api):
+        """Test that frames equal to the one before cost no request."""
+        frames = [("FF0000", 50)] * 5 + [("FF0000", 0)] * 5
+        player = EffectPlayer(api, min_frame_interval=0)
+
+        await player.async_play(FrameTable(frames, step=0.01))
+        await player._task
+
+        sent = [call.args for call in api.send_led_frame.await_args_list]
+        assert sent[0] == ("FF0000", 50)
+        assert all(previous != frame for previous, frame in zip(sent, sent[1:]))
+        assert player.frames_repeated >= 1
+        api.set_led.assert_awaited_once_with(rgb_value="FF0000", brightness=0)
+
+    def test_frame_interval_follows_latency(self, api):
+        """Test that the frame budget grows with measured LED latency."""
+        player = EffectPlayer(api, min_frame_interval=0.05)
+        assert player.frame_interval == 0.05
+
+        for _ in range(20):
+            api.metrics.record("/cgi-bin/leds", 0.2)
+
+        assert 0.15 < player.frame_interval <= 0.2
+
+    def test_frame_interval_leaves_request_rate_to_polls(self):
+        """Test that effects use at most part of the device's request rate."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock(), command_queue=CommandQueue(rate=5))
+
+        assert EffectPlayer(api, min_frame_interval=0.05).frame_interval == pytest.approx(0.4)
+
+    @pytest.mark.asyncio
+    async def test_frames_are_background_requests_without_fast_polling(self):
+        """Test that effect frames neither overtake polls nor trigger fast polling."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock(), command_queue=CommandQueue(rate=0))
+        api._is_connected = True
+        api._async_fetch = AsyncMock(return_value={"status": "ok"})
+        coordinator = OpenKarotzCoordinator(MagicMock(), api)
+        coordinator._async_on_command = MagicMock()
+        api._command_listeners = [coordinator._async_on_command]
+
+        await api.send_led_frame("FF0000", 50)
+
+        api._async_fetch.assert_awaited_once()
+        assert "avg_wait_ms_background" in api.command_queue.stats
+        assert "avg_wait_ms_interactive" not in api.command_queue.stats
+        coordinator._async_on_command.assert_not_called()
+
+        await api.set_led(brightness=30)
+        coordinator._async_on_command.assert_called_once_with("/cgi-bin/leds")
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_playback(self, api):
+        """Test that a rejected frame stops the effect and reports it."""
+        api.send_led_frame.side_effect = OpenKarotzConnectionError("down")
+        on_error = MagicMock()
+        player = EffectPlayer(api)
+
+        await player.async_play(effect_frames(EFFECT_PULSE, "FF0000", 100), on_error=on_error)
+        await player._task
+
+        on_error.assert_called_once()
+        assert not player.is_playing
+
+
+class TestLightEffects:
+    """Test cases for effects and transitions on the light entity."""
+
+    @pytest.fixture
+    def light(self):
+        """Create a light on a coordinator holding LED state."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock(), command_queue=CommandQueue(rate=0))
+        api.set_led = AsyncMock(return_value={"status": "ok"})
+        api.send_led_frame = AsyncMock(return_value={"status": "ok"})
+        coordinator = OpenKarotzCoordinator(MagicMock(), api)
+        coordinator._led_state = {"enabled": True, "brightness": 100, "rgb_value": "FF0000"}
+        light = OpenKarotzLight(coordinator, {"id": 1, "name": "Main LED"})
+        light._player.min_frame_interval = 0
+        return light
+
+    @pytest.mark.asyncio
+    async def test_transition_shows_target_and_fades(self, light):
+        """Test that a transition shows the target at once and plays a fade."""
+        await light.async_turn_off(transition=0.1)
+
+        assert not light.is_on
+        await light._player._task
+        light.coordinator.api.set_led.assert_awaited_once_with(rgb_value="FF0000", brightness=0)
+        assert light.coordinator.api.send_led_frame.await_count >= 1
+
+    @pytest.mark.asyncio
+    async def test_effect_runs_until_next_command(self, light):
+        """Test that an effect loops until another command replaces it."""
+        await light.async_turn_on(effect=EFFECT_PULSE)
+        await asyncio.sleep(0.05)
+
+        assert light.effect == EFFECT_PULSE
+        assert light._player.is_playing
+
+        await light.async_turn_on(brightness=30)
+
+        assert light.effect is None
+        assert not light._player.is_playing
+        light.coordinator.api.set_led.assert_awaited_with(brightness=30)
+
+    @pytest.mark.asyncio
+    async def test_failed_effect_is_cleared(self, light):
+        """Test that an effect the device rejects no longer shows as running."""
+        light.coordinator.api.send_led_frame.side_effect = OpenKarotzConnectionError("down")
+        light.async_write_ha_state = MagicMock()
+
+        await light.async_turn_on(effect=EFFECT_PULSE)
+        await light._player._task
+
+        assert light.effect is None
+        light.async_write_ha_state.assert_called()
+
+    @pytest.mark.asyncio
+    async def test_malformed_colors(self, light):
+        """Test that a bad device color falls back to white and a bad target is refused."""
+        light.coordinator._led_state = {"enabled": True, "brightness": 100, "rgb_value": "red"}
+
+        await light.async_turn_on(effect=EFFECT_PULSE)
+        await asyncio.sleep(0.01)
+        assert light.coordinator.api.send_led_frame.await_args.args[0] == "FFFFFF"
+
+        with pytest.raises(ServiceValidationError):
+            await light.async_turn_on(rgb=(300, 0, 0), transition=1)
+        assert not light._player.is_playing
@@ -0,0 +1,181 @@
+"""Tests for the OpenKarotz push event channel."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.openkarotz.api import OpenKarotzAPI, OpenKarotzConnectionError
+from custom_components.openkarotz.command_queue import CommandQueue
+from custom_components.openkarotz.const import EVENT_OPENKAROTZ
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.events import OpenKarotzEventListener
+from custom_components.openkarotz.resilience import RetryPolicy
+from tests.simulator import KarotzSimulator, SimulatorProfile
+
+
+def _hass() -> MagicMock:
+    """Create a Home Assistant stand-in that runs background tasks."""
+    hass = MagicMock()
+    hass.async_create_background_task = lambda coro, name: asyncio.get_running_loop().create_task(coro)
+    return hass
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    """Wait until a condition holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+class TestOpenKarotzEventListener:
+    """Test cases for delivering device events to the coordinator."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_coordinator(self):
+        """Test that a button press is merged and fired without waiting for a poll."""
+        async with KarotzSimulator() as simulator:
+            hass = _hass()
+            api = OpenKarotzAPI(simulator.host, simulator.port, timeout=2, command_queue=CommandQueue(rate=0))
+            await api.async_connect()
+            coordinator = OpenKarotzCoordinator(hass, api, device_id="rabbit_1")
+            coordinator.data = await coordinator._async_update_data()
+            listener = OpenKarotzEventListener(hass, api, coordinator, wait=5, min_interval=0)
+
+            listener.async_start()
+            await _wait_for(lambda: listener.connected)
+            simulator.push_event("button", action="double", status={"sleep": "1", "state": "sleeping"})
+            await _wait_for(lambda: "button" in coordinator.data["events"])
+
+            assert coordinator.data["events"]["button"]["action"] == "double"
+            assert coordinator.data["info"]["sleep"] == "1"
+            assert coordinator.changed_sections == {"events", "info", "state"}
+            event_type, payload = hass.bus.async_fire.call_args.args
+            assert event_type == EVENT_OPENKAROTZ
+            assert payload["device_id"] == "rabbit_1"
+            assert listener.stats["events_received"] == 1
+
+            await listener.async_stop()
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_without_endpoint(self):
+        """Test that firmware without events stops the listener for good."""
+        async with KarotzSimulator(SimulatorProfile(events=False)) as simulator:
+            api = OpenKarotzAPI(simulator.host, simulator.port, timeout=2, command_queue=CommandQueue(rate=0))
+            await api.async_connect()
+            listener = OpenKarotzEventListener(_hass(), api, MagicMock())
+
+            listener.async_start()
+            await _wait_for(lambda: listener.supported is False)
+
+            assert simulator.requests["GET /cgi-bin/events"] == 1
+            await listener.async_stop()
+            await api.async_disconnect()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_and_resumes_from_cursor(self):
+        """Test that a dropped channel reconnects and keeps the cursor."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        responses = [
+            {"cursor": 7, "events": []},
+            OpenKarotzConnectionError("reset"),
+            OpenKarotzConnectionError("reset"),
+            {"cursor": 8, "events": [{"id": 8, "type": "rfid", "tag": "d0021a05"}]},
+        ]
+
+        async def get_events(*args):
+            if not responses:
+                await asyncio.Event().wait()
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        api.get_events = AsyncMock(side_effect=get_events)
+        coordinator = MagicMock()
+        listener = OpenKarotzEventListener(
+            _hass(), api, coordinator, reconnect_policy=RetryPolicy(base_delay=0, max_delay=0), min_interval=0
+        )
+
+        listener.async_start()
+        await _wait_for(lambda: coordinator.async_handle_events.called)
+
+        assert listener.reconnects == 2
+        assert api.get_events.await_args_list[1].args[0] == 7
+        assert api.get_events.await_args_list[3].args[0] == 7
+        coordinator.async_handle_events.assert_called_once_with([{"id": 8, "type": "rfid", "tag": "d0021a05"}])
+        await listener.async_stop()
+
+    @pytest.mark.asyncio
+    async def test_survives_malformed_response_and_failing_handler(self):
+        """Test that unexpected errors back off instead of ending the channel."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        responses = [
+            {"cursor": 1, "events": []},
+            ["not", "an", "object"],
+            {"cursor": 2, "events": [{"id": 2, "type": "button"}]},
+            {"cursor": 3, "events": [{"id": 3, "type": "ears"}]},
+        ]
+
+        async def get_events(*args):
+            if not responses:
+                await asyncio.Event().wait()
+            return responses.pop(0)
+
+        api.get_events = AsyncMock(side_effect=get_events)
+        coordinator = MagicMock()
+        coordinator.async_handle_events.side_effect = [ValueError("bad event"), None]
+        listener = OpenKarotzEventListener(
+            _hass(), api, coordinator, reconnect_policy=RetryPolicy(base_delay=0, max_delay=0), min_interval=0
+        )
+
+        listener.async_start()
+        await _wait_for(lambda: coordinator.async_handle_events.call_count == 2)
+
+        assert listener.reconnects == 1
+        assert listener.connected
+        assert api.get_events.await_args_list[3].args[0] == 2
+        await listener.async_stop()
+
+    @pytest.mark.asyncio
+    async def test_early_answers_are_paced(self):
+        """Test that a device ignoring the wait is not polled in a busy loop."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_events = AsyncMock(return_value={"cursor": 1, "events": []})
+        listener = OpenKarotzEventListener(_hass(), api, MagicMock(), min_interval=0.1)
+
+        listener.async_start()
+        await asyncio.sleep(0.35)
+        await listener.async_stop()
+
+        assert 2 <= api.get_events.await_count <= 4
+        assert listener.reconnects == 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_without_cursor(self):
+        """Test that a device reporting no cursor stops the listener for good."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_events = AsyncMock(return_value={"events": []})
+        listener = OpenKarotzEventListener(_hass(), api, MagicMock(), min_interval=0)
+
+        listener.async_start()
+        await _wait_for(lambda: listener.supported is False)
+
+        assert api.get_events.await_count == 1
+        assert not listener.connected
+        await listener.async_stop()
+
+    @pytest.mark.asyncio
+    async def test_long_polls_use_event_session(self):
+        """Test that long polls stay out of the regular connection pool."""
+        session, events = MagicMock(), MagicMock()
+        api = OpenKarotzAPI("192.168.1.201", session=session, event_session=events)
+        api._is_connected = True
+        api._async_exchange = AsyncMock(return_value=b'{"cursor": 1, "events": []}')
+
+        assert await api.get_events(wait=5) == {"cursor": 1, "events": []}
+        assert api._async_exchange.await_args.args[-1] is events
+
+        await api.get_info()
+        assert api._async_exchange.await_args.args[-1] is None
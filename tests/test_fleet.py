@@ -0,0 +1,108 @@
+"""Tests for the OpenKarotz fleet scheduler."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.openkarotz.api import OpenKarotzAPI
+from custom_components.openkarotz.command_queue import CommandQueue
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.fleet import FleetScheduler
+
+
+class TestFleetScheduler:
+    """Test cases for staggering and bounding fleet polls."""
+
+    def test_slots_spread_evenly(self):
+        """Test that devices get evenly spaced phases that rebalance."""
+        fleet = FleetScheduler(interval=30)
+        for key in ("a", "b", "c"):
+            fleet.register(key)
+
+        assert [fleet.phase(key) for key in ("a", "b", "c")] == [0, 10, 20]
+
+        fleet.unregister("b")
+        assert fleet.phase("c") == 15
+        assert len(fleet) == 2
+
+    def test_align_lands_on_slot(self):
+        """Test that regular polls move onto the device's slot."""
+        fleet = FleetScheduler(interval=30)
+        for key in ("a", "b", "c"):
+            fleet.register(key)
+
+        now = 1000.0
+        for key in ("a", "b", "c"):
+            delay = fleet.align(key, 30, now=now)
+            assert 15 <= delay < 45
+            assert (now + delay) % 30 == pytest.approx(fleet.phase(key))
+
+        # Backed-off polls stay on the slot, fast polls are left alone
+        assert (now + fleet.align("b", 120, now=now)) % 30 == pytest.approx(10)
+        assert fleet.align("b", 2, now=now) == 2
+
+    def test_cycle_latency(self):
+        """Test that refreshes are summarized per interval-long cycle."""
+        fleet = FleetScheduler(interval=30)
+        for index, duration in enumerate((0.1, 0.2, 0.3, 0.4)):
+            fleet.record_refresh(duration, failed=index == 3, now=1.0 + index)
+        assert fleet.last_cycle is None
+
+        fleet.record_refresh(0.1, now=31.0)
+
+        assert fleet.cycles == 1
+        assert fleet.last_cycle["refreshes"] == 4
+        assert fleet.last_cycle["failures"] == 1
+        assert fleet.last_cycle["max_ms"] == 400.0
+
+    @pytest.mark.asyncio
+    async def test_limiter_bounds_fleet_concurrency(self):
+        """Test that the shared limiter caps requests across devices."""
+        fleet = FleetScheduler(max_concurrency=3)
+        in_flight = 0
+        peak = 0
+
+        async def fetch(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        apis = []
+        for index in range(10):
+            api = OpenKarotzAPI(
+                f"192.168.1.{index}",
+                session=MagicMock(),
+                command_queue=CommandQueue(rate=0),
+                limiter=fleet.limiter,
+            )
+            api._async_fetch = fetch
+            api._is_connected = True
+            apis.append(api)
+
+        await asyncio.gather(*(api.get_leds() for api in apis))
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_coordinator_reports_to_fleet(self):
+        """Test that coordinators take a slot and record their refreshes."""
+        fleet = FleetScheduler(interval=30)
+        coordinators = []
+        for index in range(3):
+            api = OpenKarotzAPI(f"192.168.1.{index}", session=MagicMock())
+            for name in ("get_info", "get_leds", "get_tts", "get_apps", "get_version"):
+                setattr(api, name, AsyncMock(return_value={}))
+            coordinators.append(OpenKarotzCoordinator(MagicMock(), api, fleet=fleet))
+
+        for coordinator in coordinators:
+            await coordinator._async_update_data()
+            assert coordinator.effective_interval == 30
+
+        assert len(fleet._cycle_durations) == 3
+
+        await coordinators[0].async_shutdown()
+        assert len(fleet) == 2
@@ -0,0 +1,99 @@
+"""Tests for OpenKarotz device identity and entity unique IDs."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.openkarotz import identity
+from custom_components.openkarotz.api import OpenKarotzAPI, OpenKarotzConnectionError
+from custom_components.openkarotz.camera import OpenKarotzCamera
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.identity import async_resolve_device_id, device_id_from_info
+from custom_components.openkarotz.light import OpenKarotzLight
+from custom_components.openkarotz.sensor import OpenKarotzLatencySensor, OpenKarotzStateSensor
+from custom_components.openkarotz.switch import OpenKarotzMainSwitch
+
+
+def _entry(data: dict) -> MagicMock:
+    """Create a config entry stand-in with the given data."""
+    entry = MagicMock()
+    entry.entry_id = "entry_1"
+    entry.data = data
+    return entry
+
+
+class TestDeviceIdentity:
+    """Test cases for resolving and storing the device ID."""
+
+    def test_id_preferred_over_mac_and_serial(self):
+        """Test the order in which device info keys identify a rabbit."""
+        assert device_id_from_info({"id": "abc", "wlan_mac": "00:11", "serial": "S1"}) == "abc"
+        assert device_id_from_info({"wlan_mac": "00:11", "serial": "S1"}) == "00:11"
+        assert device_id_from_info({"id": "", "serial": "S1"}) == "S1"
+        assert device_id_from_info({"name": "rabbit"}) is None
+
+    @pytest.mark.asyncio
+    async def test_stored_id_used_without_asking_device(self):
+        """Test that a stored ID is returned even while the device is down."""
+        hass = MagicMock()
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_info = AsyncMock(side_effect=OpenKarotzConnectionError("down"))
+
+        assert await async_resolve_device_id(hass, _entry({"host": "h", "device_id": "00:11"}), api) == "00:11"
+        api.get_info.assert_not_awaited()
+        hass.config_entries.async_update_entry.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_id_resolved_once_and_stored(self):
+        """Test that the first setup stores the ID and migrates unknown IDs."""
+        hass = MagicMock()
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_info = AsyncMock(return_value={"wlan_mac": "00:11"})
+        entry = _entry({"host": "h"})
+
+        registry = MagicMock()
+        registry.async_get_entity_id.side_effect = lambda domain, platform, unique_id: (
+            "light.main_led" if unique_id == "00:11_led_1" else None
+        )
+        with patch.object(identity.er, "async_get", return_value=registry), patch.object(
+            identity.er, "async_migrate_entries", AsyncMock()
+        ) as migrate:
+            assert await async_resolve_device_id(hass, entry, api) == "00:11"
+
+        hass.config_entries.async_update_entry.assert_called_once_with(
+            entry, data={"host": "h", "device_id": "00:11"}
+        )
+        migrate_entity = migrate.await_args.args[2]
+        assert migrate_entity(MagicMock(domain="sensor", unique_id="unknown_state")) == {
+            "new_unique_id": "00:11_state"
+        }
+        assert migrate_entity(MagicMock(domain="light", unique_id="unknown_led_1")) is None
+        assert migrate_entity(MagicMock(domain="sensor", unique_id="00:11_uptime")) is None
+
+    @pytest.mark.asyncio
+    async def test_entry_id_used_when_device_reports_none(self):
+        """Test that a rabbit without an ID is identified by its entry."""
+        hass = MagicMock()
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.get_info = AsyncMock(return_value={"name": "rabbit"})
+
+        with patch.object(identity.er, "async_get"), patch.object(identity.er, "async_migrate_entries", AsyncMock()):
+            assert await async_resolve_device_id(hass, _entry({}), api) == "entry_1"
+
+
+class TestUniqueIds:
+    """Test cases for unique IDs fixed at entity creation."""
+
+    def test_unique_ids_do_not_wait_for_data(self):
+        """Test that entities use the stored ID before the first refresh."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        coordinator = OpenKarotzCoordinator(MagicMock(), api, device_id="00:11")
+        assert coordinator.data is None
+
+        assert OpenKarotzStateSensor(coordinator).unique_id == "00:11_state"
+        assert OpenKarotzLatencySensor(coordinator, "leds", "/cgi-bin/leds").unique_id == "00:11_leds_latency"
+        assert OpenKarotzMainSwitch(coordinator).unique_id == "00:11_enable_switch"
+        assert OpenKarotzCamera(coordinator).unique_id == "00:11_camera"
+        assert OpenKarotzLight(coordinator, {"id": 1}).unique_id == "00:11_led_1"
+
+        coordinator.data = {"info": {"id": "other"}}
+        assert OpenKarotzStateSensor(coordinator).unique_id == "00:11_state"
@@ -17,6 +17,7 @@ async def test_light_entity_turn_on():
 
     # Create mock coordinator
     coordinator = MagicMock(spec=OpenKarotzCoordinator)
+    coordinator.device_id = "test_device_123"
     coordinator.api = AsyncMock()
     coordinator.api.set_led = AsyncMock(return_value={"status": "ok"})
 
@@ -71,6 +72,7 @@ async def test_light_entity_turn_off():
 
     # Create mock coordinator
     coordinator = MagicMock(spec=OpenKarotzCoordinator)
+    coordinator.device_id = "test_device_123"
     coordinator.api = AsyncMock()
     coordinator.api.set_led = AsyncMock(return_value={"status": "ok"})
 
@@ -98,6 +100,7 @@ async def test_light_entity_color_change():
 
     # Create mock coordinator
     coordinator = MagicMock(spec=OpenKarotzCoordinator)
+    coordinator.device_id = "test_device_123"
     coordinator.api = AsyncMock()
     coordinator.api.set_led = AsyncMock(return_value={"status": "ok"})
 
@@ -141,6 +144,7 @@ async def test_light_entity_properties():
 
     # Create mock coordinator
     coordinator = MagicMock(spec=OpenKarotzCoordinator)
+    coordinator.device_id = "test_device_123"
     coordinator.api = AsyncMock()
     coordinator.api.set_led = AsyncMock(return_value={"status": "ok"})
 
@@ -190,6 +194,7 @@ async def test_light_entity_with_color_temperature():
 
     # Create mock coordinator
     coordinator = MagicMock(spec=OpenKarotzCoordinator)
+    coordinator.device_id = "test_device_123"
     coordinator.api = AsyncMock()
     coordinator.api.set_led = AsyncMock(return_value={"status": "ok"})
 
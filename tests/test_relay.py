@@ -0,0 +1,247 @@
+"""Tests for the OpenKarotz media relay and media player."""
+
+import asyncio
+import contextlib
+import os
+from typing import Optional
+
+import aiohttp
+import pytest
+from aiohttp import web
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.openkarotz import media_player, relay as relay_module
+from custom_components.openkarotz.api import OpenKarotzAPI
+from custom_components.openkarotz.coordinator import OpenKarotzCoordinator
+from custom_components.openkarotz.relay import MediaCache, MediaRelay
+
+CLIP = bytes(range(256)) * 1024
+
+
+def _hass() -> MagicMock:
+    """Create a Home Assistant stand-in that runs executor jobs."""
+    hass = MagicMock()
+    hass.async_add_executor_job = lambda target, *args: asyncio.get_running_loop().run_in_executor(
+        None, target, *args
+    )
+    return hass
+
+
+async def _serve(app: web.Application) -> web.AppRunner:
+    """Start an application on a free localhost port."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def _url(runner: web.AppRunner) -> str:
+    """Return the base URL of a started application."""
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+
+class TestMediaCache:
+    """Test cases for the on-disk clip cache."""
+
+    def test_least_recently_played_is_evicted(self, tmp_path):
+        """Test that the cache stays within budget, evicting the oldest clip."""
+        cache = MediaCache(str(tmp_path), max_bytes=250, max_clip_bytes=100)
+        for key in ("a", "b", "c"):
+            handle = cache.open_writer(key)
+            handle.write(b"x" * 100)
+            cache.remove(cache.add(key, cache.finish(key, handle)))
+            if key == "b":
+                assert cache.lookup("a")
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") and cache.lookup("c")
+        assert cache.total_bytes == 200
+        assert sorted(os.listdir(tmp_path)) == ["a.clip", "c.clip"]
+
+    def test_reload_drops_partial_clips(self, tmp_path):
+        """Test that clips survive a restart and interrupted downloads do not."""
+        cache = MediaCache(str(tmp_path))
+        handle = cache.open_writer("a")
+        handle.write(b"done")
+        cache.add("a", cache.finish("a", handle))
+        cache.open_writer("b").write(b"partial")
+
+        reloaded = MediaCache(str(tmp_path))
+        assert reloaded.load(reloaded.scan()) == []
+
+        assert reloaded.lookup("a") == cache.path("a")
+        assert reloaded.total_bytes == 4
+        assert os.listdir(tmp_path) == ["a.clip"]
+
+
+@contextlib.asynccontextmanager
+async def _relay_and_source(directory: str, hold: Optional[asyncio.Event] = None):
+    """Serve a clip and a relay to it as Home Assistant would.
+
+    Yields the relay, a client session, the clip's source URL and the list
+    of requests the source received. The source answers only once ``hold``
+    is set, if given.
+    """
+    fetches = []
+
+    async def handle_clip(request):
+        fetches.append(request.path_qs)
+        if hold is not None:
+            await hold.wait()
+        return web.Response(body=CLIP, content_type="audio/mpeg")
+
+    source_app = web.Application()
+    source_app.router.add_get("/doorbell.mp3", handle_clip)
+    source = await _serve(source_app)
+
+    async with aiohttp.ClientSession() as session:
+        relay = MediaRelay(_hass(), MediaCache(directory), session=session, chunk_size=4096)
+        relay_app = web.Application()
+        relay_app.router.add_get(
+            "/api/openkarotz/relay/{token}",
+            lambda request: relay.async_serve(request, request.match_info["token"]),
+        )
+        relay_runner = await _serve(relay_app)
+        try:
+            with patch.object(relay_module, "get_url", return_value=_url(relay_runner)):
+                yield relay, session, _url(source) + "/doorbell.mp3", fetches
+        finally:
+            await relay_runner.cleanup()
+            await source.cleanup()
+
+
+class TestMediaRelay:
+    """Test cases for relaying clips to the rabbit."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_clip_is_served_from_cache(self, tmp_path):
+        """Test that the second play of a clip does not reach the source."""
+        async with _relay_and_source(str(tmp_path)) as (relay, session, source_url, fetches):
+            url = relay.url_for(source_url)
+
+            assert url != source_url and relay.url_for(source_url) == url
+            for _ in range(2):
+                async with session.get(url) as response:
+                    assert response.headers["Content-Type"] == "audio/mpeg"
+                    assert await response.read() == CLIP
+
+        assert len(fetches) == 1
+        assert relay.served_from_cache == 1
+        assert relay.cache.stats["bytes"] == len(CLIP)
+
+    @pytest.mark.asyncio
+    async def test_clip_signed_afresh_is_served_from_cache(self, tmp_path):
+        """Test that a new URL signature neither misses the cache nor goes unused."""
+        async with _relay_and_source(str(tmp_path)) as (relay, session, source_url, fetches):
+            first = relay.url_for(source_url + "?authSig=first")
+            async with session.get(first) as response:
+                assert await response.read() == CLIP
+
+            second = relay.url_for(source_url + "?authSig=second")
+            assert second == first
+            async with session.get(second) as response:
+                assert await response.read() == CLIP
+
+            third = relay.url_for(source_url + "?authSig=third", "media-source://media_source/local/doorbell.mp3")
+            async with session.get(third) as response:
+                assert await response.read() == CLIP
+
+        assert fetches == ["/doorbell.mp3?authSig=first", "/doorbell.mp3?authSig=third"]
+        assert relay.served_from_cache == 1
+        assert relay.cache.stats["clips"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_plays_download_once(self, tmp_path):
+        """Test that rabbits playing the same clip at once share one download."""
+        hold = asyncio.Event()
+        async with _relay_and_source(str(tmp_path), hold) as (relay, session, source_url, fetches):
+            url = relay.url_for(source_url)
+
+            async def play() -> bytes:
+                async with session.get(url) as response:
+                    return await response.read()
+
+            plays = asyncio.gather(*(play() for _ in range(5)))
+            async with asyncio.timeout(5):
+                while relay.joined_downloads < 4:
+                    await asyncio.sleep(0.01)
+            hold.set()
+
+            assert await plays == [CLIP] * 5
+
+        assert len(fetches) == 1
+        assert relay.joined_downloads == 4
+        assert relay.served_from_cache == 4
+        assert relay.cache.stats["clips"] == 1
+
+    @pytest.mark.asyncio
+    async def test_large_clip_is_relayed_but_not_cached(self, tmp_path):
+        """Test that streams above the clip limit are passed through only."""
+        async with _relay_and_source(str(tmp_path)) as (relay, session, source_url, fetches):
+            relay.cache.max_clip_bytes = len(CLIP) // 2
+
+            for _ in range(2):
+                async with session.get(relay.url_for(source_url)) as response:
+                    assert await response.read() == CLIP
+
+        assert len(fetches) == 2
+        assert relay.cache.stats["clips"] == 0
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_token_is_rejected(self, tmp_path):
+        """Test that only URLs handed to a rabbit are served."""
+        async with _relay_and_source(str(tmp_path)) as (relay, session, source_url, fetches):
+            base = relay.url_for(source_url).rsplit("/", 1)[0]
+
+            async with session.get(base + "/0123456789abcdef") as response:
+                assert response.status == 404
+
+        assert not fetches
+
+
+class TestOpenKarotzMediaPlayer:
+    """Test cases for the media player entity."""
+
+    @pytest.mark.asyncio
+    async def test_play_media_hands_rabbit_the_relay_url(self):
+        """Test that the device plays media through the relay."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.play_stream = AsyncMock(return_value={"return": "0"})
+        coordinator = OpenKarotzCoordinator(MagicMock(), api)
+        relay = MagicMock()
+        relay.url_for.return_value = "http://ha.local:8123/api/openkarotz/relay/abc"
+        player = media_player.OpenKarotzMediaPlayer(coordinator, relay)
+        player.async_write_ha_state = MagicMock()
+
+        with patch.object(media_player, "async_process_play_media_url", side_effect=lambda hass, url: url):
+            await player.async_play_media("music", "http://example.com/doorbell.mp3")
+
+        relay.url_for.assert_called_once_with("http://example.com/doorbell.mp3", None)
+        api.play_stream.assert_awaited_once_with("http://ha.local:8123/api/openkarotz/relay/abc")
+        assert player.media_content_id == "http://example.com/doorbell.mp3"
+
+    @pytest.mark.asyncio
+    async def test_media_source_is_cached_by_its_id(self):
+        """Test that media source items are relayed under their ID, not their signed URL."""
+        api = OpenKarotzAPI("192.168.1.201", session=MagicMock())
+        api.play_stream = AsyncMock(return_value={"return": "0"})
+        player = media_player.OpenKarotzMediaPlayer(OpenKarotzCoordinator(MagicMock(), api), MagicMock())
+        player.async_write_ha_state = MagicMock()
+        media_id = "media-source://media_source/local/doorbell.mp3"
+
+        resolve = AsyncMock(return_value=MagicMock(url="/media/local/doorbell.mp3?authSig=abc"))
+        with patch.object(media_player.media_source, "async_resolve_media", resolve), patch.object(
+            media_player, "async_process_play_media_url", side_effect=lambda hass, url: url
+        ):
+            await player.async_play_media("music", media_id)
+            player._relay.url_for.assert_called_once_with("/media/local/doorbell.mp3?authSig=abc", media_id)
+            assert player.media_content_id == media_id
+
+            # Resuming resolves the item again rather than replaying a stale signature
+            resolve.return_value = MagicMock(url="/media/local/doorbell.mp3?authSig=def")
+            await player.async_media_play()
+
+        player._relay.url_for.assert_called_with("/media/local/doorbell.mp3?authSig=def", media_id)
+        assert resolve.await_count == 2
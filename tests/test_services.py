@@ -137,6 +137,7 @@ class TestOpenKarotzServices:
             text="Hello, this is a test",
             voice="default",
             category="notification",
+            stream=None,
         )
 
     @pytest.mark.asyncio
@@ -284,6 +285,7 @@ class TestOpenKarotzServices:
             text="Test",
             voice=None,
             category=None,
+            stream=None,
         )
 
     @pytest.mark.asyncio
@@ -308,4 +310,5 @@ class TestOpenKarotzServices:
             text="Test",
             voice="en-US",
             category=None,
+            stream=None,
         )
\ No newline at end of file
@@ -107,6 +107,7 @@ async def test_play_tts_service_integration():
         text="Hello, this is a test message from OpenKarotz integration",
         voice="default",
         category="notification",
+        stream=None,
     )
 
     print("SUCCESS: play_tts service called successfully")
@@ -315,6 +316,7 @@ async def test_play_tts_service_minimal():
         text="Quick test",
         voice=None,
         category=None,
+        stream=None,
     )
     print(f"  SUCCESS: Service called with only text parameter, returned: {success}")
     assert success is True, "Should return True on success"
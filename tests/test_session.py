@@ -0,0 +1,97 @@
+"""Tests for the shared OpenKarotz connection pool."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.openkarotz.api import OpenKarotzAPI
+from custom_components.openkarotz.const import (
+    DATA_EVENT_SESSION,
+    DATA_SESSION,
+    DEFAULT_POOL_LIMIT,
+    DEFAULT_POOL_LIMIT_PER_HOST,
+    DOMAIN,
+)
+from custom_components.openkarotz.session import (
+    async_get_event_session,
+    async_get_session,
+    async_release_session,
+)
+
+
+@pytest.fixture
+def hass():
+    """Create a Home Assistant stand-in with no loaded entries."""
+    hass = MagicMock()
+    hass.data = {}
+    return hass
+
+
+class TestSharedSession:
+    """Test cases for the integration-wide client sessions."""
+
+    @pytest.mark.asyncio
+    async def test_entries_share_one_pool(self, hass):
+        """Test that every caller gets the same bounded pool until it closes."""
+        session = async_get_session(hass)
+
+        assert async_get_session(hass) is session
+        assert session.connector.limit == DEFAULT_POOL_LIMIT
+        assert session.connector.limit_per_host == DEFAULT_POOL_LIMIT_PER_HOST
+        hass.bus.async_listen_once.assert_called_once()
+
+        await session.close()
+        replacement = async_get_session(hass)
+
+        assert replacement is not session
+        assert hass.data[DATA_SESSION] is replacement
+        await replacement.close()
+
+    @pytest.mark.asyncio
+    async def test_event_polls_have_their_own_pool(self, hass):
+        """Test that long polls hold one socket per device outside the regular pool."""
+        session = async_get_session(hass)
+        event_session = async_get_event_session(hass)
+
+        assert event_session is not session
+        assert event_session.connector.limit == 0
+        assert event_session.connector.limit_per_host == 1
+
+        await session.close()
+        await event_session.close()
+
+    @pytest.mark.asyncio
+    async def test_released_with_last_entry(self, hass):
+        """Test that the pools stay open while an entry is loaded."""
+        session = async_get_session(hass)
+        event_session = async_get_event_session(hass)
+        hass.data[DOMAIN] = {"entry": {}}
+
+        await async_release_session(hass)
+        assert not session.closed and not event_session.closed
+
+        hass.data[DOMAIN] = {}
+        await async_release_session(hass)
+
+        assert session.closed and event_session.closed
+        assert DATA_SESSION not in hass.data
+        assert DATA_EVENT_SESSION not in hass.data
+
+    @pytest.mark.asyncio
+    async def test_client_closes_only_its_own_session(self, hass):
+        """Test that disconnecting a device leaves the shared pool open."""
+        shared = OpenKarotzAPI("192.168.1.201", session=async_get_session(hass))
+        standalone = OpenKarotzAPI("192.168.1.202")
+        for api in (shared, standalone):
+            api._async_request = AsyncMock(return_value={"version": "200"})
+            assert await api.async_connect()
+
+        own_session = standalone.session
+        assert own_session is not hass.data[DATA_SESSION]
+        assert own_session.connector.limit_per_host == DEFAULT_POOL_LIMIT_PER_HOST
+
+        await shared.async_disconnect()
+        await standalone.async_disconnect()
+
+        assert not hass.data[DATA_SESSION].closed
+        assert own_session.closed and standalone.session is None
+        await hass.data[DATA_SESSION].close()
@@ -0,0 +1,195 @@
+"""Tests for the OpenKarotz text-to-speech queue."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from custom_components.openkarotz.api import OpenKarotzConnectionError
+from custom_components.openkarotz.tts_queue import TtsQueue, split_text
+
+
+class FakeSpeaker:
+    """Device stand-in that speaks each utterance for a fixed time."""
+
+    def __init__(self, duration: float = 0.05) -> None:
+        """Initialize fake speaker."""
+        self.duration = duration
+        self.sent = []
+        self.speaking_until = 0.0
+
+    async def send(self, data):
+        """Start speaking an utterance."""
+        loop = asyncio.get_running_loop()
+        self.sent.append(data["text"])
+        self.speaking_until = loop.time() + self.duration
+        return {"status": "ok"}
+
+    async def fetch_status(self):
+        """Return whether the device is still speaking."""
+        playing = asyncio.get_running_loop().time() < self.speaking_until
+        return {"status": "playing" if playing else "idle"}
+
+
+class TestTtsQueue:
+    """Test cases for ordering, deduplication and interrupts."""
+
+    @pytest.fixture
+    def speaker(self):
+        """Create a fake device."""
+        return FakeSpeaker()
+
+    @pytest.fixture
+    def queue(self, speaker):
+        """Create a queue polling the fake device quickly."""
+        return TtsQueue(speaker.send, speaker.fetch_status, dedup_window=60, poll_interval=0.01)
+
+    @pytest.mark.asyncio
+    async def test_utterances_are_spoken_in_order(self, queue, speaker):
+        """Test that concurrent utterances wait for the previous one to finish."""
+        results = await asyncio.gather(*(queue.submit({"text": text}) for text in ("one", "two", "three")))
+        await queue._task
+
+        assert speaker.sent == ["one", "two", "three"]
+        assert all(result == {"status": "ok"} for result in results)
+        assert queue.max_depth == 3
+        assert queue.stats["latency_p95_ms"] >= 50
+
+    @pytest.mark.asyncio
+    async def test_identical_utterances_are_spoken_once(self, queue, speaker):
+        """Test that doorbell spam is spoken once within the window."""
+        await asyncio.gather(
+            queue.submit({"text": "busy"}),
+            queue.submit({"text": "Doorbell"}),
+            queue.submit({"text": "Doorbell"}),
+        )
+        again = await queue.submit({"text": "Doorbell"})
+        await queue._task
+
+        assert speaker.sent == ["busy", "Doorbell"]
+        assert again["deduplicated"]
+        assert queue.deduplicated == 2
+
+    @pytest.mark.asyncio
+    async def test_urgent_overtakes_and_interrupts(self, queue, speaker):
+        """Test that urgent speech skips the queue and cuts off current speech."""
+        speaker.duration = 10
+        first = asyncio.ensure_future(queue.submit({"text": "weather"}))
+        second = asyncio.ensure_future(queue.submit({"text": "news"}))
+        await first
+        await queue.submit({"text": "Smoke detected", "category": "alarm"})
+
+        assert speaker.sent == ["weather", "Smoke detected"]
+        assert queue.interrupted == 1
+
+        queue.cancel(OpenKarotzConnectionError("stopped"))
+        with pytest.raises(OpenKarotzConnectionError):
+            await second
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_block_the_queue(self, speaker):
+        """Test that a rejected utterance fails its caller and the next is spoken."""
+        send = AsyncMock(side_effect=[OpenKarotzConnectionError("reset"), {"status": "ok"}])
+        queue = TtsQueue(send, speaker.fetch_status, poll_interval=0.01)
+
+        first, second = await asyncio.gather(
+            queue.submit({"text": "one"}),
+            queue.submit({"text": "two"}),
+            return_exceptions=True,
+        )
+
+        assert isinstance(first, OpenKarotzConnectionError)
+        assert second == {"status": "ok"}
+        assert queue.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_fails_utterance_being_sent(self, speaker):
+        """Test that cancelling mid-utterance fails its caller and the queued ones."""
+        sending = asyncio.Event()
+
+        async def send(data):
+            sending.set()
+            await asyncio.Event().wait()
+
+        queue = TtsQueue(send, speaker.fetch_status, poll_interval=0.01)
+        current = asyncio.ensure_future(queue.submit({"text": "one"}))
+        await sending.wait()
+        queued = asyncio.ensure_future(queue.submit({"text": "two"}))
+        await asyncio.sleep(0)
+
+        queue.cancel(OpenKarotzConnectionError("Disconnected"))
+        results = await asyncio.wait_for(asyncio.gather(current, queued, return_exceptions=True), 1)
+
+        assert all(isinstance(result, OpenKarotzConnectionError) for result in results)
+        assert not queue.is_speaking
+
+    @pytest.mark.asyncio
+    async def test_cancelled_task_releases_caller(self, speaker):
+        """Test that the caller does not hang when the speaking task is cancelled."""
+        sending = asyncio.Event()
+
+        async def send(data):
+            sending.set()
+            await asyncio.Event().wait()
+
+        queue = TtsQueue(send, speaker.fetch_status, poll_interval=0.01)
+        current = asyncio.ensure_future(queue.submit({"text": "one"}))
+        await sending.wait()
+
+        queue._task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(current, 1)
+
+
+class TestStreamedTts:
+    """Test cases for chunked, pipelined speech of long texts."""
+
+    def test_split_at_sentences(self):
+        """Test that the first sentence is sent alone and the rest merged up to the limit."""
+        text = "Good morning. It is sunny! Rain is expected later. " + "word " * 30
+
+        chunks = split_text(text, max_chars=60)
+
+        assert chunks[:2] == ["Good morning.", "It is sunny! Rain is expected later."]
+        assert all(len(chunk) <= 60 for chunk in chunks)
+        assert " ".join(chunks).split() == text.split()
+
+    @pytest.mark.asyncio
+    async def test_long_text_is_pipelined(self):
+        """Test that chunks follow each other as soon as the previous one ends."""
+        speaker = FakeSpeaker(duration=0.05)
+
+        async def send(data):
+            result = await speaker.send(data)
+            return {**result, "duration": speaker.duration}
+
+        queue = TtsQueue(send, speaker.fetch_status, poll_interval=1, chunk_max_chars=20)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        result = await queue.submit({"text": "First. Second sentence. Third one here."})
+        first_audio = loop.time() - start
+        await queue._task
+
+        assert speaker.sent == ["First.", "Second sentence.", "Third one here."]
+        assert result["chunks"] == 3
+        assert first_audio < 0.05
+        # Chunks were sent when the device said the previous one ended,
+        # not after the one second status poll
+        assert loop.time() - start < 0.5
+        assert queue.stats["streamed"] == 1
+        assert queue.stats["chunks_sent"] == 3
+        assert queue.stats["first_audio_p95_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_short_text_is_not_streamed(self):
+        """Test that texts within one chunk are sent whole unless streaming is forced."""
+        speaker = FakeSpeaker(duration=0)
+        queue = TtsQueue(speaker.send, speaker.fetch_status, poll_interval=0.01)
+
+        await queue.submit({"text": "One. Two."})
+        await queue.submit({"text": "Three. Four."}, stream=True)
+        await queue._task
+
+        assert speaker.sent == ["One. Two.", "Three.", "Four."]